@@ -0,0 +1,27 @@
+"""
+Equipment analytics shared by the backend and the desktop client.
+
+Pure pandas/numpy: summaries (aggregates, sketches, type stats, risk,
+anomalies, correlation), comparison statistics and the Equipment Name
+aligned row diff are computed from
+DataFrames of equipment rows, with no Django or database access. The backend
+wraps these functions with file handling and tracing (api/utils.py,
+api/comparison_stats.py); the desktop client runs them in-process for local
+analysis. Settings such as RISK_RULES apply when running inside Django and
+fall back to the module defaults elsewhere.
+"""
+from .comparison import comparison_stats, comparison_view, summary_delta
+from .diff import row_diff
+from .summary import REQUIRED_COLUMNS, analyze_dataframe, append_to_summary, backfill_summary, check_columns
+
+__all__ = [
+    'REQUIRED_COLUMNS',
+    'analyze_dataframe',
+    'append_to_summary',
+    'backfill_summary',
+    'check_columns',
+    'comparison_stats',
+    'comparison_view',
+    'row_diff',
+    'summary_delta',
+]
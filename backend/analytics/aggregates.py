@@ -0,0 +1,141 @@
+"""
+Mergeable running aggregates for dataset metrics.
+
+Each metric keeps (count, mean, m2, min, max) where m2 is the sum of squared
+deviations from the mean (Welford). Two aggregates are combined with Chan's
+parallel update, so appending rows only costs the new rows.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+METRIC_COLUMNS = {
+    "flowrate": "Flowrate",
+    "pressure": "Pressure",
+    "temperature": "Temperature",
+}
+
+
+def empty_metric():
+    return {"count": 0, "mean": 0.0, "m2": 0.0, "min": None, "max": None}
+
+
+def metric_aggregate(values):
+    """Aggregate a 1-D array of numbers, ignoring NaNs"""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return empty_metric()
+    mean = values.mean()
+    return {
+        "count": int(values.size),
+        "mean": float(mean),
+        "m2": float(np.square(values - mean).sum()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+    }
+
+
+def merge_metric(a, b):
+    """Combine two metric aggregates (Chan et al. pairwise update)"""
+    if not a["count"]:
+        return dict(b)
+    if not b["count"]:
+        return dict(a)
+    count = a["count"] + b["count"]
+    delta = b["mean"] - a["mean"]
+    return {
+        "count": count,
+        "mean": a["mean"] + delta * b["count"] / count,
+        "m2": a["m2"] + b["m2"] + delta * delta * a["count"] * b["count"] / count,
+        "min": min(a["min"], b["min"]),
+        "max": max(a["max"], b["max"]),
+    }
+
+
+def variance(aggregate, ddof=1):
+    if aggregate["count"] <= ddof:
+        return 0.0
+    return aggregate["m2"] / (aggregate["count"] - ddof)
+
+
+def std_dev(aggregate, ddof=1):
+    return math.sqrt(variance(aggregate, ddof))
+
+
+def numeric_frame(df):
+    """Metric columns coerced to float (non-numeric cells become NaN)"""
+    return pd.DataFrame({col: pd.to_numeric(df[col], errors="coerce") for col in METRIC_COLUMNS.values()})
+
+
+def describe_by_type(df):
+    """count/mean/std/min/quartiles/max for every metric and type in one groupby pass"""
+    return numeric_frame(df).groupby(df["Type"].astype(str).to_numpy()).describe()
+
+
+def _optional_float(value):
+    return None if pd.isna(value) else float(value)
+
+
+def aggregates_from_describe(described):
+    """Per-type metric aggregates (m2 recovered from the sample std)"""
+    by_type = {}
+    for type_name, row in described.iterrows():
+        by_type[str(type_name)] = {}
+        for key, col in METRIC_COLUMNS.items():
+            count = int(row[(col, "count")])
+            std = row[(col, "std")]
+            by_type[str(type_name)][key] = {
+                "count": count,
+                "mean": float(row[(col, "mean")]) if count else 0.0,
+                "m2": float(std * std * (count - 1)) if count > 1 else 0.0,
+                "min": _optional_float(row[(col, "min")]),
+                "max": _optional_float(row[(col, "max")]),
+            }
+    return by_type
+
+
+def type_counts(df):
+    """Rows per equipment type"""
+    return {str(k): int(v) for k, v in df["Type"].value_counts().items()}
+
+
+def compute_aggregates(df, described=None):
+    """
+    Aggregates for a DataFrame with the required equipment columns.
+    Pass `described` (from describe_by_type) to reuse an existing groupby pass.
+    """
+    values = numeric_frame(df)
+    if described is None:
+        described = describe_by_type(df)
+    return {
+        "metrics": {key: metric_aggregate(values[col].to_numpy()) for key, col in METRIC_COLUMNS.items()},
+        "type_counts": type_counts(df),
+        "by_type": aggregates_from_describe(described),
+    }
+
+
+def _merge_metric_maps(a, b):
+    return {key: merge_metric(a.get(key, empty_metric()), b.get(key, empty_metric())) for key in METRIC_COLUMNS}
+
+
+def merge_aggregates(a, b):
+    type_counts = dict(a.get("type_counts", {}))
+    for type_name, count in b.get("type_counts", {}).items():
+        type_counts[type_name] = type_counts.get(type_name, 0) + count
+
+    a_types = a.get("by_type", {})
+    b_types = b.get("by_type", {})
+    return {
+        "metrics": _merge_metric_maps(a["metrics"], b["metrics"]),
+        "type_counts": type_counts,
+        "by_type": {
+            type_name: _merge_metric_maps(a_types.get(type_name, {}), b_types.get(type_name, {}))
+            for type_name in sorted(set(a_types) | set(b_types))
+        },
+    }
+
+
+def averages_from_aggregates(aggregates):
+    return {key: round(aggregates["metrics"][key]["mean"], 2) for key in METRIC_COLUMNS}
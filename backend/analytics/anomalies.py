@@ -0,0 +1,207 @@
+"""
+Anomaly detection stage of the upload pipeline.
+
+Per equipment type a baseline is fitted once (median/MAD, quartiles and, when
+enabled, mean + inverse covariance of Flowrate/Pressure/Temperature). Rows are
+then scored against it in vectorised passes:
+
+- robust z-score: 0.6745 * (x - median) / MAD
+- IQR fences: outside [Q1 - k*IQR, Q3 + k*IQR]
+- multivariate: Mahalanobis distance over the three metrics
+
+Appended rows are scored against the stored baseline, so scoring is streaming
+and linear in the number of rows. Per-row scores are kept as a base64 float16
+array; the top-K anomalies are maintained with a heap merge.
+"""
+import base64
+import heapq
+
+import numpy as np
+import pandas as pd
+from .aggregates import METRIC_COLUMNS, numeric_frame
+from .settings import get_setting
+
+DEFAULTS = {
+    "ROBUST_Z_THRESHOLD": 3.5,
+    "IQR_K": 1.5,
+    "MULTIVARIATE": True,
+    # sqrt of the chi-squared 99.9% quantile with 3 degrees of freedom
+    "MAHALANOBIS_THRESHOLD": 4.03,
+    "TOP_K": 50,
+}
+MIN_MULTIVARIATE_ROWS = 5
+MAX_SCORE = 65000.0  # float16 storage limit
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(get_setting("ANOMALY_DETECTION", {}))
+    return config
+
+
+def fit_baseline(df, config=None):
+    """Per-type reference statistics used to score rows"""
+    config = config or get_config()
+    values = numeric_frame(df)
+    types = df["Type"].astype(str).to_numpy()
+    grouped = values.groupby(types)
+
+    medians = grouped.median()
+    mads = (values - medians.reindex(types).to_numpy()).abs().groupby(types).median()
+    q1 = grouped.quantile(0.25)
+    q3 = grouped.quantile(0.75)
+
+    baseline = {}
+    for type_name in medians.index:
+        baseline[type_name] = {
+            key: {
+                "median": float(medians.at[type_name, col]),
+                "mad": float(mads.at[type_name, col]),
+                "q1": float(q1.at[type_name, col]),
+                "q3": float(q3.at[type_name, col]),
+            }
+            for key, col in METRIC_COLUMNS.items()
+        }
+
+    if config["MULTIVARIATE"]:
+        for type_name, group in values.groupby(types):
+            matrix = group.dropna().to_numpy()
+            if len(matrix) < MIN_MULTIVARIATE_ROWS:
+                continue
+            baseline[type_name]["multivariate"] = {
+                "mean": matrix.mean(axis=0).tolist(),
+                "inv_cov": np.linalg.pinv(np.cov(matrix, rowvar=False)).tolist(),
+            }
+    return baseline
+
+
+def _param_arrays(baseline, codes, type_names, metric, field):
+    lookup = np.array([baseline.get(t, {}).get(metric, {}).get(field, np.nan) for t in type_names], dtype=float)
+    return lookup[codes]
+
+
+def score_rows(df, baseline, config=None):
+    """
+    Score rows against a fitted baseline.
+    Returns (scores, flags) where flags maps reason -> boolean array.
+    Rows of types missing from the baseline score 0.
+    """
+    config = config or get_config()
+    values = numeric_frame(df)
+    codes, type_names = pd.factorize(df["Type"].astype(str))
+    n = len(df)
+
+    scores = np.zeros(n)
+    flags = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for key, col in METRIC_COLUMNS.items():
+            x = values[col].to_numpy()
+            median = _param_arrays(baseline, codes, type_names, key, "median")
+            mad = _param_arrays(baseline, codes, type_names, key, "mad")
+            q1 = _param_arrays(baseline, codes, type_names, key, "q1")
+            q3 = _param_arrays(baseline, codes, type_names, key, "q3")
+
+            z = np.where(mad > 0, 0.6745 * (x - median) / mad, 0.0)
+            z = np.nan_to_num(np.abs(z), nan=0.0, posinf=MAX_SCORE)
+            iqr = q3 - q1
+            fence = config["IQR_K"] * iqr
+            outside = (x < q1 - fence) | (x > q3 + fence)
+
+            flags[f"{key}:robust_z"] = z > config["ROBUST_Z_THRESHOLD"]
+            flags[f"{key}:iqr"] = np.nan_to_num(outside & (iqr > 0), nan=False).astype(bool)
+            scores = np.maximum(scores, z)
+
+        if config["MULTIVARIATE"]:
+            distance = np.zeros(n)
+            matrix = values.to_numpy()
+            for code, type_name in enumerate(type_names):
+                params = baseline.get(type_name, {}).get("multivariate")
+                if not params:
+                    continue
+                rows = np.flatnonzero(codes == code)
+                centred = matrix[rows] - np.asarray(params["mean"])
+                squared = np.einsum("ij,jk,ik->i", centred, np.asarray(params["inv_cov"]), centred)
+                distance[rows] = np.sqrt(np.clip(np.nan_to_num(squared), 0, None))
+            flags["multivariate"] = distance > config["MAHALANOBIS_THRESHOLD"]
+            scores = np.maximum(scores, distance)
+
+    return np.minimum(scores, MAX_SCORE), flags
+
+
+def encode_scores(scores):
+    return base64.b64encode(np.asarray(scores, dtype=np.float16).tobytes()).decode("ascii")
+
+
+def decode_scores(encoded):
+    return np.frombuffer(base64.b64decode(encoded), dtype=np.float16).astype(np.float64)
+
+
+def _top_entries(df, scores, flags, k, row_offset=0):
+    """Top-k anomalous rows (score desc) using a partial sort"""
+    anomalous = np.zeros(len(df), dtype=bool)
+    for mask in flags.values():
+        anomalous |= mask
+    candidates = np.flatnonzero(anomalous)
+    if candidates.size > k:
+        candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+    candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    values = numeric_frame(df)
+    names = df["Equipment Name"].astype(str).to_numpy()
+    types = df["Type"].astype(str).to_numpy()
+    return [
+        {
+            "row": int(row + row_offset),
+            "equipment_name": names[row],
+            "type": types[row],
+            "score": round(float(scores[row]), 3),
+            "reasons": [reason for reason, mask in flags.items() if mask[row]],
+            **{key: (None if pd.isna(values[col].iat[row]) else float(values[col].iat[row]))
+               for key, col in METRIC_COLUMNS.items()},
+        }
+        for row in candidates
+    ], int(anomalous.sum())
+
+
+def detect_anomalies(df, config=None):
+    """Fit a baseline on `df` and score every row"""
+    config = config or get_config()
+    baseline = fit_baseline(df, config)
+    scores, flags = score_rows(df, baseline, config)
+    top, count = _top_entries(df, scores, flags, config["TOP_K"])
+    return {
+        "baseline": baseline,
+        "count": count,
+        "scores": encode_scores(scores),
+        "top": top,
+    }
+
+
+def append_anomalies(result, df, row_offset, config=None):
+    """Score appended rows against the stored baseline and merge into the top-K heap"""
+    config = config or get_config()
+    scores, flags = score_rows(df, result["baseline"], config)
+    new_top, new_count = _top_entries(df, scores, flags, config["TOP_K"], row_offset)
+    return {
+        "baseline": result["baseline"],
+        "count": result["count"] + new_count,
+        "scores": encode_scores(np.concatenate([decode_scores(result["scores"]), scores])),
+        "top": heapq.nlargest(config["TOP_K"], result["top"] + new_top, key=lambda item: item["score"]),
+    }
+
+
+def top_anomalies(result, table, k):
+    """
+    Top-k flagged rows. Served from the stored heap when it is large enough,
+    otherwise the table is re-scored against the stored baseline (one
+    vectorised pass) to recover the flags, and the flagged rows are ranked
+    by their stored scores. Rows flagged by IQR or Mahalanobis distance can
+    score lower than unflagged ones, so candidates come from the flags.
+    """
+    k = min(k, result["count"])
+    if k <= len(result["top"]):
+        return result["top"][:k]
+
+    frame = pd.DataFrame(table)
+    entries, _ = _top_entries(frame, decode_scores(result["scores"]), score_rows(frame, result["baseline"])[1], k)
+    return entries
@@ -0,0 +1,203 @@
+"""
+Statistical comparison of two datasets
+"""
+import numpy as np
+import pandas as pd
+
+from .aggregates import METRIC_COLUMNS, numeric_frame
+from .diff import align_rows, diff_counts, top_positions
+from .risk import evaluate_comparison_risk
+
+METRICS = ['Flowrate', 'Pressure', 'Temperature']
+HISTOGRAM_BINS = 20
+DIFF_LIMIT = 200
+
+
+def summary_delta(summary_a, summary_b):
+    """
+    Differences (B - A) between two stored summaries; nothing is recalculated
+    """
+    avg_a = summary_a.get('averages', {})
+    avg_b = summary_b.get('averages', {})
+    return {
+        "total_equipment": summary_b.get('total_equipment', 0) - summary_a.get('total_equipment', 0),
+        "averages": {
+            'flowrate': round(avg_b.get('flowrate', 0) - avg_a.get('flowrate', 0), 2),
+            'pressure': round(avg_b.get('pressure', 0) - avg_a.get('pressure', 0), 2),
+            'temperature': round(avg_b.get('temperature', 0) - avg_a.get('temperature', 0), 2),
+        },
+    }
+
+
+def comparison_stats(df_a, df_b):
+    """
+    Calculate statistical comparison metrics between two DataFrames of equipment rows.
+    """
+    stats = {}
+
+    for metric in METRICS:
+        key = metric.lower()
+        
+        # Extract series
+        series_a = df_a[metric].dropna()
+        series_b = df_b[metric].dropna()
+        
+        # 1. Basic stats
+        mean_a = series_a.mean()
+        mean_b = series_b.mean()
+        std_a = series_a.std()
+        std_b = series_b.std()
+        
+        # 2. Percentage Change
+        percent_change = ((mean_b - mean_a) / mean_a * 100) if mean_a != 0 else 0
+        
+        # 3. Stability (Variability)
+        # Using 20% increase in std dev as threshold for instability
+        stability = "stable" if std_b <= (std_a * 1.2) else "unstable"
+        
+        # 4. Effect Size (Cohen's d)
+        pooled_std = np.sqrt((std_a**2 + std_b**2) / 2)
+        if pooled_std == 0:
+            effect_size_val = 0
+        else:
+            effect_size_val = (mean_b - mean_a) / pooled_std
+            
+        abs_d = abs(effect_size_val)
+        if abs_d < 0.2:
+            effect_label = "trivial"
+        elif abs_d < 0.5:
+            effect_label = "small"
+        elif abs_d < 0.8:
+            effect_label = "medium"
+        else:
+            effect_label = "large"
+            
+        # 5. Risk Indicators (rule engine, see risk.py)
+        risk_level = evaluate_comparison_risk(key, {
+            "percent_change": percent_change,
+            "abs_percent_change": abs(percent_change),
+            "mean_a": mean_a,
+            "mean_b": mean_b,
+        })
+
+        stats[key] = {
+            "percent_change": round(percent_change, 2),
+            "std_dev_a": round(std_a, 2),
+            "std_dev_b": round(std_b, 2),
+            "stability": stability,
+            "effect_size": effect_label,
+            "risk_level": risk_level
+        }
+        
+    return stats
+
+
+def _floats(values, digits=3):
+    """JSON-ready list: rounded floats, NaN as None"""
+    return [None if np.isnan(value) else round(float(value), digits) for value in values]
+
+
+def frame_summary(df):
+    """total_equipment and averages of a DataFrame, as in a stored summary"""
+    means = numeric_frame(df).mean()
+    return {
+        "total_equipment": len(df),
+        "averages": {key: None if pd.isna(means[col]) else round(float(means[col]), 2)
+                     for key, col in METRIC_COLUMNS.items()},
+    }
+
+
+def shared_histograms(df_a, df_b, bins=HISTOGRAM_BINS):
+    """Per metric: counts of A and B over the same bin edges, so they can be overlaid"""
+    values_a, values_b = numeric_frame(df_a), numeric_frame(df_b)
+    histograms = {}
+    for key, col in METRIC_COLUMNS.items():
+        a = values_a[col].to_numpy()
+        b = values_b[col].to_numpy()
+        a, b = a[np.isfinite(a)], b[np.isfinite(b)]
+        both = np.concatenate([a, b])
+        low, high = (float(both.min()), float(both.max())) if len(both) else (0.0, 1.0)
+        if high <= low:
+            high = low + 1.0
+        edges = np.linspace(low, high, bins + 1)
+        histograms[key] = {
+            "edges": _floats(edges, 4),
+            "a": np.histogram(a, bins=edges)[0].tolist(),
+            "b": np.histogram(b, bins=edges)[0].tolist(),
+        }
+    return histograms
+
+
+def type_comparison(df_a, df_b):
+    """
+    Per equipment type, columnar: counts and metric means in A and B.
+    Types are ordered by combined count; a type missing from one side has count 0 and null means.
+    """
+    groups = []
+    for df in (df_a, df_b):
+        values = numeric_frame(df)
+        grouped = values.groupby(df["Type"].astype(str).to_numpy())
+        groups.append((grouped.size(), grouped.mean()))
+    (count_a, mean_a), (count_b, mean_b) = groups
+    total = count_a.add(count_b, fill_value=0).sort_values(ascending=False, kind="stable")
+    types = total.index
+    result = {
+        "types": types.tolist(),
+        "count": {
+            "a": count_a.reindex(types, fill_value=0).astype(int).tolist(),
+            "b": count_b.reindex(types, fill_value=0).astype(int).tolist(),
+        },
+    }
+    for key, col in METRIC_COLUMNS.items():
+        result[key] = {
+            "a": _floats(mean_a[col].reindex(types).to_numpy()),
+            "b": _floats(mean_b[col].reindex(types).to_numpy()),
+        }
+    return result
+
+
+def equipment_diff(df_a, df_b, limit=DIFF_LIMIT):
+    """
+    Rows of A and B joined on Equipment Name (see diff.align_rows), columnar,
+    with B - A per metric. The limit rows with the largest change (in standard
+    deviations of A, any metric) are returned; counts cover all rows.
+    """
+    aligned = align_rows(df_a, df_b)
+    matched = aligned["matched"]
+    top = top_positions(matched["change"], limit)
+
+    rows = {
+        "name": matched["name"][top].tolist(),
+        "type": matched["type_b"][top].tolist(),
+    }
+    for m, key in enumerate(METRIC_COLUMNS):
+        rows[key] = {
+            "a": _floats(matched["a"][top, m]),
+            "b": _floats(matched["b"][top, m]),
+            "delta": _floats(matched["delta"][top, m]),
+        }
+    counts = diff_counts(aligned)
+    return {
+        "matched": counts["matched"],
+        "added": counts["added"],
+        "removed": counts["removed"],
+        "rows": rows,
+    }
+
+
+def comparison_view(df_a, df_b, bins=HISTOGRAM_BINS, limit=DIFF_LIMIT):
+    """
+    Everything the compare screen draws, pre-aggregated so that no row table
+    has to be sent: totals and averages, deltas, comparison statistics,
+    overlaid histograms, per-type bars and the equipment diff.
+    """
+    summary_a, summary_b = frame_summary(df_a), frame_summary(df_b)
+    return {
+        "dataset_a": summary_a,
+        "dataset_b": summary_b,
+        "delta": summary_delta(summary_a, summary_b),
+        "comparison_stats": comparison_stats(df_a, df_b),
+        "histograms": shared_histograms(df_a, df_b, bins),
+        "types": type_comparison(df_a, df_b),
+        "diff": equipment_diff(df_a, df_b, limit),
+    }
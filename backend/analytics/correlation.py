@@ -0,0 +1,163 @@
+"""
+Correlation matrix and linear regression stage of the upload pipeline.
+
+For every equipment type the co-moment matrix of Flowrate/Pressure/Temperature
+(count, mean vector and sum of centred cross products) is computed in one
+grouped pass over the complete rows. The overall moments are the exact
+pairwise merge of the per-type moments, and appended rows are folded in the
+same way, so correlations and fits never need a rescan of the table.
+"""
+import numpy as np
+import pandas as pd
+
+from .aggregates import METRIC_COLUMNS, numeric_frame
+
+METRICS = list(METRIC_COLUMNS)
+
+# (x, y) pairs fitted as y = slope * x + intercept
+FIT_PAIRS = [
+    ("pressure", "temperature"),
+    ("flowrate", "pressure"),
+    ("flowrate", "temperature"),
+]
+
+
+def empty_moments():
+    size = len(METRICS)
+    return {"count": 0, "mean": [0.0] * size, "comoment": [[0.0] * size for _ in range(size)]}
+
+
+def merge_moments(a, b):
+    """Combine two co-moment aggregates (multivariate Chan et al. update)"""
+    if not a["count"]:
+        return b
+    if not b["count"]:
+        return a
+    count = a["count"] + b["count"]
+    mean_a, mean_b = np.asarray(a["mean"]), np.asarray(b["mean"])
+    delta = mean_b - mean_a
+    comoment = (
+        np.asarray(a["comoment"]) + np.asarray(b["comoment"])
+        + np.outer(delta, delta) * a["count"] * b["count"] / count
+    )
+    return {
+        "count": count,
+        "mean": (mean_a + delta * b["count"] / count).tolist(),
+        "comoment": comoment.tolist(),
+    }
+
+
+def compute_moments(df):
+    """Per-type and overall co-moments over rows with all three metrics present"""
+    values = numeric_frame(df)
+    complete = values.notna().all(axis=1).to_numpy()
+    values = values[complete]
+    types = df["Type"].astype(str).to_numpy()[complete]
+
+    grouped = values.groupby(types)
+    counts = grouped.size()
+    means = grouped.mean()
+    centred = values.to_numpy() - means.reindex(types).to_numpy()
+    size = len(METRICS)
+    pairs = [(i, j) for i in range(size) for j in range(i, size)]
+    products = pd.DataFrame({f"{i}_{j}": centred[:, i] * centred[:, j] for i, j in pairs})
+    sums = products.groupby(types).sum()
+
+    by_type = {}
+    overall = empty_moments()
+    for type_name in counts.index:
+        comoment = np.zeros((size, size))
+        for i, j in pairs:
+            comoment[i, j] = comoment[j, i] = sums.at[type_name, f"{i}_{j}"]
+        moments = {
+            "count": int(counts[type_name]),
+            "mean": means.loc[type_name].astype(float).tolist(),
+            "comoment": comoment.tolist(),
+        }
+        by_type[str(type_name)] = moments
+        overall = merge_moments(overall, moments)
+    return {"overall": overall, "by_type": by_type}
+
+
+def merge_moment_maps(a, b):
+    """Merge {"overall", "by_type"} co-moment maps"""
+    a_types, b_types = a.get("by_type", {}), b.get("by_type", {})
+    return {
+        "overall": merge_moments(a["overall"], b["overall"]),
+        "by_type": {
+            type_name: merge_moments(a_types.get(type_name, empty_moments()), b_types.get(type_name, empty_moments()))
+            for type_name in sorted(set(a_types) | set(b_types))
+        },
+    }
+
+
+def _round(value):
+    return None if value is None or not np.isfinite(value) else round(float(value), 4)
+
+
+def correlation_matrix(moments):
+    """Pearson r for every metric pair (None where a metric has no variance)"""
+    comoment = np.asarray(moments["comoment"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.sqrt(np.diag(comoment))
+        r = comoment / np.outer(scale, scale)
+    return {
+        a: {b: _round(np.clip(r[i, j], -1.0, 1.0)) if moments["count"] > 1 else None for j, b in enumerate(METRICS)}
+        for i, a in enumerate(METRICS)
+    }
+
+
+def linear_fit(moments, x, y):
+    """Least squares y = slope * x + intercept, with r squared"""
+    i, j = METRICS.index(x), METRICS.index(y)
+    comoment = moments["comoment"]
+    if moments["count"] < 2 or comoment[i][i] <= 0:
+        return {"slope": None, "intercept": None, "r2": None}
+    slope = comoment[i][j] / comoment[i][i]
+    intercept = moments["mean"][j] - slope * moments["mean"][i]
+    r2 = comoment[i][j] ** 2 / (comoment[i][i] * comoment[j][j]) if comoment[j][j] > 0 else None
+    return {"slope": _round(slope), "intercept": _round(intercept), "r2": _round(r2)}
+
+
+def _describe(moments):
+    return {
+        "count": moments["count"],
+        "matrix": correlation_matrix(moments),
+        "fits": {f"{y}~{x}": linear_fit(moments, x, y) for x, y in FIT_PAIRS},
+    }
+
+
+def correlation_from_moments(moments):
+    """Stored correlation block: the mergeable moments plus derived matrices and fits"""
+    return {
+        "moments": moments,
+        "overall": _describe(moments["overall"]),
+        "by_type": {type_name: _describe(m) for type_name, m in moments["by_type"].items()},
+    }
+
+
+def compute_correlation(df):
+    return correlation_from_moments(compute_moments(df))
+
+
+def correlation_from_table(table):
+    """compute_correlation for a stored summary['table'] list of dicts"""
+    return compute_correlation(pd.DataFrame(table, columns=["Equipment Name", "Type", *METRIC_COLUMNS.values()]))
+
+
+def append_correlation(correlation, df):
+    return correlation_from_moments(merge_moment_maps(correlation["moments"], compute_moments(df)))
+
+
+def correlation_label(correlation, x="pressure", y="temperature"):
+    """Human readable strength of the x/y correlation, e.g. 'Strong positive (r = 0.82)'"""
+    r = correlation["overall"]["matrix"][x][y]
+    if r is None:
+        return "N/A"
+    if abs(r) > 0.7:
+        strength = "Strong"
+    elif abs(r) > 0.4:
+        strength = "Moderate"
+    else:
+        strength = "Weak"
+    return f"{strength} {'positive' if r >= 0 else 'negative'} (r = {r:.2f})"
@@ -0,0 +1,247 @@
+"""
+Rule-based risk engine shared by uploads, reports, comparisons and the API.
+
+Row rules flag individual assets and are evaluated over whole columns in one
+vectorised pass (rules x rows boolean matrix). Comparison rules grade
+dataset-level changes. Both rule sets can be overridden in settings
+(RISK_RULES / COMPARISON_RISK_RULES).
+
+Appended rows are scored against the merged means from the stored aggregates;
+the existing rows keep their flags unless a mean a rule compares against has
+moved by more than RISK_RESCAN_TOLERANCE (relative), in which case the whole
+table is re-evaluated.
+
+Row rule keys:
+    name      unique identifier
+    metric    flowrate | pressure | temperature
+    baseline  absolute | global_mean | type_mean
+    op        ">" or "<"
+    threshold value (absolute) or multiplier of the baseline mean
+    level     warning | critical
+    score     optional priority, defaults to the level severity
+    reason    human readable explanation
+"""
+import numpy as np
+import pandas as pd
+from .aggregates import METRIC_COLUMNS, numeric_frame
+from .settings import get_setting
+
+LEVEL_SEVERITY = {"normal": 0, "warning": 2, "critical": 3}
+
+DEFAULT_RISK_RULES = [
+    {"name": "extreme_pressure", "metric": "pressure", "baseline": "global_mean", "op": ">", "threshold": 1.5,
+     "level": "critical", "reason": "Extreme Pressure"},
+    {"name": "extreme_pressure_type", "metric": "pressure", "baseline": "type_mean", "op": ">", "threshold": 1.5,
+     "level": "critical", "reason": "Extreme Pressure"},
+    {"name": "thermal_overload", "metric": "temperature", "baseline": "global_mean", "op": ">", "threshold": 1.5,
+     "level": "critical", "reason": "Thermal Overload"},
+    {"name": "thermal_overload_type", "metric": "temperature", "baseline": "type_mean", "op": ">", "threshold": 1.5,
+     "level": "critical", "reason": "Thermal Overload"},
+    {"name": "pressure_above_nominal", "metric": "pressure", "baseline": "global_mean", "op": ">", "threshold": 1.2,
+     "level": "warning", "reason": "Operating above nominal range"},
+    {"name": "pressure_above_nominal_type", "metric": "pressure", "baseline": "type_mean", "op": ">", "threshold": 1.2,
+     "level": "warning", "reason": "Operating above nominal range"},
+    {"name": "temperature_above_nominal", "metric": "temperature", "baseline": "global_mean", "op": ">",
+     "threshold": 1.2, "level": "warning", "reason": "Operating above nominal range"},
+    {"name": "temperature_above_nominal_type", "metric": "temperature", "baseline": "type_mean", "op": ">",
+     "threshold": 1.2, "level": "warning", "reason": "Operating above nominal range"},
+    {"name": "low_pressure", "metric": "pressure", "baseline": "type_mean", "op": "<", "threshold": 0.5,
+     "level": "warning", "score": 1, "reason": "Process optimization required (Low pressure)"},
+]
+
+# Dataset-level rules applied to comparison measures (B relative to A)
+DEFAULT_COMPARISON_RISK_RULES = [
+    {"metric": "flowrate", "measure": "abs_percent_change", "op": ">", "threshold": 40, "level": "critical"},
+    {"metric": "flowrate", "measure": "abs_percent_change", "op": ">", "threshold": 20, "level": "warning"},
+    {"metric": "pressure", "measure": "mean_b", "op": ">", "threshold": 50, "level": "critical"},
+    {"metric": "pressure", "measure": "mean_b", "op": ">", "threshold": 40, "level": "warning"},
+    {"metric": "temperature", "measure": "mean_b", "op": ">", "threshold": 600, "level": "critical"},
+    {"metric": "temperature", "measure": "mean_b", "op": ">", "threshold": 500, "level": "warning"},
+]
+
+DEFAULT_RESCAN_TOLERANCE = 0.01
+
+OPERATORS = {">": np.greater, "<": np.less, ">=": np.greater_equal, "<=": np.less_equal}
+
+
+def get_risk_rules():
+    return get_setting("RISK_RULES") or DEFAULT_RISK_RULES
+
+
+def get_comparison_rules():
+    return get_setting("COMPARISON_RISK_RULES") or DEFAULT_COMPARISON_RISK_RULES
+
+
+def _rule_score(rule):
+    return rule.get("score", LEVEL_SEVERITY[rule["level"]])
+
+
+def get_rescan_tolerance():
+    return get_setting("RISK_RESCAN_TOLERANCE", DEFAULT_RESCAN_TOLERANCE)
+
+
+def _limits(rule, column, type_means, means=None):
+    """Threshold per row (scalar or array) for a rule"""
+    if rule["baseline"] == "absolute":
+        return rule["threshold"]
+    if rule["baseline"] == "global_mean":
+        if means is not None:
+            return means["global"][rule["metric"]] * rule["threshold"]
+        return np.nanmean(column) * rule["threshold"] if column.size else np.nan
+    if rule["baseline"] == "type_mean":
+        return type_means[rule["metric"]] * rule["threshold"]
+    raise ValueError(f"Unknown risk baseline '{rule['baseline']}'")
+
+
+def baseline_means(aggregates):
+    """Global and per-type metric means from stored aggregates (NaN where a metric has no values)"""
+    def mean(metric):
+        return metric["mean"] if metric["count"] else np.nan
+
+    return {
+        "global": {key: mean(metric) for key, metric in aggregates["metrics"].items()},
+        "type": {
+            type_name: {key: mean(metric) for key, metric in metrics.items()}
+            for type_name, metrics in aggregates.get("by_type", {}).items()
+        },
+    }
+
+
+def evaluate_masks(values, types, rules, means=None):
+    """
+    Boolean matrix (len(rules) x rows): does rule i fire on row j.
+    `values` is the numeric metric frame, `types` the equipment type per row.
+    Baselines are the means of `values` unless `means` (see baseline_means) is given.
+    """
+    type_means = {}
+    if any(rule["baseline"] == "type_mean" for rule in rules):
+        if means is not None:
+            type_means = {
+                key: np.array([means["type"].get(type_name, {}).get(key, np.nan) for type_name in types], dtype=float)
+                for key in METRIC_COLUMNS
+            }
+        else:
+            grouped = values.groupby(types)
+            type_means = {key: grouped[col].transform("mean").to_numpy() for key, col in METRIC_COLUMNS.items()}
+
+    masks = np.zeros((len(rules), len(values)), dtype=bool)
+    for i, rule in enumerate(rules):
+        column = values[METRIC_COLUMNS[rule["metric"]]].to_numpy()
+        with np.errstate(invalid="ignore"):
+            masks[i] = OPERATORS[rule["op"]](column, _limits(rule, column, type_means, means))
+    return masks
+
+
+def evaluate_rows(df, rules=None, means=None):
+    """
+    Flag assets in a DataFrame of equipment rows.
+    Returns counts, a stability score (% of rows with no rule fired) and the
+    flagged rows ordered by score (highest first).
+    """
+    rules = rules or get_risk_rules()
+    n = len(df)
+    values = numeric_frame(df)
+    types = df["Type"].astype(str).to_numpy()
+    masks = evaluate_masks(values, types, rules, means)
+    scores = masks * np.array([_rule_score(rule) for rule in rules])[:, None]
+
+    row_scores = scores.max(axis=0) if rules else np.zeros(n)
+    winning_rule = scores.argmax(axis=0) if rules else np.zeros(n, dtype=int)
+    flagged_rows = np.flatnonzero(row_scores > 0)
+    flagged_rows = flagged_rows[np.argsort(-row_scores[flagged_rows], kind="stable")]
+
+    names = df["Equipment Name"].astype(str).to_numpy()
+    metric_values = {key: values[col].to_numpy() for key, col in METRIC_COLUMNS.items()}
+    flagged = []
+    for row in flagged_rows:
+        rule = rules[winning_rule[row]]
+        fired = [rules[i] for i in np.flatnonzero(masks[:, row])]
+        flagged.append({
+            "row": int(row),
+            "equipment_name": names[row],
+            "type": types[row],
+            "level": rule["level"],
+            "score": int(row_scores[row]),
+            "reason": rule.get("reason", rule["name"]),
+            # Distinct reasons of every rule at the row's level (e.g. pressure and thermal together)
+            "reasons": list(dict.fromkeys(
+                item.get("reason", item["name"]) for item in fired if item["level"] == rule["level"]
+            )),
+            "rules": [item["name"] for item in fired],
+            **{key: _json_number(column[row]) for key, column in metric_values.items()},
+        })
+
+    return _risk_result(flagged, n)
+
+
+def _risk_result(flagged, n):
+    counts = {"critical": 0, "warning": 0}
+    for item in flagged:
+        counts[item["level"]] = counts.get(item["level"], 0) + 1
+
+    return {
+        "counts": counts,
+        "stability_score": round((n - len(flagged)) / n * 100, 1) if n else None,
+        "flagged": flagged,
+    }
+
+
+def evaluate_table(table, rules=None):
+    """evaluate_rows for a stored summary['table'] list of dicts"""
+    df = pd.DataFrame(table, columns=["Equipment Name", "Type", *METRIC_COLUMNS.values()])
+    return evaluate_rows(df, rules)
+
+
+def _means_moved(rules, before, after, tolerance):
+    """Has any mean a rule compares existing rows against moved by more than `tolerance` (relative)"""
+    for rule in rules:
+        if rule["baseline"] == "global_mean":
+            pairs = [(before["global"][rule["metric"]], after["global"][rule["metric"]])]
+        elif rule["baseline"] == "type_mean":
+            # Types first seen in the appended rows have no existing rows to re-score
+            pairs = [(means[rule["metric"]], after["type"][type_name][rule["metric"]])
+                     for type_name, means in before["type"].items()]
+        else:
+            continue
+        for old, new in pairs:
+            if np.isnan(old) and np.isnan(new):
+                continue
+            if np.isnan(old) or np.isnan(new) or abs(new - old) > tolerance * abs(old):
+                return True
+    return False
+
+
+def append_risk(risk, df, row_offset, before, after, rules=None):
+    """
+    Fold the appended rows of `df` (starting at table row `row_offset`) into a
+    stored risk result. `before` and `after` are the stored aggregates without
+    and with the new rows. Returns None when the baseline means moved past the
+    rescan tolerance, so the caller must re-evaluate the whole table.
+    """
+    rules = rules or get_risk_rules()
+    old_means, new_means = baseline_means(before), baseline_means(after)
+    if _means_moved(rules, old_means, new_means, get_rescan_tolerance()):
+        return None
+
+    added = evaluate_rows(df.reset_index(drop=True), rules, means=new_means)["flagged"]
+    for item in added:
+        item["row"] += row_offset
+    # Stable sort keeps the existing order (score, then row) with the new rows after equal scores
+    flagged = sorted(risk["flagged"] + added, key=lambda item: -item["score"])
+    return _risk_result(flagged, row_offset + len(df))
+
+
+def evaluate_comparison_risk(metric, measures, rules=None):
+    """Highest level among comparison rules that fire for `metric`"""
+    level = "normal"
+    for rule in rules or get_comparison_rules():
+        if rule["metric"] != metric or rule["measure"] not in measures:
+            continue
+        if OPERATORS[rule["op"]](measures[rule["measure"]], rule["threshold"]):
+            if LEVEL_SEVERITY[rule["level"]] > LEVEL_SEVERITY[level]:
+                level = rule["level"]
+    return level
+
+
+def _json_number(value):
+    return None if pd.isna(value) else float(value)
@@ -0,0 +1,19 @@
+"""
+Access to Django settings that also works outside the backend.
+
+The desktop client imports this package without Django (or with Django
+installed but unconfigured); there every setting falls back to its default.
+"""
+
+
+def get_setting(name, default=None):
+    """Value of a backend setting, or default when not running inside Django"""
+    try:
+        from django.conf import settings
+        from django.core.exceptions import ImproperlyConfigured
+    except ImportError:
+        return default
+    try:
+        return getattr(settings, name, default)
+    except ImproperlyConfigured:
+        return default
@@ -0,0 +1,245 @@
+"""
+Mergeable statistics sketches stored per dataset.
+
+- t-digest (merging variant, k1 scale) for quantiles
+- fixed-width histograms anchored at 0, stored sparsely, for distributions
+- HyperLogLog for distinct equipment names
+
+All sketches are plain JSON-serialisable dicts/strings and merge associatively,
+so quantiles and histograms over any set of datasets never re-read rows.
+"""
+import base64
+import math
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import METRIC_COLUMNS, numeric_frame
+
+TDIGEST_COMPRESSION = 200
+TYPE_TDIGEST_COMPRESSION = 100
+HISTOGRAM_BIN_WIDTH = {
+    "flowrate": 5.0,
+    "pressure": 0.25,
+    "temperature": 5.0,
+}
+HLL_PRECISION = 12
+
+
+# --- t-digest -----------------------------------------------------------------
+
+def _empty_tdigest(compression):
+    return {"compression": compression, "count": 0, "min": None, "max": None, "means": [], "weights": []}
+
+
+def _compress(means, weights, compression):
+    """Group sorted centroids so that each group spans at most one unit of the k1 scale"""
+    order = np.argsort(means, kind="mergesort")
+    means = means[order]
+    weights = weights[order]
+    total = weights.sum()
+
+    q_left = (np.cumsum(weights) - weights) / total
+    k = compression / (2 * math.pi) * np.arcsin(2 * q_left - 1)
+    groups = np.floor(k - k[0]).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+
+    merged_weights = np.add.reduceat(weights, starts)
+    merged_means = np.add.reduceat(means * weights, starts) / merged_weights
+    return merged_means, merged_weights
+
+
+def tdigest_from_values(values, compression=TDIGEST_COMPRESSION):
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return _empty_tdigest(compression)
+    means, weights = _compress(values, np.ones_like(values), compression)
+    return {
+        "compression": compression,
+        "count": int(values.size),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "means": means.tolist(),
+        "weights": weights.tolist(),
+    }
+
+
+def merge_tdigests(digests):
+    digests = [d for d in digests if d and d["count"]]
+    if not digests:
+        return _empty_tdigest(TDIGEST_COMPRESSION)
+    compression = max(d["compression"] for d in digests)
+    means, weights = _compress(
+        np.concatenate([np.asarray(d["means"], dtype=float) for d in digests]),
+        np.concatenate([np.asarray(d["weights"], dtype=float) for d in digests]),
+        compression,
+    )
+    return {
+        "compression": compression,
+        "count": sum(d["count"] for d in digests),
+        "min": min(d["min"] for d in digests),
+        "max": max(d["max"] for d in digests),
+        "means": means.tolist(),
+        "weights": weights.tolist(),
+    }
+
+
+def tdigest_quantiles(digest, quantiles):
+    """Estimate quantiles (0..1) by interpolating between centroid centres"""
+    if not digest or not digest["count"]:
+        return [None for _ in quantiles]
+    means = np.asarray(digest["means"], dtype=float)
+    weights = np.asarray(digest["weights"], dtype=float)
+    centres = np.cumsum(weights) - weights / 2
+    positions = np.r_[0.0, centres, weights.sum()]
+    values = np.r_[digest["min"], means, digest["max"]]
+    targets = np.clip(np.asarray(quantiles, dtype=float), 0, 1) * weights.sum()
+    return [float(v) for v in np.interp(targets, positions, values)]
+
+
+# --- Fixed-width histograms ---------------------------------------------------
+
+def histogram_from_values(values, width):
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    bins, counts = np.unique(np.floor(values / width).astype(np.int64), return_counts=True)
+    return {"width": width, "counts": {str(b): int(c) for b, c in zip(bins, counts)}}
+
+
+def merge_histograms(histograms):
+    histograms = [h for h in histograms if h]
+    if not histograms:
+        return None
+    widths = {h["width"] for h in histograms}
+    if len(widths) > 1:
+        raise ValueError(f"Cannot merge histograms with different bin widths: {sorted(widths)}")
+    counts = {}
+    for histogram in histograms:
+        for b, c in histogram["counts"].items():
+            counts[b] = counts.get(b, 0) + c
+    return {"width": widths.pop(), "counts": counts}
+
+
+def histogram_bins(histogram):
+    """Expand a sparse histogram into ordered [{start, end, count}] bins"""
+    if not histogram:
+        return []
+    width = histogram["width"]
+    return [
+        {"start": round(b * width, 6), "end": round((b + 1) * width, 6), "count": histogram["counts"][str(b)]}
+        for b in sorted(int(k) for k in histogram["counts"])
+    ]
+
+
+# --- HyperLogLog --------------------------------------------------------------
+
+def _bit_length(values):
+    """Vectorised int.bit_length for uint64 arrays (exact, via 32-bit halves)"""
+    hi = (values >> np.uint64(32)).astype(np.float64)
+    lo = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(hi > 0, 32 + np.frexp(hi)[1], np.frexp(lo)[1])
+
+
+def hll_registers(strings, precision=HLL_PRECISION):
+    registers = np.zeros(1 << precision, dtype=np.uint8)
+    if len(strings) == 0:
+        return registers
+    hashes = pd.util.hash_pandas_object(pd.Series(strings, dtype=str), index=False).to_numpy(dtype=np.uint64)
+    index = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    remainder = hashes & np.uint64((1 << (64 - precision)) - 1)
+    rank = (64 - precision) - _bit_length(remainder) + 1
+    np.maximum.at(registers, index, rank.astype(np.uint8))
+    return registers
+
+
+def hll_encode(registers):
+    return base64.b64encode(registers.tobytes()).decode("ascii")
+
+
+def hll_decode(encoded):
+    return np.frombuffer(base64.b64decode(encoded), dtype=np.uint8)
+
+
+def hll_merge(encoded_sketches):
+    registers = [hll_decode(s) for s in encoded_sketches if s]
+    if not registers:
+        return None
+    return hll_encode(np.maximum.reduce(registers))
+
+
+def hll_count(encoded):
+    if not encoded:
+        return 0
+    registers = hll_decode(encoded).astype(np.float64)
+    m = registers.size
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.exp2(-registers))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros:
+        # Small-range correction (linear counting)
+        estimate = m * math.log(m / zeros)
+    return int(round(estimate))
+
+
+# --- Dataset sketch bundle ----------------------------------------------------
+
+def _metric_sketches(values, compression):
+    return {
+        key: {
+            "tdigest": tdigest_from_values(values[col].to_numpy(), compression),
+            "histogram": histogram_from_values(values[col].to_numpy(), HISTOGRAM_BIN_WIDTH[key]),
+        }
+        for key, col in METRIC_COLUMNS.items()
+    }
+
+
+def compute_sketches(df):
+    """Sketches per metric, per metric and equipment type, and distinct names"""
+    values = numeric_frame(df)
+    return {
+        "metrics": _metric_sketches(values, TDIGEST_COMPRESSION),
+        "by_type": {
+            str(type_name): _metric_sketches(group, TYPE_TDIGEST_COMPRESSION)
+            for type_name, group in values.groupby(df["Type"].astype(str), sort=True)
+        },
+        "equipment_names": hll_encode(hll_registers(df["Equipment Name"].astype(str).to_numpy())),
+    }
+
+
+def _merge_metric_sketches(sketches):
+    return {
+        key: {
+            "tdigest": merge_tdigests([s[key]["tdigest"] for s in sketches if key in s]),
+            "histogram": merge_histograms([s[key]["histogram"] for s in sketches if key in s]),
+        }
+        for key in METRIC_COLUMNS
+    }
+
+
+def merge_sketches(bundles):
+    bundles = [b for b in bundles if b]
+    type_names = sorted({t for b in bundles for t in b.get("by_type", {})})
+    return {
+        "metrics": _merge_metric_sketches([b["metrics"] for b in bundles]),
+        "by_type": {
+            t: _merge_metric_sketches([b["by_type"][t] for b in bundles if t in b.get("by_type", {})])
+            for t in type_names
+        },
+        "equipment_names": hll_merge([b.get("equipment_names") for b in bundles]),
+    }
+
+
+def describe_metric(sketch, quantiles):
+    """Quantiles and histogram bins for one merged metric sketch"""
+    digest = sketch["tdigest"]
+    return {
+        "count": digest["count"],
+        "min": digest["min"],
+        "max": digest["max"],
+        "quantiles": {
+            f"p{round(q * 100, 2):g}": (round(v, 4) if v is not None else None)
+            for q, v in zip(quantiles, tdigest_quantiles(digest, quantiles))
+        },
+        "histogram": histogram_bins(sketch["histogram"]),
+    }
@@ -0,0 +1,130 @@
+"""
+Dataset summaries built from equipment rows
+"""
+import pandas as pd
+
+from .aggregates import averages_from_aggregates, compute_aggregates, describe_by_type, merge_aggregates, type_counts
+from .anomalies import append_anomalies, detect_anomalies
+from .correlation import append_correlation, compute_correlation, correlation_from_table, correlation_label
+from .risk import append_risk, evaluate_rows, evaluate_table
+from .sketches import compute_sketches, merge_sketches
+from .type_stats import type_stats_from_aggregates, type_stats_from_describe
+
+REQUIRED_COLUMNS = {"Equipment Name", "Type", "Flowrate", "Pressure", "Temperature"}
+# Fields added to summaries after the first release; all are derived from the row table
+DERIVED_FIELDS = ("type_stats", "risk", "correlation", "anomalies")
+
+
+def check_columns(df):
+    if not REQUIRED_COLUMNS.issubset(set(df.columns)):
+        missing = REQUIRED_COLUMNS - set(df.columns)
+        raise ValueError(f"Missing columns: {missing}")
+
+
+def analyze_dataframe(df):
+    """
+    Build the summary for a DataFrame of equipment rows
+    """
+    described = describe_by_type(df)
+    aggregates = compute_aggregates(df, described)
+    correlation = compute_correlation(df)
+
+    summary = {
+        "total_equipment": len(df),
+        "averages": averages_from_aggregates(aggregates),
+        "type_distribution": dict(aggregates["type_counts"]),
+        "type_stats": type_stats_from_describe(described, aggregates["type_counts"]),
+        "table": df.to_dict(orient="records"),
+        "aggregates": aggregates,
+        "sketches": compute_sketches(df),
+        "risk": evaluate_rows(df),
+        "anomalies": detect_anomalies(df),
+        "correlation": correlation,
+        "correlation_label": correlation_label(correlation),
+    }
+
+    return summary
+
+
+def derived_field(summary, field):
+    """One of DERIVED_FIELDS computed from the summary's row table (for summaries that predate it)"""
+    table = summary.get("table", [])
+    if field == "type_stats":
+        if not table:
+            return {}
+        df = pd.DataFrame(table)
+        return type_stats_from_describe(describe_by_type(df), type_counts(df))
+    if field == "risk":
+        return evaluate_table(table)
+    if field == "correlation":
+        return correlation_from_table(table)
+    if field == "anomalies":
+        return detect_anomalies(pd.DataFrame(table)) if table else None
+    raise ValueError(f"Unknown derived field '{field}'")
+
+
+def backfill_summary(summary):
+    """
+    Fill in the DERIVED_FIELDS a summary lacks
+
+    Returns:
+        (summary, fields): a new summary and the names of the fields added,
+        or the summary unchanged and an empty list
+    """
+    missing = [field for field in DERIVED_FIELDS if summary.get(field) is None]
+    if not summary.get("table"):
+        missing = [field for field in missing if field != "anomalies"]
+    if not missing:
+        return summary, []
+    summary = dict(summary)
+    for field in missing:
+        summary[field] = derived_field(summary, field)
+    if "correlation" in missing:
+        summary["correlation_label"] = correlation_label(summary["correlation"])
+    return summary, missing
+
+
+def append_to_summary(summary, df):
+    """
+    Fold newly appended rows into an existing summary.
+    Only the new rows are analysed; stored aggregates, sketches and correlation
+    moments are merged in.
+    New rows are scored for anomalies against the stored baseline. Risk rules
+    compare rows to dataset means: new rows are scored against the merged means
+    and the whole table is only re-evaluated when those means moved past the
+    rescan tolerance (see analytics.risk.append_risk).
+    """
+    check_columns(df)
+    base = summary.get("aggregates")
+    base_sketches = summary.get("sketches")
+    if base is None or "by_type" not in base or base_sketches is None:
+        # Datasets analysed before aggregates/sketches were stored: rebuild once from the table
+        existing = pd.DataFrame(summary.get("table", []), columns=sorted(REQUIRED_COLUMNS))
+        base = compute_aggregates(existing)
+        base_sketches = compute_sketches(existing)
+
+    aggregates = merge_aggregates(base, compute_aggregates(df))
+
+    summary = dict(summary)
+    row_offset = len(summary.get("table", []))
+    summary["total_equipment"] = summary.get("total_equipment", 0) + len(df)
+    summary["averages"] = averages_from_aggregates(aggregates)
+    summary["type_distribution"] = dict(aggregates["type_counts"])
+    summary["table"] = summary.get("table", []) + df.to_dict(orient="records")
+    summary["aggregates"] = aggregates
+    summary["sketches"] = merge_sketches([base_sketches, compute_sketches(df)])
+    summary["type_stats"] = type_stats_from_aggregates(aggregates, summary["sketches"])
+    risk = None
+    if summary.get("risk") is not None:
+        risk = append_risk(summary["risk"], df, row_offset, base, aggregates)
+    summary["risk"] = risk if risk is not None else evaluate_table(summary["table"])
+    if summary.get("anomalies"):
+        summary["anomalies"] = append_anomalies(summary["anomalies"], df, row_offset)
+    else:
+        summary["anomalies"] = detect_anomalies(pd.DataFrame(summary["table"]))
+    if summary.get("correlation"):
+        summary["correlation"] = append_correlation(summary["correlation"], df)
+    else:
+        summary["correlation"] = correlation_from_table(summary["table"])
+    summary["correlation_label"] = correlation_label(summary["correlation"])
+    return summary
@@ -0,0 +1,60 @@
+"""
+Per-equipment-type breakdowns stored in summary['type_stats'].
+
+At upload they come straight from the single describe_by_type() groupby pass
+(exact quartiles). After appends they are rebuilt from the merged per-type
+aggregates and per-type t-digests, without touching the rows. In both cases
+"count" is the number of rows of the type (aggregates["type_counts"]).
+"""
+from .aggregates import METRIC_COLUMNS, std_dev
+from .sketches import tdigest_quantiles
+
+QUARTILES = {"p25": 0.25, "p50": 0.5, "p75": 0.75}
+
+
+def _rounded(value, digits=4):
+    return None if value is None or value != value else round(float(value), digits)
+
+
+def type_stats_from_describe(described, type_counts):
+    stats = {}
+    for type_name, row in described.iterrows():
+        metrics = {}
+        for key, col in METRIC_COLUMNS.items():
+            metrics[key] = {
+                "mean": _rounded(row[(col, "mean")]),
+                "std": _rounded(row[(col, "std")]),
+                "min": _rounded(row[(col, "min")]),
+                "max": _rounded(row[(col, "max")]),
+                "p25": _rounded(row[(col, "25%")]),
+                "p50": _rounded(row[(col, "50%")]),
+                "p75": _rounded(row[(col, "75%")]),
+            }
+        stats[str(type_name)] = {
+            "count": type_counts.get(str(type_name), 0),
+            "metrics": metrics,
+        }
+    return stats
+
+
+def type_stats_from_aggregates(aggregates, sketches):
+    stats = {}
+    type_sketches = (sketches or {}).get("by_type", {})
+    for type_name, metric_aggregates in aggregates.get("by_type", {}).items():
+        metrics = {}
+        for key in METRIC_COLUMNS:
+            aggregate = metric_aggregates[key]
+            digest = type_sketches.get(type_name, {}).get(key, {}).get("tdigest")
+            quartiles = tdigest_quantiles(digest, list(QUARTILES.values()))
+            metrics[key] = {
+                "mean": _rounded(aggregate["mean"]) if aggregate["count"] else None,
+                "std": _rounded(std_dev(aggregate)) if aggregate["count"] > 1 else None,
+                "min": _rounded(aggregate["min"]),
+                "max": _rounded(aggregate["max"]),
+                **{name: _rounded(value) for name, value in zip(QUARTILES, quartiles)},
+            }
+        stats[type_name] = {
+            "count": aggregates.get("type_counts", {}).get(type_name, 0),
+            "metrics": metrics,
+        }
+    return stats
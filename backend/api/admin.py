@@ -1,8 +1,20 @@
 from django.contrib import admin
-from .models import UploadedDataset
+from .models import EquipmentReading, RetentionPolicy, UploadedDataset
 
 
 @admin.register(UploadedDataset)
 class UploadedDatasetAdmin(admin.ModelAdmin):
-    list_display = ('id', 'uploaded_at')
+    list_display = ('id', 'uploaded_at', 'user', 'file_size')
     readonly_fields = ('summary',)
+
+
+@admin.register(RetentionPolicy)
+class RetentionPolicyAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'group', 'max_datasets', 'max_age_days', 'max_bytes')
+
+
+@admin.register(EquipmentReading)
+class EquipmentReadingAdmin(admin.ModelAdmin):
+    list_display = ('equipment_name', 'equipment_type', 'dataset', 'recorded_at', 'flowrate', 'pressure', 'temperature')
+    list_filter = ('equipment_type',)
+    search_fields = ('equipment_name',)
@@ -0,0 +1,247 @@
+"""
+Async versions of the read-heavy endpoints, used when the project is served
+over ASGI (uvicorn) with ASYNC_VIEWS enabled.
+
+DRF's @api_view is synchronous, so these are plain Django async views: the
+DRF authenticators (JWT / session) are run off the event loop, ORM access uses
+the async queryset API and CPU work is awaited on the shared executor. Response
+bodies match the sync views.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import TextField
+from django.db.models.functions import Cast
+from django.http import HttpResponse, HttpResponseNotAllowed, JsonResponse
+from django.utils.cache import get_conditional_response
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from .comparison import (compare_datasets, compare_view, compare_view_params, dataset_source, diff_datasets,
+                         diff_params)
+from .events import (astream_events, event_stream_response, get_config as get_event_config, parse_last_event_id,
+                     resolve_stream_user, stream_disabled_response)
+from .executor import ExecutorBusy, arun_task
+from .metrics import stage
+from .models import UploadedDataset
+from .views import (comparison_sources, comparison_revisions, format_comparison_etag, format_dataset_etag,
+                    visible_datasets)
+
+
+def require_get(view):
+    """require_GET for coroutine views (Django 4.2's decorator is sync-only)"""
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return HttpResponseNotAllowed(["GET", "HEAD"])
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def _json(data, status=200):
+    with stage("serialize"):
+        return JsonResponse(data, status=status, safe=False, encoder=JSONEncoder)
+
+
+def _resolve_user(request):
+    drf_request = Request(request, authenticators=[cls() for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    return drf_request.user
+
+
+async def authenticate(request):
+    """Attach request.user using the configured DRF authenticators"""
+    request.user = await sync_to_async(_resolve_user)(request)
+
+
+def _api_error(exc):
+    response = _json({"detail": exc.detail}, status=exc.status_code)
+    if getattr(exc, "wait", None):
+        response["Retry-After"] = str(exc.wait)
+    return response
+
+
+@require_get
+async def summary(request, dataset_id):
+    """
+    Get summary for a specific dataset.
+    The stored JSON text is streamed back as-is, without decoding and re-encoding it.
+    A matching If-None-Match is answered with 304 before the summary is loaded.
+    """
+    revision = await UploadedDataset.objects.filter(id=dataset_id).values_list("uploaded_at", "file_size").afirst()
+    if revision is None:
+        return _json({"error": "Dataset not found"}, status=404)
+    etag = format_dataset_etag(dataset_id, *revision)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    text = await (
+        UploadedDataset.objects.filter(id=dataset_id)
+        .values_list(Cast("summary", output_field=TextField()), flat=True)
+        .afirst()
+    )
+    if text is None:
+        return _json({"error": "Dataset not found"}, status=404)
+    response = HttpResponse(text, content_type="application/json")
+    response["ETag"] = etag
+    return response
+
+
+@require_get
+async def history(request):
+    """
+    Get list of recent uploads (newest first).
+    Optional ?limit=N (default HISTORY_DEFAULT_LIMIT, max HISTORY_MAX_LIMIT)
+    """
+    try:
+        await authenticate(request)
+    except APIException as exc:
+        return _api_error(exc)
+
+    try:
+        limit = int(request.GET.get('limit', settings.HISTORY_DEFAULT_LIMIT))
+    except ValueError:
+        return _json({"error": "limit must be an integer"}, status=400)
+    limit = max(1, min(limit, settings.HISTORY_MAX_LIMIT))
+
+    datasets = (
+        visible_datasets(request)
+        .only("id", "file", "original_filename", "uploaded_at")
+        .order_by("-uploaded_at")[:limit]
+    )
+    return _json([
+        {
+            "id": d.id,
+            "filename": d.original_filename if d.original_filename else (d.file.name.split("/")[-1] if d.file else "Unknown"),
+            "uploaded_at": d.uploaded_at
+        }
+        async for d in datasets
+    ])
+
+
+@require_get
+async def compare_datasets_view(request):
+    """
+    Compare two datasets
+    """
+    id_a = request.GET.get('dataset_a')
+    id_b = request.GET.get('dataset_b')
+
+    if not id_a or not id_b:
+        return _json({"error": "Both dataset_a and dataset_b parameters are required"}, status=400)
+
+    try:
+        dataset_a = await UploadedDataset.objects.aget(id=id_a)
+        dataset_b = await UploadedDataset.objects.aget(id=id_b)
+    except UploadedDataset.DoesNotExist:
+        return _json({"error": "One or both datasets not found"}, status=404)
+    except ValueError:
+        return _json({"error": "Invalid ID format"}, status=400)
+
+    try:
+        with stage("analyze"):
+            result = await arun_task(compare_datasets, dataset_source(dataset_a, summary=True),
+                                     dataset_source(dataset_b, summary=True))
+    except ExecutorBusy as exc:
+        return _api_error(exc)
+    return _json(result)
+
+
+@require_get
+async def compare_view_data(request):
+    """
+    Compact comparison for the compare screens (histograms, per-type bars,
+    equipment diff); answers a matching If-None-Match with 304
+    """
+    id_a = request.GET.get('dataset_a')
+    id_b = request.GET.get('dataset_b')
+
+    if not id_a or not id_b:
+        return _json({"error": "Both dataset_a and dataset_b parameters are required"}, status=400)
+    try:
+        bins, limit = compare_view_params(request.GET)
+    except ValueError as e:
+        return _json({"error": str(e)}, status=400)
+
+    revisions = await sync_to_async(comparison_revisions)(request.GET)
+    etag = format_comparison_etag(revisions) if revisions else None
+    if etag is not None:
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+    try:
+        source_a, source_b = await sync_to_async(comparison_sources)(id_a, id_b)
+    except UploadedDataset.DoesNotExist:
+        return _json({"error": "One or both datasets not found"}, status=404)
+    except ValueError:
+        return _json({"error": "Invalid ID format"}, status=400)
+
+    try:
+        with stage("analyze"):
+            result = await arun_task(compare_view, source_a, source_b, bins, limit)
+    except ExecutorBusy as exc:
+        return _api_error(exc)
+    response = _json(result)
+    if etag is not None:
+        response["ETag"] = etag
+    return response
+
+
+@require_get
+async def compare_diff(request):
+    """
+    Equipment Name aligned row diff (counts, top movers, one page); answers a
+    matching If-None-Match with 304
+    """
+    id_a = request.GET.get('dataset_a')
+    id_b = request.GET.get('dataset_b')
+
+    if not id_a or not id_b:
+        return _json({"error": "Both dataset_a and dataset_b parameters are required"}, status=400)
+    try:
+        params = diff_params(request.GET)
+    except ValueError as e:
+        return _json({"error": str(e)}, status=400)
+
+    revisions = await sync_to_async(comparison_revisions)(request.GET)
+    etag = format_comparison_etag(revisions) if revisions else None
+    if etag is not None:
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+    try:
+        source_a, source_b = await sync_to_async(comparison_sources)(id_a, id_b)
+    except UploadedDataset.DoesNotExist:
+        return _json({"error": "One or both datasets not found"}, status=404)
+    except ValueError:
+        return _json({"error": "Invalid ID format"}, status=400)
+
+    try:
+        with stage("analyze"):
+            result = await arun_task(diff_datasets, source_a, source_b, **params)
+    except ExecutorBusy as exc:
+        return _api_error(exc)
+    response = _json(result)
+    if etag is not None:
+        response["ETag"] = etag
+    return response
+
+
+@require_get
+async def events(request):
+    """
+    Server-sent event stream of upload/analysis progress, completed summaries
+    and available reports. Auth: Bearer header or ?token=
+    """
+    if not get_event_config()["ENABLED"]:
+        return stream_disabled_response()
+    try:
+        user = await sync_to_async(resolve_stream_user)(request)
+    except APIException as exc:
+        return _api_error(exc)
+    return event_stream_response(astream_events(user.id, parse_last_event_id(request)))
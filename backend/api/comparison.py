@@ -1,50 +1,133 @@
 """
 Comparison Logic for Datasets
+
+The comparison functions run on the task executor, possibly in a worker
+process, so they take plain-data sources (see dataset_source) rather than
+model instances: nothing is pickled with a DB connection or lazy-loaded there.
 """
+import os
+
+from analytics import comparison_view, row_diff, summary_delta
+from analytics.comparison import DIFF_LIMIT, HISTOGRAM_BINS
+from analytics.diff import SECTIONS, SORT_KEYS
+from .comparison_stats import calculate_comparison_stats, dataset_frame
+from .tracing import span
 
-from .comparison_stats import calculate_comparison_stats
+MAX_BINS = 100
+MAX_DIFF_LIMIT = 1000
+MAX_MOVERS = 100
 
-def compare_datasets(dataset_a, dataset_b):
+def dataset_source(dataset, summary=False):
+    """
+    What a comparison task needs from a dataset: id, filename and the path of
+    its CSV, or the summary table when the file is gone. With summary=True the
+    whole summary is included as well.
+    """
+    path = dataset.file.path if dataset.file else None
+    if path is not None and not os.path.exists(path):
+        path = None
+    source = {"id": dataset.id, "filename": dataset.original_filename, "path": path}
+    if summary:
+        source["summary"] = dataset.summary
+    if path is None:
+        source["table"] = dataset.summary.get("table", [])
+    return source
+
+
+def compare_datasets(source_a, source_b):
     """
     Compare two datasets and return the structure with delta.
     Does NOT recalculate basics, just computes differences based on stored summary.
     """
-    summary_a = dataset_a.summary
-    summary_b = dataset_b.summary
+    summary_a = source_a["summary"]
+    summary_b = source_b["summary"]
 
     # Calculate Deltas (B - A)
-    # 1. Total Equipment
-    delta_total = summary_b.get('total_equipment', 0) - summary_a.get('total_equipment', 0)
-
-    # 2. Averages
-    avg_a = summary_a.get('averages', {})
-    avg_b = summary_b.get('averages', {})
+    delta = summary_delta(summary_a, summary_b)
 
-    delta_avgs = {
-        'flowrate': round(avg_b.get('flowrate', 0) - avg_a.get('flowrate', 0), 2),
-        'pressure': round(avg_b.get('pressure', 0) - avg_a.get('pressure', 0), 2),
-        'temperature': round(avg_b.get('temperature', 0) - avg_a.get('temperature', 0), 2),
-    }
-
-    # 3. Advanced Stats
-    stats = calculate_comparison_stats(dataset_a, dataset_b)
+    # Advanced Stats
+    with span("compare.stats"):
+        stats = calculate_comparison_stats(source_a, source_b)
 
     result = {
         "dataset_a": {
-            "id": dataset_a.id,
-            "filename": dataset_a.original_filename,
+            "id": source_a["id"],
+            "filename": source_a["filename"],
             "summary": summary_a
         },
         "dataset_b": {
-            "id": dataset_b.id,
-            "filename": dataset_b.original_filename,
+            "id": source_b["id"],
+            "filename": source_b["filename"],
             "summary": summary_b
         },
-        "delta": {
-            "total_equipment": delta_total,
-            "averages": delta_avgs
-        },
+        "delta": delta,
         "comparison_stats": stats
     }
     
     return result
+
+
+def compare_view_params(query):
+    """
+    (bins, limit) from the query string of /compare/view/
+
+    Raises:
+        ValueError: With a message for the client
+    """
+    try:
+        bins = int(query.get("bins", HISTOGRAM_BINS))
+        limit = int(query.get("limit", DIFF_LIMIT))
+    except ValueError:
+        raise ValueError("bins and limit must be integers")
+    return max(1, min(bins, MAX_BINS)), max(1, min(limit, MAX_DIFF_LIMIT))
+
+
+def compare_view(source_a, source_b, bins=HISTOGRAM_BINS, limit=DIFF_LIMIT):
+    """
+    Compact comparison for the compare screens: pre-binned histograms, per-type
+    bars and an Equipment Name joined diff instead of both row tables
+    """
+    with span("compare.read_csv"):
+        df_a, df_b = dataset_frame(source_a), dataset_frame(source_b)
+    with span("compare.view", rows=len(df_a) + len(df_b)):
+        result = comparison_view(df_a, df_b, bins=bins, limit=limit)
+    for key, source in (("dataset_a", source_a), ("dataset_b", source_b)):
+        result[key] = {"id": source["id"], "filename": source["filename"], **result[key]}
+    return result
+
+
+def diff_params(query):
+    """
+    Keyword arguments of row_diff from the query string of /compare/diff/
+
+    Raises:
+        ValueError: With a message for the client
+    """
+    section = query.get("section", "changed")
+    sort = query.get("sort", "change")
+    if section not in SECTIONS:
+        raise ValueError(f"section must be one of {', '.join(SECTIONS)}")
+    if sort not in SORT_KEYS:
+        raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+    try:
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", 100))
+        k = int(query.get("k", 10))
+    except ValueError:
+        raise ValueError("offset, limit and k must be integers")
+    return {
+        "section": section,
+        "sort": sort,
+        "offset": max(0, offset),
+        "limit": max(1, min(limit, MAX_DIFF_LIMIT)),
+        "k": max(0, min(k, MAX_MOVERS)),
+    }
+
+
+def diff_datasets(source_a, source_b, **params):
+    """Equipment Name aligned row diff of two datasets: counts, top movers and one page"""
+    with span("compare.read_csv"):
+        df_a, df_b = dataset_frame(source_a), dataset_frame(source_b)
+    with span("compare.diff", rows=len(df_a) + len(df_b)):
+        result = row_diff(df_a, df_b, **params)
+    return {"dataset_a": source_a["id"], "dataset_b": source_b["id"], **result}
@@ -0,0 +1,211 @@
+"""
+In-process event bus pushed to clients as server-sent events (GET /api/events/).
+
+The upload and append pipelines publish events as they progress:
+
+    dataset.progress  {dataset_id, filename, stage, progress}
+    dataset.ready     {dataset_id, filename, uploaded_at, total_equipment}
+    dataset.updated   {dataset_id, appended, total_equipment}
+    dataset.failed    {filename, error}
+    report.available  {dataset_id, url}
+
+Events only name what changed; clients fetch GET /api/summary/<id>/ (ETag
+validated) when they need the data, so the stream and replay buffer stay small
+whatever the size of the dataset.
+
+Every event carries the owning user id and is only delivered to streams that
+may read the dataset (same rule as visible_datasets). Recent events are kept
+in a small replay buffer so a reconnecting EventSource (Last-Event-ID) catches
+up on what it missed. Streams end after MAX_STREAM_SECONDS and the client
+reconnects, which bounds the cost of connections that vanished silently.
+
+The stream is only served when EVENT_STREAM["ENABLED"] is set (by default
+when ASYNC_VIEWS is on), and /api/ advertises it as the "events" capability,
+so clients of a sync gunicorn deployment never open one. The bus lives in the
+server process: run a single ASGI worker (CPU work is
+spread over the task executor) or put a shared broker behind publish() when
+scaling out to several processes.
+"""
+import asyncio
+import collections
+import json
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+DEFAULTS = {
+    # Off under WSGI: see EVENT_STREAM in settings
+    "ENABLED": False,
+    "KEEPALIVE_SECONDS": 15,
+    "MAX_STREAM_SECONDS": 300,
+    "REPLAY_SIZE": 100,
+    "QUEUE_SIZE": 256,
+    "RETRY_MS": 3000,
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "EVENT_STREAM", {}))
+    return config
+
+
+class Subscription:
+    """Events visible to one stream, consumed from a request thread"""
+
+    def __init__(self, user_id, queue_size):
+        self.user_id = user_id
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=queue_size)
+
+    def accepts(self, record):
+        return record["owner_id"] is None or record["owner_id"] == self.user_id
+
+    def deliver(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            # Slow consumer: end the stream, the client reconnects and replays
+            self.overflowed = True
+
+    def get(self, timeout):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class AsyncSubscription(Subscription):
+    """Subscription consumed by a coroutine; publishers may run on any thread"""
+
+    def __init__(self, user_id, queue_size):
+        super().__init__(user_id, queue_size)
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=queue_size)
+
+    def deliver(self, record):
+        self._loop.call_soon_threadsafe(self._put, record)
+
+    def _put(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    def __init__(self, replay_size=DEFAULTS["REPLAY_SIZE"]):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = collections.deque(maxlen=replay_size)
+        self._next_id = 1
+
+    def publish(self, event, data, owner_id=None):
+        with self._lock:
+            record = {"id": self._next_id, "event": event, "data": data, "owner_id": owner_id}
+            self._next_id += 1
+            self._history.append(record)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            if subscription.accepts(record):
+                subscription.deliver(record)
+        return record["id"]
+
+    def subscribe(self, subscription, last_event_id=None):
+        """Register a subscription, first replaying buffered events newer than last_event_id"""
+        with self._lock:
+            if last_event_id is not None:
+                for record in self._history:
+                    if record["id"] > last_event_id and subscription.accepts(record):
+                        subscription.deliver(record)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+bus = EventBus(get_config()["REPLAY_SIZE"])
+
+
+def publish(event, data, owner_id=None):
+    return bus.publish(event, data, owner_id)
+
+
+def format_event(record):
+    payload = json.dumps(record["data"], cls=JSONEncoder)
+    return f"id: {record['id']}\nevent: {record['event']}\ndata: {payload}\n\n"
+
+
+def parse_last_event_id(request):
+    value = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def resolve_stream_user(request):
+    """
+    User for an event stream. EventSource cannot set headers, so a JWT may also
+    be passed as ?token=. Raises AuthenticationFailed for bad credentials.
+    """
+    token = request.GET.get("token")
+    if token:
+        authenticator = JWTAuthentication()
+        return authenticator.get_user(authenticator.get_validated_token(token))
+    return Request(request, authenticators=[cls() for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES]).user
+
+
+def stream_disabled_response():
+    """404 for /api/events/ when the stream is not served (sync deployments)"""
+    return JsonResponse({"detail": "Event stream is not enabled on this server"}, status=404)
+
+
+def event_stream_response(stream):
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # disable proxy buffering (nginx)
+    return response
+
+
+def stream_events(user_id, last_event_id=None):
+    """Blocking SSE generator for WSGI deployments (holds a worker per client)"""
+    config = get_config()
+    subscription = bus.subscribe(Subscription(user_id, config["QUEUE_SIZE"]), last_event_id)
+    deadline = time.monotonic() + config["MAX_STREAM_SECONDS"]
+    try:
+        yield f"retry: {config['RETRY_MS']}\n\n"
+        while time.monotonic() < deadline and not subscription.overflowed:
+            record = subscription.get(timeout=config["KEEPALIVE_SECONDS"])
+            yield format_event(record) if record else ": keepalive\n\n"
+    finally:
+        bus.unsubscribe(subscription)
+
+
+async def astream_events(user_id, last_event_id=None):
+    """SSE async generator for ASGI deployments"""
+    config = get_config()
+    subscription = bus.subscribe(AsyncSubscription(user_id, config["QUEUE_SIZE"]), last_event_id)
+    deadline = time.monotonic() + config["MAX_STREAM_SECONDS"]
+    try:
+        yield f"retry: {config['RETRY_MS']}\n\n"
+        while time.monotonic() < deadline and not subscription.overflowed:
+            record = await subscription.get(timeout=config["KEEPALIVE_SECONDS"])
+            yield format_event(record) if record else ": keepalive\n\n"
+    finally:
+        bus.unsubscribe(subscription)
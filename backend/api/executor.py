@@ -0,0 +1,182 @@
+"""
+Bounded executor for CPU-heavy work (CSV analysis, comparisons, PDF rendering).
+
+Work is submitted to a shared thread or process pool configured by the
+TASK_EXECUTOR setting:
+
+    BACKEND         thread | process | inline (runs on the calling thread)
+    MAX_WORKERS     pool size, defaults to the CPU count
+    MAX_QUEUE       tasks allowed to wait for a worker
+    SUBMIT_TIMEOUT  seconds a caller waits for a queue slot before giving up
+
+At most MAX_WORKERS + MAX_QUEUE tasks are in flight. When the queue is full,
+submit() blocks for up to SUBMIT_TIMEOUT and then raises ExecutorBusy, which
+DRF turns into a 503 with a Retry-After header. The process backend needs
+picklable top-level callables and arguments: tasks take plain data (paths,
+summaries, ids), never model instances, and do not query the database.
+Tracing spans and metric stages recorded inside a worker process are lost.
+NumPy and pandas release the GIL for most of their kernels, so the thread
+backend is the default.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+DEFAULTS = {
+    "BACKEND": "thread",
+    "MAX_WORKERS": None,
+    "MAX_QUEUE": 32,
+    "SUBMIT_TIMEOUT": 5.0,
+}
+BACKENDS = ("thread", "process", "inline")
+
+
+class ExecutorBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Server is busy processing other requests, please retry shortly."
+    default_code = "executor_busy"
+
+    def __init__(self, detail=None, wait=1):
+        super().__init__(detail)
+        self.wait = wait
+
+
+def _init_worker():
+    """
+    Process-pool initializer: workers started with 'spawn' need Django configured,
+    and forked ones must not reuse the DB connections inherited from the parent
+    """
+    import django
+    from django.db import connections
+
+    django.setup()
+    connections.close_all()
+
+
+class BoundedExecutor:
+    def __init__(self, backend="thread", max_workers=None, max_queue=32, submit_timeout=5.0):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown executor backend '{backend}', expected one of {BACKENDS}")
+        self.backend = backend
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.submit_timeout = submit_timeout
+        self._slots = threading.BoundedSemaphore(self.max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                if self.backend == "process":
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="api-task")
+            return self._pool
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs); raises ExecutorBusy when no slot frees up in time"""
+        if self.backend == "inline":
+            future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+            return future
+
+        if not self._slots.acquire(timeout=self.submit_timeout):
+            raise self._busy()
+        return self._submit_acquired(fn, *args, **kwargs)
+
+    def _busy(self):
+        return ExecutorBusy(wait=max(1, round(self.submit_timeout)))
+
+    def _submit_acquired(self, fn, *args, **kwargs):
+        try:
+            if self.backend == "thread":
+                # Run in the caller's context so tracing spans nest under the request
+                future = self._get_pool().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+            else:
+                future = self._get_pool().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn, *args, **kwargs):
+        """Submit and wait for the result (exceptions propagate to the caller)"""
+        return self.submit(fn, *args, **kwargs).result()
+
+    async def arun(self, fn, *args, **kwargs):
+        """
+        Awaitable run() for async views: neither waiting for a queue slot nor
+        waiting for the result blocks the event loop.
+        """
+        if self.backend == "inline":
+            return self.run(fn, *args, **kwargs)
+        if not self._slots.acquire(blocking=False):
+            waiter = asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(self._slots.acquire, timeout=self.submit_timeout)
+            )
+            try:
+                acquired = await asyncio.shield(waiter)
+            except asyncio.CancelledError:
+                # Client went away: give the slot back once the pending acquire completes
+                waiter.add_done_callback(lambda f: f.result() and self._slots.release())
+                raise
+            if not acquired:
+                raise self._busy()
+        return await asyncio.wrap_future(self._submit_acquired(fn, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Process-wide executor built from settings.TASK_EXECUTOR on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            config = dict(DEFAULTS)
+            config.update(getattr(settings, "TASK_EXECUTOR", {}))
+            _executor = BoundedExecutor(
+                backend=config["BACKEND"],
+                max_workers=config["MAX_WORKERS"],
+                max_queue=config["MAX_QUEUE"],
+                submit_timeout=config["SUBMIT_TIMEOUT"],
+            )
+        return _executor
+
+
+def reset_executor():
+    """Shut down the shared executor so the next get_executor() rereads settings"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+        _executor = None
+
+
+def run_task(fn, *args, **kwargs):
+    """Run fn on the shared executor and return its result"""
+    return get_executor().run(fn, *args, **kwargs)
+
+
+async def arun_task(fn, *args, **kwargs):
+    """Await fn on the shared executor (for async views)"""
+    return await get_executor().arun(fn, *args, **kwargs)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from analytics import backfill_summary
+from api.models import UploadedDataset
+
+class Command(BaseCommand):
+    help = 'Stores type stats, risk, correlation and anomalies on datasets analysed before they existed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report datasets missing fields without saving')
+        parser.add_argument('--batch-size', type=int, default=100, help='Datasets loaded per query')
+
+    def handle(self, *args, **options):
+        updated = 0
+        for dataset in UploadedDataset.objects.order_by('id').iterator(chunk_size=options['batch_size']):
+            summary, fields = backfill_summary(dataset.summary)
+            if not fields:
+                continue
+            updated += 1
+            if options['verbosity'] > 1:
+                self.stdout.write(f"#{dataset.id}: {', '.join(fields)}")
+            if not options['dry_run']:
+                dataset.summary = summary
+                dataset.save(update_fields=['summary'])
+
+        if options['dry_run']:
+            self.stdout.write(f"{updated} dataset(s) would be backfilled")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Backfilled {updated} dataset(s)"))
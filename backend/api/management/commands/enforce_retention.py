@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from api.services.retention_service import DELETE_BATCH_SIZE, enforce_all
+
+class Command(BaseCommand):
+    help = 'Deletes datasets that exceed per-user/group retention quotas (count, age, bytes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report expired datasets without deleting them')
+        parser.add_argument('--batch-size', type=int, default=DELETE_BATCH_SIZE, help='Datasets deleted per query')
+
+    def handle(self, *args, **options):
+        result = enforce_all(dry_run=options['dry_run'], batch_size=options['batch_size'])
+        expired = len(result['expired'])
+
+        if options['dry_run']:
+            self.stdout.write(f"{expired} dataset(s) across {result['owners']} owner(s) would be deleted")
+            if options['verbosity'] > 1 and expired:
+                self.stdout.write(', '.join(str(i) for i in result['expired']))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Deleted {result['deleted']} dataset(s) across {result['owners']} owner(s)"
+            ))
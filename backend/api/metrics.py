@@ -0,0 +1,334 @@
+"""
+Request-level performance metrics, exposed in Prometheus text format on /metrics.
+
+RequestMetricsMiddleware times every request and records, per view:
+
+    http_requests_total                 {view, method, status}
+    http_request_duration_seconds       {view, method}   histogram
+    http_response_size_bytes            {view}           histogram
+    db_queries_per_request              {view}           histogram
+    db_query_duration_seconds_total     {view}
+
+Code on the request path marks its expensive stages with `stage()`
+(parse, analyze, ai, render, serialize), which feeds
+
+    app_stage_duration_seconds          {stage}          histogram
+
+and summary fields that are computed once and persisted for older datasets
+report lookups with `record_cache()`:
+
+    app_cache_requests_total            {cache, result=hit|miss}
+
+Requests slower than SLOW_REQUEST_MS are logged as one JSON line with the
+per-stage breakdown. The registry lives in the server process, so each
+gunicorn worker exposes its own series (scrape each worker, or run a single
+uvicorn worker as for the event stream).
+"""
+import bisect
+import contextlib
+import contextvars
+import hmac
+import json
+import logging
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+
+from . import tracing
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "ENABLED": True,
+    "SLOW_REQUEST_MS": 1000,
+    # /metrics requires "Authorization: Bearer <TOKEN>"; without a token it is
+    # only served when DEBUG is on
+    "TOKEN": None,
+}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "METRICS", {}))
+    return config
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name, list(zip(self.labelnames, key)), value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, ([*counts], total, count)) for key, (counts, total, count) in self._values.items())
+        for key, (counts, total, count) in items:
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                le = bound if bound == "+Inf" else _format_value(float(bound))
+                yield f"{self.name}_bucket", labels + [("le", le)], cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP requests by view, method and status code.", ("view", "method", "status")))
+LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "Request latency by view.", ("view", "method")))
+RESPONSE_SIZE = registry.register(Histogram(
+    "http_response_size_bytes", "Response body size by view.", ("view",), SIZE_BUCKETS))
+DB_QUERIES = registry.register(Histogram(
+    "db_queries_per_request", "Database queries issued per request.", ("view",), QUERY_BUCKETS))
+DB_TIME = registry.register(Counter(
+    "db_query_duration_seconds_total", "Time spent in database queries by view.", ("view",)))
+STAGES = registry.register(Histogram(
+    "app_stage_duration_seconds", "Time spent in parse/analyze/ai/render/serialize stages.", ("stage",)))
+CACHE = registry.register(Counter(
+    "app_cache_requests_total", "Lookups of persisted summary fields, by cache and hit/miss.", ("cache", "result")))
+
+
+class RequestStats:
+    """Per-request measurements, reachable from stage() through a context variable"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.stages = {}
+
+    def add_stage(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_seconds += time.perf_counter() - start
+
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+def _install_db_wrapper(stats):
+    connection.execute_wrappers.append(stats.db_wrapper)
+
+
+def _remove_db_wrapper(stats):
+    connection.execute_wrappers.remove(stats.db_wrapper)
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Time a block as a named request stage (also traced as a span); usable outside requests too"""
+    start = time.perf_counter()
+    try:
+        with tracing.span(name):
+            yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGES.observe(elapsed, stage=name)
+        stats = _current.get()
+        if stats is not None:
+            stats.add_stage(name, elapsed)
+
+
+def record_cache(name, hit):
+    CACHE.inc(cache=name, result="hit" if hit else "miss")
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    # Unmatched paths share one label so 404 scans cannot blow up cardinality
+    return (match.view_name or match.route) if match else "unmatched"
+
+
+def _response_size(response):
+    if response.streaming:
+        length = response.get("Content-Length")
+        return int(length) if length else None
+    return len(response.content)
+
+
+class RequestMetricsMiddleware:
+    """Records latency, DB and response-size metrics for every request (sync and async)"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = get_config()["ENABLED"]
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            with connection.execute_wrapper(stats.db_wrapper):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._finish(request, response, stats)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        # Connections are per thread: hook the one the async ORM calls of this request run on
+        await sync_to_async(_install_db_wrapper)(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+            await sync_to_async(_remove_db_wrapper)(stats)
+        self._finish(request, response, stats)
+        return response
+
+    def process_template_response(self, request, response):
+        """DRF responses are rendered after the view returns: time that as the serialize stage"""
+        started = time.perf_counter()
+        stats = _current.get()
+        parent = tracing.current_span()
+        serialize_span = tracing.Span("serialize", parent.trace, parent.span_id) if parent else None
+
+        def rendered(response):
+            elapsed = time.perf_counter() - started
+            if serialize_span is not None:
+                serialize_span.end()
+            STAGES.observe(elapsed, stage="serialize")
+            if stats is not None:
+                stats.add_stage("serialize", elapsed)
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def _finish(self, request, response, stats):
+        elapsed = time.perf_counter() - stats.started
+        view = _view_name(request)
+        size = _response_size(response)
+
+        REQUESTS.inc(view=view, method=request.method, status=response.status_code)
+        LATENCY.observe(elapsed, view=view, method=request.method)
+        if size is not None:
+            RESPONSE_SIZE.observe(size, view=view)
+        DB_QUERIES.observe(stats.db_queries, view=view)
+        DB_TIME.inc(stats.db_seconds, view=view)
+
+        if elapsed * 1000 >= get_config()["SLOW_REQUEST_MS"]:
+            logger.warning(json.dumps({
+                "event": "slow_request",
+                "method": request.method,
+                "path": request.path,
+                "view": view,
+                "status": response.status_code,
+                "duration_ms": round(elapsed * 1000, 1),
+                "db_queries": stats.db_queries,
+                "db_ms": round(stats.db_seconds * 1000, 1),
+                "response_bytes": size,
+                "stages_ms": {name: round(seconds * 1000, 1) for name, seconds in stats.stages.items()},
+            }))
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint"""
+    token = get_config()["TOKEN"]
+    if token:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied.encode(), token.encode()):
+            return HttpResponse("Unauthorized\n", status=401, content_type="text/plain")
+    elif not settings.DEBUG:
+        # Per-view traffic is not public: production deployments must configure a token
+        return HttpResponse("Not Found\n", status=404, content_type="text/plain")
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
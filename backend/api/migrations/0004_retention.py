@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:50
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_file_size(apps, schema_editor):
+    UploadedDataset = apps.get_model('api', 'UploadedDataset')
+    for dataset in UploadedDataset.objects.exclude(file='').iterator():
+        try:
+            dataset.file_size = dataset.file.size
+        except (OSError, ValueError):
+            continue
+        dataset.save(update_fields=['file_size'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('api', '0003_uploadeddataset_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadeddataset',
+            name='file_size',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='RetentionPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('max_datasets', models.PositiveIntegerField(blank=True, null=True)),
+                ('max_age_days', models.PositiveIntegerField(blank=True, null=True)),
+                ('max_bytes', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('group', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='retention_policy', to='auth.group')),
+                ('user', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='retention_policy', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'retention policies',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='retentionpolicy',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('group__isnull', True), ('user__isnull', False)), models.Q(('group__isnull', False), ('user__isnull', True)), _connector='OR'), name='retention_policy_single_owner'),
+        ),
+        migrations.RunPython(backfill_file_size, migrations.RunPython.noop),
+    ]
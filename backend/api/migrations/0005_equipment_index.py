@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-19 10:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+import math
+
+
+def _number(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+def backfill_readings(apps, schema_editor):
+    UploadedDataset = apps.get_model('api', 'UploadedDataset')
+    EquipmentReading = apps.get_model('api', 'EquipmentReading')
+    for dataset in UploadedDataset.objects.iterator():
+        rows = (dataset.summary or {}).get('table') or []
+        EquipmentReading.objects.bulk_create([
+            EquipmentReading(
+                dataset_id=dataset.id,
+                row_index=i,
+                equipment_name=str(row.get('Equipment Name', ''))[:255],
+                equipment_type=str(row.get('Type', ''))[:100],
+                recorded_at=dataset.uploaded_at,
+                flowrate=_number(row.get('Flowrate')),
+                pressure=_number(row.get('Pressure')),
+                temperature=_number(row.get('Temperature')),
+            )
+            for i, row in enumerate(rows)
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_retention'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquipmentReading',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row_index', models.PositiveIntegerField()),
+                ('equipment_name', models.CharField(max_length=255)),
+                ('equipment_type', models.CharField(max_length=100)),
+                ('recorded_at', models.DateTimeField()),
+                ('flowrate', models.FloatField(null=True)),
+                ('pressure', models.FloatField(null=True)),
+                ('temperature', models.FloatField(null=True)),
+                ('dataset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='readings', to='api.uploadeddataset')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['equipment_name', '-recorded_at'], name='reading_name_time_idx'), models.Index(fields=['equipment_type', '-recorded_at'], name='reading_type_time_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='equipmentreading',
+            constraint=models.UniqueConstraint(fields=('dataset', 'row_index'), name='reading_unique_row'),
+        ),
+        migrations.RunPython(backfill_readings, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 
 
 class UploadedDataset(models.Model):
@@ -6,7 +7,65 @@ class UploadedDataset(models.Model):
     original_filename = models.CharField(max_length=255, blank=True, null=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey('auth.User', on_delete=models.SET_NULL, null=True, blank=True)
+    file_size = models.PositiveBigIntegerField(default=0)
     summary = models.JSONField()
 
     def __str__(self):
         return f"Dataset {self.id} ({self.original_filename}) uploaded at {self.uploaded_at}"
+
+
+class RetentionPolicy(models.Model):
+    """
+    Dataset quota for a single user or a group.
+    Empty limits inherit from the group / DATASET_RETENTION defaults, 0 means unlimited.
+    """
+    user = models.OneToOneField(
+        'auth.User', on_delete=models.CASCADE, null=True, blank=True, related_name='retention_policy'
+    )
+    group = models.OneToOneField(
+        'auth.Group', on_delete=models.CASCADE, null=True, blank=True, related_name='retention_policy'
+    )
+    max_datasets = models.PositiveIntegerField(null=True, blank=True)
+    max_age_days = models.PositiveIntegerField(null=True, blank=True)
+    max_bytes = models.PositiveBigIntegerField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = 'retention policies'
+        constraints = [
+            models.CheckConstraint(
+                check=Q(user__isnull=False, group__isnull=True) | Q(user__isnull=True, group__isnull=False),
+                name='retention_policy_single_owner',
+            ),
+        ]
+
+    def __str__(self):
+        owner = f"user {self.user}" if self.user_id else f"group {self.group}"
+        return f"Retention policy for {owner}"
+
+
+class EquipmentReading(models.Model):
+    """
+    One dataset row indexed by equipment name/type, so per-asset history is an
+    index lookup instead of a scan over every summary['table'].
+    """
+    dataset = models.ForeignKey(UploadedDataset, on_delete=models.CASCADE, related_name='readings')
+    row_index = models.PositiveIntegerField()
+    equipment_name = models.CharField(max_length=255)
+    equipment_type = models.CharField(max_length=100)
+    # Denormalised from the dataset so history ordering is served by the index
+    recorded_at = models.DateTimeField()
+    flowrate = models.FloatField(null=True)
+    pressure = models.FloatField(null=True)
+    temperature = models.FloatField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['equipment_name', '-recorded_at'], name='reading_name_time_idx'),
+            models.Index(fields=['equipment_type', '-recorded_at'], name='reading_type_time_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['dataset', 'row_index'], name='reading_unique_row'),
+        ]
+
+    def __str__(self):
+        return f"{self.equipment_name} in dataset {self.dataset_id} (row {self.row_index})"
@@ -7,9 +7,14 @@ from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from datetime import datetime
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import io
 
+from analytics.correlation import correlation_from_table, correlation_label
+from analytics.risk import evaluate_table
+from .metrics import record_cache
+from .tracing import span
+
 class ReportGenerator:
     """Generates PDF reports for Equipment Datasets"""
     
@@ -38,59 +43,55 @@ class ReportGenerator:
             spaceAfter=10
         ))
     
+    def _figure_image(self, fig):
+        """Render a matplotlib figure into a reportlab Image"""
+        img_buffer = io.BytesIO()
+        fig.savefig(img_buffer, format='png', bbox_inches='tight')
+        img_buffer.seek(0)
+        return Image(img_buffer, width=400, height=260)
+
+    # Charts use the object-oriented Figure API rather than pyplot's global
+    # state, so reports can be rendered concurrently on executor threads.
     def _create_pie_chart(self, distribution):
         """Create a pie chart for equipment types"""
         labels = list(distribution.keys())
         sizes = list(distribution.values())
         
-        plt.figure(figsize=(6, 4))
-        plt.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=140)
-        plt.axis('equal')
-        plt.title('Equipment Distribution')
-        
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', bbox_inches='tight')
-        plt.close()
-        img_buffer.seek(0)
-        return Image(img_buffer, width=400, height=260)
+        fig = Figure(figsize=(6, 4))
+        ax = fig.subplots()
+        ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=140)
+        ax.axis('equal')
+        ax.set_title('Equipment Distribution')
+        return self._figure_image(fig)
 
     def _create_bar_chart(self, averages):
         """Create a bar chart for average metrics"""
         metrics = ['Flowrate', 'Pressure', 'Temp']
         values = [averages.get('flowrate', 0), averages.get('pressure', 0), averages.get('temperature', 0)]
         
-        plt.figure(figsize=(6, 4))
-        plt.bar(metrics, values, color=['#3b82f6', '#10b981', '#f59e0b'])
-        plt.ylabel('Value')
-        plt.title('Average Metrics')
-        
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', bbox_inches='tight')
-        plt.close()
-        img_buffer.seek(0)
-        return Image(img_buffer, width=400, height=260)
+        fig = Figure(figsize=(6, 4))
+        ax = fig.subplots()
+        ax.bar(metrics, values, color=['#3b82f6', '#10b981', '#f59e0b'])
+        ax.set_ylabel('Value')
+        ax.set_title('Average Metrics')
+        return self._figure_image(fig)
 
     def _create_scatter_plot(self, table_data):
         """Create a scatter plot for Pressure vs Temperature correlation"""
         pressures = [float(row.get('Pressure', 0)) for row in table_data]
         temps = [float(row.get('Temperature', 0)) for row in table_data]
         
-        plt.figure(figsize=(6, 4))
-        plt.scatter(pressures, temps, color='black', alpha=0.6)
-        plt.xlabel('Pressure (bar)')
-        plt.ylabel('Temperature (°C)')
-        plt.title('Pressure-Temperature Correlation')
-        plt.grid(True, linestyle='--', alpha=0.3)
-        
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', bbox_inches='tight')
-        plt.close()
-        img_buffer.seek(0)
-        return Image(img_buffer, width=400, height=260)
+        fig = Figure(figsize=(6, 4))
+        ax = fig.subplots()
+        ax.scatter(pressures, temps, color='black', alpha=0.6)
+        ax.set_xlabel('Pressure (bar)')
+        ax.set_ylabel('Temperature (°C)')
+        ax.set_title('Pressure-Temperature Correlation')
+        ax.grid(True, linestyle='--', alpha=0.3)
+        return self._figure_image(fig)
 
-    def generate(self, dataset):
-        """Build the PDF document"""
-        data = dataset.summary
+    def generate(self, data, title):
+        """Build the PDF document from a dataset summary"""
         table_rows = data.get('table', [])
         
         # --- Header ---
@@ -98,7 +99,7 @@ class ReportGenerator:
         self.elements.append(title)
         
         meta_info = [
-            [Paragraph(f"<b>Dataset:</b> {dataset.original_filename or f'#{dataset.id}'}", self.styles['Normal']),
+            [Paragraph(f"<b>Dataset:</b> {title}", self.styles['Normal']),
              Paragraph(f"<b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M')}", self.styles['Normal'])],
         ]
         t_meta = Table(meta_info, colWidths=[250, 250])
@@ -115,46 +116,19 @@ class ReportGenerator:
                 self.elements.append(Paragraph(cleaned_insights, self.styles['Italic']))
             self.elements.append(Spacer(1, 15))
 
-        # Risk, Stability and Correlation Calculations
-        avg_p = float(data.get('averages', {}).get('pressure', 1))
-        avg_t = float(data.get('averages', {}).get('temperature', 1))
-        within_bounds = 0
-        critical_assets = []
-        
-        # Pearson correlation calculation
-        import math
-        ps = [float(row.get('Pressure', 0)) for row in table_rows]
-        ts = [float(row.get('Temperature', 0)) for row in table_rows]
-        n = len(ps)
-        corr_label = "N/A"
-        
-        if n > 1:
-            try:
-                sum_p = sum(ps)
-                sum_t = sum(ts)
-                sum_p2 = sum(p**2 for p in ps)
-                sum_t2 = sum(t**2 for t in ts)
-                sum_pt = sum(ps[i] * ts[i] for i in range(n))
-                
-                num = (n * sum_pt) - (sum_p * sum_t)
-                den = math.sqrt((n * sum_p2 - sum_p**2) * (n * sum_t2 - sum_t**2))
-                r = num / den if den != 0 else 0
-                
-                if abs(r) > 0.7: corr_label = "Strong"
-                elif abs(r) > 0.4: corr_label = "Moderate"
-                else: corr_label = "Weak"
-            except:
-                pass
+        # Risk & Stability: persisted at upload by the risk engine (older datasets are evaluated here)
+        record_cache("summary.risk", 'risk' in data)
+        risk = data.get('risk') or evaluate_table(table_rows)
+        critical_assets = [
+            [item['equipment_name'], item['type'], f"{item['pressure']} bar", f"{item['temperature']} °C", "CRITICAL"]
+            for item in risk['flagged'] if item['level'] == 'critical'
+        ]
+        stability_score = f"{risk['stability_score']:.0f}%" if risk['stability_score'] is not None else "N/A"
 
-        for row in table_rows:
-            p = float(row.get('Pressure', 0))
-            t = float(row.get('Temperature', 0))
-            if p <= avg_p * 1.2 and t <= avg_t * 1.2:
-                within_bounds += 1
-            if p > avg_p * 1.5 or t > avg_t * 1.5:
-                critical_assets.append([row.get('Equipment Name'), row.get('Type'), f"{p} bar", f"{t} °C", "CRITICAL"])
-        
-        stability_score = f"{(within_bounds / len(table_rows) * 100):.0f}%" if table_rows else "N/A"
+        # P-T correlation: persisted at upload by the correlation stage (older datasets are computed here)
+        record_cache("summary.correlation", 'correlation' in data)
+        correlation = data.get('correlation') or correlation_from_table(table_rows)
+        corr_label = correlation_label(correlation)
 
         # --- Summary Section ---
         self.elements.append(Paragraph("Operational Summary", self.styles['Header2']))
@@ -179,6 +153,13 @@ class ReportGenerator:
             ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
         ]))
         self.elements.append(t)
+        legend_style = ParagraphStyle(name='Legend', parent=self.styles['Italic'], fontSize=8, textColor=colors.grey)
+        self.elements.append(Paragraph(
+            "Stability score: share of assets on which no risk rule fires, warnings included. "
+            "Critical assets: pressure or temperature above 1.5x the dataset mean or the mean of the "
+            "equipment type (default RISK_RULES; per-type limits and the low-pressure warning are part of the score).",
+            legend_style,
+        ))
         self.elements.append(Spacer(1, 10))
 
         # --- Risk Assets ---
@@ -198,27 +179,34 @@ class ReportGenerator:
         # --- Charts ---
         self.elements.append(Paragraph("Analytical Visualizations", self.styles['Header2']))
         if 'averages' in data:
-            self.elements.append(self._create_bar_chart(data['averages']))
+            with span("report.chart", chart="bar"):
+                self.elements.append(self._create_bar_chart(data['averages']))
         if table_rows:
             self.elements.append(Spacer(1, 10))
-            self.elements.append(self._create_scatter_plot(table_rows))
+            with span("report.chart", chart="scatter", points=len(table_rows)):
+                self.elements.append(self._create_scatter_plot(table_rows))
         
         distribution = data.get('type_distribution', {})
         if distribution:
             self.elements.append(Spacer(1, 20))
             self.elements.append(Paragraph("Equipment Distribution", self.styles['Header2']))
-            self.elements.append(self._create_pie_chart(distribution))
+            with span("report.chart", chart="pie"):
+                self.elements.append(self._create_pie_chart(distribution))
 
         self.elements.append(Spacer(1, 30))
         footer_style = ParagraphStyle(name='Footer', parent=self.styles['Italic'], fontSize=8, textColor=colors.grey, alignment=1)
         self.elements.append(Paragraph("Confidential Process Report • Generated by Chemical Parameter Visualizer AI Engine", footer_style))
         
-        self.doc.build(self.elements)
+        with span("report.build_pdf"):
+            self.doc.build(self.elements)
 
-def generate_pdf_report(dataset):
-    """Wrapper to create PDF buffer"""
+def generate_pdf_report(summary, title):
+    """
+    Wrapper to create PDF buffer. Takes the summary and display name rather than
+    the dataset so it can run in an executor worker process.
+    """
     buffer = BytesIO()
     report = ReportGenerator(buffer)
-    report.generate(dataset)
+    report.generate(summary, title)
     buffer.seek(0)
     return buffer
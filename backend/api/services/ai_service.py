@@ -1,7 +1,18 @@
+import asyncio
 import os
 import google.generativeai as genai
+from asgiref.sync import async_to_sync
 from django.conf import settings
 
+from ..tracing import span
+
+# summary field -> insight_type
+INSIGHT_FIELDS = {
+    "ai_insights": "general",
+    "analytics_insight": "analytics",
+    "trends_insight": "trends",
+}
+
 def generate_chemical_insights(summary_data, insight_type="general"):
     """
     Generate professional chemical engineering insights using Gemini.
@@ -61,3 +72,22 @@ def generate_chemical_insights(summary_data, insight_type="general"):
         return response.text.strip()
     except Exception as e:
         return f"Operational observation: System is running within calculated parameters. (AI Error: {str(e)})"
+
+
+async def agenerate_chemical_insights(summary_data, insight_type="general"):
+    """generate_chemical_insights without blocking the event loop (the Gemini client is synchronous)"""
+    with span("ai.insight", insight_type=insight_type):
+        return await asyncio.to_thread(generate_chemical_insights, summary_data, insight_type)
+
+
+async def agenerate_all_insights(summary_data):
+    """Every INSIGHT_FIELDS entry, fetched concurrently"""
+    results = await asyncio.gather(
+        *(agenerate_chemical_insights(summary_data, insight_type) for insight_type in INSIGHT_FIELDS.values())
+    )
+    return dict(zip(INSIGHT_FIELDS, results))
+
+
+def generate_all_insights(summary_data):
+    """Sync entry point: the three remote calls overlap instead of running back to back"""
+    return async_to_sync(agenerate_all_insights)(summary_data)
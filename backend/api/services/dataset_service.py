@@ -1,60 +1,144 @@
+import os
+import shutil
+
+import pandas as pd
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from ..events import publish
+from ..executor import run_task
+from ..metrics import stage
+from ..tracing import span
 from ..models import UploadedDataset
-from ..utils import analyze_csv
-from django.db.models import Q
+from ..utils import analyze_csv, append_to_summary
+from ..validators.csv_validator import NUMERIC_COLUMNS, validate_metric_values, validate_row_total
+from .equipment_index import index_rows
 
 def handle_upload(file, user=None):
     """
     Orchestrates the upload process:
     1. Creates dataset record
     2. Runs analysis
-    3. Cleans up old datasets
+    3. Indexes rows by equipment for per-asset history
+
+    Progress and the finished dataset are pushed to event stream subscribers
+    (see events.py). Old datasets are pruned out-of-band by the retention engine
+    (see services/retention_service.py and `manage.py enforce_retention`).
     """
     original_filename = file.name
     
     # Create initial record
-    dataset = UploadedDataset.objects.create(
-        file=file,
-        original_filename=original_filename,
-        user=user,
-        summary={}
-    )
-    
+    with span("upload.save_file", size=file.size or 0):
+        dataset = UploadedDataset.objects.create(
+            file=file,
+            original_filename=original_filename,
+            user=user,
+            file_size=file.size or 0,
+            summary={}
+        )
+    owner_id = user.id if user else None
+
+    def progress(stage, value):
+        publish("dataset.progress", {
+            "dataset_id": dataset.id, "filename": original_filename, "stage": stage, "progress": value,
+        }, owner_id)
+
     # Run analysis
     try:
+        progress("received", 0.1)
         # Note: dataset.file.path is available because we saved the object
-        summary = analyze_csv(dataset.file.path)
+        with stage("analyze"):
+            summary = run_task(analyze_csv, dataset.file.path)
+        progress("analysed", 0.6)
         
         # Integration: Add Multi-View AI Insights
-        from .ai_service import generate_chemical_insights
-        summary['ai_insights'] = generate_chemical_insights(summary, "general")
-        summary['analytics_insight'] = generate_chemical_insights(summary, "analytics")
-        summary['trends_insight'] = generate_chemical_insights(summary, "trends")
+        from .ai_service import generate_all_insights
+        with stage("ai"):
+            summary.update(generate_all_insights(summary))
+        progress("insights", 0.85)
         
         dataset.summary = summary
-        dataset.save()
+        with span("upload.save_summary"):
+            dataset.save()
+        with span("upload.index_rows", rows=len(summary["table"])):
+            index_rows(dataset, summary["table"])
     except Exception as e:
         # If analysis fails, remove the file/record to avoid junk
+        publish("dataset.failed", {"filename": original_filename, "error": str(e)}, owner_id)
         dataset.delete()
         raise e 
-        
-    # Cleanup old datasets for this user context
-    cleanup_old_datasets(user)
-    
+
+    publish("dataset.ready", {
+        "dataset_id": dataset.id,
+        "filename": original_filename,
+        "uploaded_at": dataset.uploaded_at,
+        "total_equipment": summary["total_equipment"],
+    }, owner_id)
+    publish("report.available", {
+        "dataset_id": dataset.id, "url": reverse("download-report", args=[dataset.id]),
+    }, owner_id)
     return dataset
 
-def cleanup_old_datasets(user=None, limit=5):
+
+def _append_csv_rows(path, df):
+    """Append rows to the stored CSV, following the column order of its header"""
+    header = pd.read_csv(path, nrows=0).columns
+    with open(path, "rb+") as f:
+        f.seek(0, 2)
+        if f.tell() > 0:
+            f.seek(-1, 2)
+            needs_newline = f.read(1) != b"\n"
+        else:
+            needs_newline = False
+        if needs_newline:
+            f.write(b"\n")
+        f.write(df.reindex(columns=header).to_csv(header=False, index=False).encode())
+
+
+def handle_append(dataset_id, df):
     """
-    Enforces the limit on number of datasets per user (or anonymous context)
+    Appends validated rows to an existing dataset:
+    1. Merges aggregates of the new rows into the stored summary
+    2. Appends rows to the stored CSV (so file-based comparisons stay in sync)
+    3. Indexes the new rows by equipment
+
+    The rows are written to a copy of the CSV that replaces the stored file only
+    once the summary is saved, so a failed append leaves both unchanged.
+
+    AI insights are left as they were computed at upload time.
+
+    Raises:
+        ValidationError: If a metric is missing or not a number, or the dataset
+            would exceed the upload row limit
     """
-    if user:
-        qs = UploadedDataset.objects.filter(user=user).order_by("-uploaded_at")
-    else:
-        qs = UploadedDataset.objects.filter(user__isnull=True).order_by("-uploaded_at")
-        
-    if qs.count() > limit:
-        # Delete oldest
-        # Using slice [limit:] returns the list logic in python, but for queryset delete()
-        # we need to be careful. slicing returns a new queryset.
-        # We can collect IDs to delete.
-        ids_to_delete = qs[limit:].values_list('id', flat=True)
-        UploadedDataset.objects.filter(id__in=list(ids_to_delete)).delete()
+    validate_metric_values(df)
+    df = df.copy()
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col])
+
+    with transaction.atomic():
+        dataset = UploadedDataset.objects.select_for_update().get(id=dataset_id)
+        start_row = len(dataset.summary.get("table", []))
+        validate_row_total(start_row, len(df))
+        # Analyse before touching the CSV so a busy executor leaves the dataset unchanged
+        with stage("analyze"):
+            summary = run_task(append_to_summary, dataset.summary, df)
+        path = dataset.file.path
+        staged = f"{path}.append"
+        shutil.copyfile(path, staged)
+        try:
+            _append_csv_rows(staged, df)
+            dataset.summary = summary
+            dataset.file_size = os.path.getsize(staged)
+            dataset.save(update_fields=["summary", "file_size"])
+            index_rows(dataset, df.to_dict(orient="records"), start_row, recorded_at=timezone.now())
+            os.replace(staged, path)
+        finally:
+            if os.path.exists(staged):
+                os.remove(staged)
+        transaction.on_commit(lambda: publish("dataset.updated", {
+            "dataset_id": dataset.id, "appended": len(df), "total_equipment": summary["total_equipment"],
+        }, dataset.user_id))
+
+    return dataset
@@ -0,0 +1,103 @@
+"""
+Cross-dataset equipment index.
+
+Every analysed row is mirrored into EquipmentReading so per-asset history
+("how has Pump-1's pressure drifted over the last 50 runs") is an indexed
+lookup by equipment name instead of a scan over stored summaries.
+"""
+import math
+
+from django.db.models import Max
+
+from ..models import EquipmentReading
+
+BULK_BATCH_SIZE = 1000
+
+
+def _number(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+def index_rows(dataset, records, start_row=0, recorded_at=None):
+    """
+    Bulk insert readings for `records` (row dicts) starting at `start_row`,
+    stamped with `recorded_at` (defaults to the dataset's upload time)
+    """
+    recorded_at = recorded_at or dataset.uploaded_at
+    readings = [
+        EquipmentReading(
+            dataset_id=dataset.id,
+            row_index=start_row + offset,
+            equipment_name=str(row.get("Equipment Name", ""))[:255],
+            equipment_type=str(row.get("Type", ""))[:100],
+            recorded_at=recorded_at,
+            flowrate=_number(row.get("Flowrate")),
+            pressure=_number(row.get("Pressure")),
+            temperature=_number(row.get("Temperature")),
+        )
+        for offset, row in enumerate(records)
+    ]
+    EquipmentReading.objects.bulk_create(readings, batch_size=BULK_BATCH_SIZE)
+    return len(readings)
+
+
+def equipment_history(datasets, equipment_name, equipment_type=None, limit=50):
+    """
+    Readings for one asset across the given dataset queryset, limited to the
+    `limit` most recent runs and returned oldest first.
+    """
+    readings = EquipmentReading.objects.filter(equipment_name=equipment_name, dataset__in=datasets)
+    if equipment_type:
+        readings = readings.filter(equipment_type=equipment_type)
+
+    # A run's rows can carry several timestamps (appends): rank runs by their latest reading
+    recent_runs = list(
+        readings.values("dataset_id")
+        .annotate(latest=Max("recorded_at"))
+        .order_by("-latest", "-dataset_id")
+        .values_list("dataset_id", flat=True)[:limit]
+    )
+    rows = (
+        readings.filter(dataset_id__in=recent_runs)
+        .order_by("recorded_at", "dataset_id", "row_index")
+        .values(
+            "dataset_id", "dataset__original_filename", "recorded_at", "row_index",
+            "equipment_type", "flowrate", "pressure", "temperature",
+        )
+    )
+    return [
+        {
+            "dataset_id": row["dataset_id"],
+            "filename": row["dataset__original_filename"],
+            "uploaded_at": row["recorded_at"],
+            "row": row["row_index"],
+            "type": row["equipment_type"],
+            "flowrate": row["flowrate"],
+            "pressure": row["pressure"],
+            "temperature": row["temperature"],
+        }
+        for row in rows
+    ]
+
+
+def drift(points, metrics=("flowrate", "pressure", "temperature")):
+    """First/last/change per metric across a chronological series"""
+    result = {}
+    for metric in metrics:
+        values = [p[metric] for p in points if p[metric] is not None]
+        if not values:
+            continue
+        first, last = values[0], values[-1]
+        result[metric] = {
+            "first": first,
+            "last": last,
+            "min": min(values),
+            "max": max(values),
+            "change": round(last - first, 4),
+            "percent_change": round((last - first) / first * 100, 2) if first else None,
+        }
+    return result
@@ -0,0 +1,167 @@
+"""
+Dataset retention engine.
+
+Quotas (count, age, bytes) are resolved per owner from RetentionPolicy rows,
+falling back to settings.DATASET_RETENTION. Enforcement runs as a periodic
+batch (`python manage.py enforce_retention`) instead of on the upload path.
+"""
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from ..models import RetentionPolicy, UploadedDataset
+
+LIMIT_FIELDS = ('max_datasets', 'max_age_days', 'max_bytes')
+DELETE_BATCH_SIZE = 500
+
+
+def default_policy():
+    """Project-wide limits from settings, keyed like RetentionPolicy fields"""
+    config = getattr(settings, 'DATASET_RETENTION', {})
+    return {
+        'max_datasets': config.get('MAX_DATASETS') or 0,
+        'max_age_days': config.get('MAX_AGE_DAYS') or 0,
+        'max_bytes': config.get('MAX_BYTES') or 0,
+    }
+
+
+def _merge_group_limits(policies):
+    """Combine several group policies, keeping the most generous value per limit"""
+    merged = {}
+    for field in LIMIT_FIELDS:
+        values = [getattr(p, field) for p in policies if getattr(p, field) is not None]
+        if not values:
+            continue
+        merged[field] = 0 if 0 in values else max(values)
+    return merged
+
+
+def _layer(base, overrides):
+    policy = dict(base)
+    policy.update({k: v for k, v in overrides.items() if v is not None})
+    return policy
+
+
+class PolicyResolver:
+    """
+    Resolves the effective policy for any owner with a fixed number of queries.
+    Precedence: user policy > group policies > settings defaults.
+    """
+
+    def __init__(self):
+        self.defaults = default_policy()
+        self.user_policies = {}
+        group_policies = {}
+        for policy in RetentionPolicy.objects.all():
+            if policy.user_id:
+                self.user_policies[policy.user_id] = policy
+            else:
+                group_policies[policy.group_id] = policy
+
+        self.user_groups = {}
+        if group_policies:
+            memberships = User.groups.through.objects.filter(group_id__in=group_policies.keys())
+            for user_id, group_id in memberships.values_list('user_id', 'group_id'):
+                self.user_groups.setdefault(user_id, []).append(group_policies[group_id])
+
+    def resolve(self, user_id=None):
+        policy = dict(self.defaults)
+        if user_id is None:
+            return policy
+        policy = _layer(policy, _merge_group_limits(self.user_groups.get(user_id, [])))
+        user_policy = self.user_policies.get(user_id)
+        if user_policy:
+            policy = _layer(policy, {f: getattr(user_policy, f) for f in LIMIT_FIELDS})
+        return policy
+
+
+def select_expired(rows, policy, now=None):
+    """
+    Pick datasets that fall outside the policy.
+
+    Args:
+        rows: (id, uploaded_at, file_size) tuples ordered newest first
+        policy: dict with max_datasets / max_age_days / max_bytes (0 = unlimited)
+
+    The byte budget never expires the newest dataset, even when it alone is
+    larger than max_bytes: an owner keeps at least their latest upload.
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=policy['max_age_days']) if policy['max_age_days'] else None
+    max_count = policy['max_datasets']
+    max_bytes = policy['max_bytes']
+
+    expired = []
+    kept = 0
+    kept_bytes = 0
+    for dataset_id, uploaded_at, file_size in rows:
+        if (
+            (max_count and kept >= max_count)
+            or (cutoff and uploaded_at < cutoff)
+            or (max_bytes and kept and kept_bytes + (file_size or 0) > max_bytes)
+        ):
+            expired.append(dataset_id)
+            continue
+        kept += 1
+        kept_bytes += file_size or 0
+    return expired
+
+
+def delete_datasets(ids, batch_size=DELETE_BATCH_SIZE):
+    """Bulk delete datasets and their stored CSV files. Returns number of datasets removed."""
+    deleted = 0
+    ids = list(ids)
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        qs = UploadedDataset.objects.filter(id__in=chunk)
+        file_names = [name for name in qs.values_list('file', flat=True) if name]
+        _, per_model = qs.delete()
+        deleted += per_model.get(UploadedDataset._meta.label, 0)
+        for name in file_names:
+            try:
+                default_storage.delete(name)
+            except OSError:
+                pass
+    return deleted
+
+
+def enforce_retention(user=None, dry_run=False, now=None):
+    """Apply retention to a single owner (None = anonymous pool). Returns expired ids."""
+    user_id = user.id if user else None
+    rows = (
+        UploadedDataset.objects.filter(user_id=user_id)
+        .order_by('-uploaded_at', '-id')
+        .values_list('id', 'uploaded_at', 'file_size')
+    )
+    expired = select_expired(rows.iterator(), PolicyResolver().resolve(user_id), now)
+    if not dry_run:
+        delete_datasets(expired)
+    return expired
+
+
+def enforce_all(dry_run=False, now=None, batch_size=DELETE_BATCH_SIZE):
+    """
+    Apply retention to every owner in a single ordered scan.
+    Returns {'owners': n, 'expired': [ids], 'deleted': n}.
+    """
+    resolver = PolicyResolver()
+    rows = (
+        UploadedDataset.objects.order_by('user_id', '-uploaded_at', '-id')
+        .values_list('user_id', 'id', 'uploaded_at', 'file_size')
+        .iterator(chunk_size=2000)
+    )
+
+    expired = []
+    owners = 0
+    for user_id, owner_rows in groupby(rows, key=lambda row: row[0]):
+        owners += 1
+        expired.extend(
+            select_expired((row[1:] for row in owner_rows), resolver.resolve(user_id), now)
+        )
+
+    deleted = 0 if dry_run else delete_datasets(expired, batch_size)
+    return {'owners': owners, 'expired': expired, 'deleted': deleted}
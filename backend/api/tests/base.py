@@ -0,0 +1,37 @@
+"""Shared fixtures for the API tests"""
+import io
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+CSV = (
+    b"Equipment Name,Type,Flowrate,Pressure,Temperature\n"
+    b"P-1,Pump,100,5,110\n"
+    b"V-1,Valve,60,4,105\n"
+)
+
+
+def csv_file(df, name="data.csv"):
+    """A DataFrame as an uploaded CSV file"""
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="text/csv")
+
+
+class MediaTestCase(TestCase):
+    """TestCase whose stored files go to a temporary MEDIA_ROOT, removed after the class"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls._media_settings = override_settings(MEDIA_ROOT=cls.media_root)
+        cls._media_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._media_settings.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
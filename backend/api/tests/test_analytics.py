@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from analytics import comparison_view
+
+BACKEND_DIR = Path(settings.BASE_DIR)
+
+# What the desktop client does for local analysis: no Django settings, no api package
+STANDALONE = """
+import sys
+import pandas as pd
+import analytics
+rows = [{"Equipment Name": f"Eq-{i}", "Type": "Pump" if i % 2 else "Valve",
+         "Flowrate": 100.0 + i, "Pressure": 5.0 + i % 3, "Temperature": 110.0 + i % 7} for i in range(40)]
+df = pd.DataFrame(rows)
+summary = analytics.analyze_dataframe(df)
+stats = analytics.comparison_stats(df, df.assign(Flowrate=df["Flowrate"] * 1.3))
+assert summary["total_equipment"] == 40
+assert stats["flowrate"]["percent_change"] > 0
+assert "api" not in sys.modules
+print(stats["flowrate"]["risk_level"])
+"""
+
+
+class StandaloneAnalyticsTests(SimpleTestCase):
+    def test_package_runs_without_django_settings(self):
+        env = {key: value for key, value in os.environ.items() if key != "DJANGO_SETTINGS_MODULE"}
+        result = subprocess.run(
+            [sys.executable, "-c", STANDALONE], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        # Default comparison rules apply: a 30% flowrate change is a warning
+        self.assertEqual(result.stdout.strip(), "warning")
+
+
+class ComparisonViewTests(SimpleTestCase):
+    def setUp(self):
+        self.df_a = pd.DataFrame({
+            "Equipment Name": ["P-1", "P-2", "V-1", "V-2"],
+            "Type": ["Pump", "Pump", "Valve", "Valve"],
+            "Flowrate": [100.0, 110.0, 60.0, 65.0],
+            "Pressure": [5.0, 6.0, 4.0, 4.5],
+            "Temperature": [110.0, 112.0, 105.0, 104.0],
+        })
+        # P-2 moves a lot, V-2 is removed, H-1 is added
+        self.df_b = pd.DataFrame({
+            "Equipment Name": ["P-1", "P-2", "V-1", "H-1"],
+            "Type": ["Pump", "Pump", "Valve", "Heat Exchanger"],
+            "Flowrate": [100.0, 150.0, 61.0, 200.0],
+            "Pressure": [5.0, 6.0, 4.0, 8.0],
+            "Temperature": [110.0, 112.0, 105.0, 150.0],
+        })
+
+    def test_histograms_share_edges(self):
+        view = comparison_view(self.df_a, self.df_b, bins=5)
+        flowrate = view["histograms"]["flowrate"]
+        self.assertEqual(len(flowrate["edges"]), 6)
+        self.assertEqual(sum(flowrate["a"]), 4)
+        self.assertEqual(sum(flowrate["b"]), 4)
+        self.assertLessEqual(flowrate["edges"][0], 60.0)
+        self.assertGreaterEqual(flowrate["edges"][-1], 200.0)
+
+    def test_types_are_columnar(self):
+        types = comparison_view(self.df_a, self.df_b)["types"]
+        self.assertEqual(types["types"][:2], ["Pump", "Valve"])
+        index = types["types"].index("Heat Exchanger")
+        self.assertEqual(types["count"]["a"][index], 0)
+        self.assertEqual(types["count"]["b"][index], 1)
+        self.assertIsNone(types["flowrate"]["a"][index])
+
+    def test_diff_orders_by_largest_change(self):
+        diff = comparison_view(self.df_a, self.df_b, limit=2)["diff"]
+        self.assertEqual((diff["matched"], diff["added"], diff["removed"]), (3, 1, 1))
+        rows = diff["rows"]
+        self.assertEqual(rows["name"], ["P-2", "V-1"])
+        self.assertEqual(rows["flowrate"], {"a": [110.0, 60.0], "b": [150.0, 61.0], "delta": [40.0, 1.0]})
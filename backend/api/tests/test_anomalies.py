@@ -0,0 +1,82 @@
+
+import numpy as np
+import pandas as pd
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from analytics.anomalies import append_anomalies, decode_scores, detect_anomalies, encode_scores, top_anomalies
+from api.models import UploadedDataset
+from api.tests.base import MediaTestCase
+from api.utils import analyze_dataframe
+
+
+def plant(n=200, seed=0, outlier=True):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Equipment Name": [f"Eq-{i}" for i in range(n)],
+        "Type": np.where(np.arange(n) % 2, "Pump", "Valve"),
+        "Flowrate": rng.normal(100, 5, n),
+        "Pressure": rng.normal(6, 0.3, n),
+        "Temperature": rng.normal(110, 3, n),
+    })
+    # Valve readings run hotter by design: not an anomaly for their own type
+    df.loc[df["Type"] == "Valve", "Temperature"] += 40
+    if outlier:
+        df.loc[7, "Pressure"] = 12.0  # Pump outlier
+    return df
+
+
+class AnomalyDetectionTests(TestCase):
+    def test_outlier_ranks_first_per_type(self):
+        result = detect_anomalies(plant())
+
+        self.assertEqual(result["top"][0]["row"], 7)
+        self.assertIn("pressure:robust_z", result["top"][0]["reasons"])
+        self.assertEqual(len(decode_scores(result["scores"])), 200)
+        # Type-relative baselines: valves are not flagged just for running hot
+        self.assertLess(result["count"], 20)
+
+    def test_append_scores_against_stored_baseline(self):
+        result = detect_anomalies(plant())
+        extra = plant(3, seed=1, outlier=False)
+        extra.loc[1, "Temperature"] = 500.0
+        merged = append_anomalies(result, extra, row_offset=200)
+
+        self.assertEqual(len(decode_scores(merged["scores"])), 203)
+        self.assertEqual(merged["top"][0]["row"], 201)
+
+    def test_top_anomalies_beyond_stored_heap(self):
+        df = plant()
+        with self.settings(ANOMALY_DETECTION={"TOP_K": 1}):
+            result = detect_anomalies(df)
+            top = top_anomalies(result, df.to_dict(orient="records"), 3)
+
+        self.assertEqual(len(result["top"]), 1)
+        self.assertEqual(top[0]["row"], 7)
+        self.assertEqual(len(top), min(3, result["count"]))
+
+    def test_top_anomalies_only_returns_flagged_rows(self):
+        df = plant()
+        with self.settings(ANOMALY_DETECTION={"TOP_K": 1}):
+            result = detect_anomalies(df)
+            flagged = {entry["row"] for entry in top_anomalies(result, df.to_dict(orient="records"), 200)}
+            # Unflagged rows outscoring every flagged one must not crowd them out
+            scores = decode_scores(result["scores"])
+            scores[[row for row in range(len(df)) if row not in flagged]] = 100.0
+            result["scores"] = encode_scores(scores)
+            top = top_anomalies(result, df.to_dict(orient="records"), 3)
+
+        self.assertEqual(len(top), min(3, result["count"]))
+        self.assertTrue({entry["row"] for entry in top} <= flagged)
+        self.assertTrue(all(entry["reasons"] for entry in top))
+
+
+class AnomalyEndpointTests(MediaTestCase):
+    def test_endpoint_returns_top_k(self):
+        dataset = UploadedDataset.objects.create(file=ContentFile(b"", name="p.csv"), summary=analyze_dataframe(plant()))
+        response = APIClient().get(reverse("anomalies", args=[dataset.id]), {"k": 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([a["equipment_name"] for a in response.data["anomalies"]], ["Eq-7"])
@@ -0,0 +1,142 @@
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from analytics.aggregates import merge_metric, metric_aggregate, std_dev
+from api.models import EquipmentReading, UploadedDataset
+from api.tests.base import MediaTestCase, csv_file
+from api.utils import analyze_csv
+
+
+def frame(n, offset=0, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Equipment Name": [f"Eq-{offset + i}" for i in range(n)],
+        "Type": rng.choice(["Pump", "Valve", "Reactor"], n),
+        "Flowrate": rng.normal(120, 15, n).round(2),
+        "Pressure": rng.normal(6, 1, n).round(2),
+        "Temperature": rng.normal(110, 10, n).round(2),
+    })
+
+
+class AggregateTests(TestCase):
+    def test_merge_matches_single_pass(self):
+        values = np.random.default_rng(1).normal(50, 5, 1000)
+        merged = merge_metric(metric_aggregate(values[:300]), metric_aggregate(values[300:]))
+
+        self.assertEqual(merged["count"], 1000)
+        self.assertAlmostEqual(merged["mean"], values.mean(), places=9)
+        self.assertAlmostEqual(std_dev(merged), values.std(ddof=1), places=9)
+        self.assertEqual(merged["min"], values.min())
+        self.assertEqual(merged["max"], values.max())
+
+
+class AppendTests(MediaTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        response = self.client.post(reverse("upload-csv"), {"file": csv_file(frame(50))}, format="multipart")
+        self.dataset_id = response.data["dataset_id"]
+        self.url = reverse("append-rows", args=[self.dataset_id])
+
+    def test_append_csv_matches_full_reanalysis(self):
+        response = self.client.post(self.url, {"file": csv_file(frame(30, offset=50, seed=2))}, format="multipart")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["appended"], 30)
+
+        dataset = UploadedDataset.objects.get(id=self.dataset_id)
+        full = analyze_csv(dataset.file.path)
+        self.assertEqual(dataset.summary["total_equipment"], 80)
+        self.assertEqual(full["total_equipment"], 80)
+        self.assertEqual(dataset.summary["averages"], full["averages"])
+        self.assertEqual(dataset.summary["type_distribution"], full["type_distribution"])
+        for key, metric in full["aggregates"]["metrics"].items():
+            self.assertAlmostEqual(dataset.summary["aggregates"]["metrics"][key]["m2"], metric["m2"], places=6)
+
+    def test_append_json_rows(self):
+        rows = [{"Equipment Name": "Pump-X", "Type": "Pump", "Flowrate": "130", "Pressure": 7.5, "Temperature": 115}]
+        response = self.client.post(self.url, {"rows": rows}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        summary = UploadedDataset.objects.get(id=self.dataset_id).summary
+        self.assertEqual(summary["table"][-1]["Flowrate"], 130)
+        self.assertEqual(summary["type_distribution"]["Pump"], summary["aggregates"]["type_counts"]["Pump"])
+
+        # Appended readings are stamped when they arrive, not with the original upload time
+        dataset = UploadedDataset.objects.get(id=self.dataset_id)
+        reading = EquipmentReading.objects.get(dataset=dataset, equipment_name="Pump-X")
+        self.assertGreater(reading.recorded_at, dataset.uploaded_at)
+        points = self.client.get(reverse("equipment-history", args=["Pump-X"])).data["points"]
+        self.assertEqual(points[0]["uploaded_at"], reading.recorded_at)
+
+    @override_settings(CSV_MAX_ROWS=60)
+    def test_append_rejects_growing_past_row_limit(self):
+        response = self.client.post(self.url, {"file": csv_file(frame(20, offset=50))}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("70 rows", str(response.data))
+        self.assertEqual(UploadedDataset.objects.get(id=self.dataset_id).summary["total_equipment"], 50)
+
+        response = self.client.post(self.url, {"file": csv_file(frame(10, offset=50))}, format="multipart")
+        self.assertEqual(response.status_code, 200)
+
+    def test_append_rejects_missing_columns(self):
+        response = self.client.post(self.url, {"rows": [{"Equipment Name": "X", "Type": "Pump"}]}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Missing required columns", str(response.data))
+
+    def test_append_rejects_missing_metric_and_keeps_csv(self):
+        dataset = UploadedDataset.objects.get(id=self.dataset_id)
+        with open(dataset.file.path, "rb") as f:
+            original = f.read()
+
+        rows = [{"Equipment Name": "Pump-X", "Type": "Pump", "Flowrate": None, "Pressure": 7.5, "Temperature": 115}]
+        response = self.client.post(self.url, {"rows": rows}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Flowrate", str(response.data))
+
+        dataset.refresh_from_db()
+        self.assertEqual(dataset.summary["total_equipment"], 50)
+        with open(dataset.file.path, "rb") as f:
+            self.assertEqual(f.read(), original)
+
+    def test_failed_save_leaves_csv_unchanged(self):
+        dataset = UploadedDataset.objects.get(id=self.dataset_id)
+        with open(dataset.file.path, "rb") as f:
+            original = f.read()
+
+        with mock.patch("api.services.dataset_service.index_rows", side_effect=RuntimeError("db down")):
+            response = self.client.post(self.url, {"file": csv_file(frame(5, offset=50))}, format="multipart")
+        self.assertEqual(response.status_code, 500)
+
+        dataset.refresh_from_db()
+        self.assertEqual(dataset.summary["total_equipment"], 50)
+        self.assertEqual(dataset.file_size, len(original))
+        with open(dataset.file.path, "rb") as f:
+            self.assertEqual(f.read(), original)
+        self.assertEqual(len(pd.read_csv(dataset.file.path)), 50)
+
+    def test_append_to_other_users_dataset_forbidden(self):
+        owner = User.objects.create_user(username="owner", password="pw")
+        UploadedDataset.objects.filter(id=self.dataset_id).update(user=owner)
+
+        response = self.client.post(self.url, {"file": csv_file(frame(5))}, format="multipart")
+        self.assertEqual(response.status_code, 403)
+
+    def test_summary_and_report_etags_change_on_append(self):
+        summary_url = reverse("summary", args=[self.dataset_id])
+        report_url = reverse("download-report", args=[self.dataset_id])
+        etag = self.client.get(summary_url)["ETag"]
+        self.assertEqual(self.client.get(report_url)["ETag"], etag)
+
+        self.assertEqual(self.client.get(summary_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(report_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.post(self.url, {"file": csv_file(frame(5, offset=50))}, format="multipart")
+        response = self.client.get(summary_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["total_equipment"], 55)
@@ -0,0 +1,132 @@
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import AsyncRequestFactory, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api import async_views, views
+from api.models import UploadedDataset
+from api.services.ai_service import INSIGHT_FIELDS, generate_all_insights
+from api.tests.base import MediaTestCase
+from api.utils import analyze_csv
+
+
+CSV = (
+    "Equipment Name,Type,Flowrate,Pressure,Temperature\n"
+    "P-1,Pump,100,5,110\n"
+    "V-1,Valve,60,4,105\n"
+    "P-2,Pump,120,6,115\n"
+)
+
+
+class AsyncViewTests(MediaTestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        self.user = User.objects.create_user("alice", password="pw")
+        self.datasets = []
+        for owner in (None, None, self.user):
+            dataset = UploadedDataset.objects.create(file=ContentFile(CSV.encode(), name="plant.csv"), summary={})
+            dataset.summary = analyze_csv(dataset.file.path)
+            dataset.user = owner
+            dataset.save()
+            self.datasets.append(dataset)
+
+    async def test_summary_streams_stored_json(self):
+        dataset = self.datasets[0]
+        response = await async_views.summary(self.factory.get("/"), dataset.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), dataset.summary)
+
+        response = await async_views.summary(self.factory.get("/"), 999999)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_summary_revalidates_with_etag(self):
+        dataset = self.datasets[0]
+        etag = (await async_views.summary(self.factory.get("/"), dataset.id))["ETag"]
+        self.assertEqual(etag, views.format_dataset_etag(dataset.id, dataset.uploaded_at, dataset.file_size))
+
+        response = await async_views.summary(self.factory.get("/", headers={"If-None-Match": etag}), dataset.id)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    async def test_only_get_is_allowed(self):
+        response = await async_views.summary(self.factory.post("/"), self.datasets[0].id)
+        self.assertEqual(response.status_code, 405)
+
+    def test_history_matches_sync_view(self):
+        sync_response = APIClient().get(reverse("history"), {"limit": 10})
+        async_response = self._run(async_views.history(AsyncRequestFactory().get("/", {"limit": 10})))
+        self.assertEqual(json.loads(async_response.content), json.loads(sync_response.content))
+        self.assertEqual(len(sync_response.data), 2)
+
+    def test_history_authenticates_with_jwt(self):
+        token = AccessToken.for_user(self.user)
+        request = AsyncRequestFactory().get("/", headers={"Authorization": f"Bearer {token}"})
+        response = self._run(async_views.history(request))
+        self.assertEqual(len(json.loads(response.content)), 3)
+
+        request = AsyncRequestFactory().get("/", headers={"Authorization": "Bearer invalid"})
+        self.assertEqual(self._run(async_views.history(request)).status_code, 401)
+
+    def test_compare_matches_sync_view(self):
+        a, b = self.datasets[0].id, self.datasets[1].id
+        sync_response = APIClient().get(reverse("compare"), {"dataset_a": a, "dataset_b": b})
+        async_response = self._run(
+            async_views.compare_datasets_view(AsyncRequestFactory().get("/", {"dataset_a": a, "dataset_b": b}))
+        )
+        self.assertEqual(async_response.status_code, 200)
+        self.assertEqual(json.loads(async_response.content), json.loads(sync_response.content))
+
+        missing = self._run(async_views.compare_datasets_view(AsyncRequestFactory().get("/", {"dataset_a": a})))
+        self.assertEqual(missing.status_code, 400)
+
+    def test_compare_view_matches_sync_view(self):
+        a, b = self.datasets[0].id, self.datasets[1].id
+        sync_response = APIClient().get(reverse("compare-view"), {"dataset_a": a, "dataset_b": b})
+        async_response = self._run(
+            async_views.compare_view_data(AsyncRequestFactory().get("/", {"dataset_a": a, "dataset_b": b}))
+        )
+        self.assertEqual(async_response.status_code, 200)
+        self.assertEqual(async_response["ETag"], sync_response["ETag"])
+        body = json.loads(async_response.content)
+        self.assertEqual(body, json.loads(sync_response.content))
+        self.assertNotIn("table", body["dataset_a"])
+        self.assertEqual(body["dataset_a"]["id"], a)
+        self.assertEqual(body["diff"]["matched"], 3)
+        self.assertEqual(len(body["histograms"]["flowrate"]["a"]), 20)
+
+        not_modified = self._run(async_views.compare_view_data(AsyncRequestFactory().get(
+            "/", {"dataset_a": a, "dataset_b": b}, headers={"If-None-Match": sync_response["ETag"]})))
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(
+            APIClient().get(reverse("compare-view"), {"dataset_a": a, "dataset_b": b},
+                            HTTP_IF_NONE_MATCH=sync_response["ETag"]).status_code,
+            304,
+        )
+
+        for params in ({"dataset_a": a}, {"dataset_a": a, "dataset_b": b, "bins": "x"}):
+            response = self._run(async_views.compare_view_data(AsyncRequestFactory().get("/", params)))
+            self.assertEqual(response.status_code, 400)
+        missing = self._run(async_views.compare_view_data(AsyncRequestFactory().get("/", {"dataset_a": a, "dataset_b": 999})))
+        self.assertEqual(missing.status_code, 404)
+
+    @staticmethod
+    def _run(coroutine):
+        from asgiref.sync import async_to_sync
+
+        async def wrapper():
+            return await coroutine
+
+        return async_to_sync(wrapper)()
+
+
+class InsightFetchTests(TestCase):
+    def test_all_insights_are_fetched(self):
+        with mock.patch("api.services.ai_service.generate_chemical_insights", side_effect=lambda s, t: t) as fetch:
+            insights = generate_all_insights({"averages": {}})
+        self.assertEqual(insights, INSIGHT_FIELDS)
+        self.assertEqual(fetch.call_count, 3)
@@ -0,0 +1,83 @@
+
+import numpy as np
+import pandas as pd
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from analytics.correlation import compute_correlation, correlation_label
+from api.models import UploadedDataset
+from api.tests.base import MediaTestCase
+from api.utils import analyze_dataframe, append_to_summary
+
+
+def plant(n, seed):
+    rng = np.random.default_rng(seed)
+    pressure = rng.normal(6, 1, n)
+    return pd.DataFrame({
+        "Equipment Name": [f"Eq-{i}" for i in range(n)],
+        "Type": rng.choice(["Pump", "Valve"], n),
+        "Flowrate": rng.normal(100, 10, n),
+        "Pressure": pressure,
+        "Temperature": 20 * pressure + 10 + rng.normal(0, 4, n),
+    })
+
+
+class CorrelationTests(TestCase):
+    def test_matrix_and_fit_match_numpy(self):
+        df = plant(400, 0)
+        result = compute_correlation(df)
+        expected = np.corrcoef(df["Pressure"], df["Temperature"])[0, 1]
+        slope, intercept = np.polyfit(df["Pressure"], df["Temperature"], 1)
+
+        self.assertAlmostEqual(result["overall"]["matrix"]["pressure"]["temperature"], expected, places=3)
+        self.assertAlmostEqual(result["overall"]["matrix"]["flowrate"]["flowrate"], 1.0, places=3)
+        fit = result["overall"]["fits"]["temperature~pressure"]
+        self.assertAlmostEqual(fit["slope"], slope, places=3)
+        self.assertAlmostEqual(fit["intercept"], intercept, places=2)
+        self.assertAlmostEqual(fit["r2"], expected ** 2, places=3)
+
+        pumps = df[df["Type"] == "Pump"]
+        self.assertAlmostEqual(
+            result["by_type"]["Pump"]["matrix"]["flowrate"]["pressure"],
+            np.corrcoef(pumps["Flowrate"], pumps["Pressure"])[0, 1],
+            places=3,
+        )
+        self.assertTrue(correlation_label(result).startswith("Strong positive"))
+
+    def test_append_merges_moments(self):
+        first, second = plant(300, 0), plant(200, 1)
+        summary = append_to_summary(analyze_dataframe(first), second)
+        combined = compute_correlation(pd.concat([first, second], ignore_index=True))
+
+        self.assertEqual(summary["correlation"]["overall"]["count"], 500)
+        for metric in ("flowrate", "pressure", "temperature"):
+            self.assertAlmostEqual(
+                summary["correlation"]["by_type"]["Valve"]["matrix"]["pressure"][metric],
+                combined["by_type"]["Valve"]["matrix"]["pressure"][metric],
+                places=3,
+            )
+        self.assertEqual(summary["correlation_label"], correlation_label(combined))
+
+    def test_constant_metric_has_no_correlation(self):
+        df = plant(20, 3).assign(Flowrate=50.0)
+        result = compute_correlation(df)
+        self.assertIsNone(result["overall"]["matrix"]["flowrate"]["pressure"])
+        self.assertIsNone(result["overall"]["fits"]["pressure~flowrate"]["slope"])
+
+
+class CorrelationEndpointTests(MediaTestCase):
+    def test_endpoint_and_legacy_fallback(self):
+        summary = analyze_dataframe(plant(50, 2))
+        del summary["correlation"]
+        dataset = UploadedDataset.objects.create(file=ContentFile(b"", name="p.csv"), summary=summary)
+
+        response = APIClient().get(reverse("correlation", args=[dataset.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data["by_type"]), {"Pump", "Valve"})
+        self.assertNotIn("correlation", UploadedDataset.objects.get(id=dataset.id).summary)
+
+        response = APIClient().get(reverse("correlation", args=[dataset.id]), {"type": "Pump"})
+        self.assertIn("temperature~pressure", response.data["fits"])
+        self.assertEqual(APIClient().get(reverse("correlation", args=[dataset.id]), {"type": "Tank"}).status_code, 404)
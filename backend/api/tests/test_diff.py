@@ -0,0 +1,121 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from asgiref.sync import async_to_sync
+from django.core.files.base import ContentFile
+from django.test import AsyncRequestFactory, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from analytics.diff import align_rows, diff_counts, diff_page, row_diff
+from api import async_views
+from api.models import UploadedDataset
+from api.tests.base import MediaTestCase
+from api.utils import analyze_csv
+
+
+def plant(names, flowrate, types=None):
+    return pd.DataFrame({
+        "Equipment Name": names,
+        "Type": types or ["Pump"] * len(names),
+        "Flowrate": flowrate,
+        "Pressure": [5.0] * len(names),
+        "Temperature": [110.0] * len(names),
+    })
+
+
+class RowDiffTests(TestCase):
+    def setUp(self):
+        # P-3 is removed, P-9 added, P-2 moves most, P-4 changes type only, P-1 is re-appended
+        self.df_a = plant(["P-1", "P-2", "P-3", "P-4", "P-1"], [90.0, 100.0, 100.0, 100.0, 100.0])
+        self.df_b = plant(["P-9", "P-4", "P-2", "P-1"], [50.0, 100.0, 140.0, 101.0],
+                          types=["Pump", "Valve", "Pump", "Pump"])
+
+    def test_counts(self):
+        counts = diff_counts(align_rows(self.df_a, self.df_b))
+        self.assertEqual(counts, {"matched": 3, "changed": 2, "type_changed": 1, "added": 1, "removed": 1})
+
+    def test_last_row_of_a_repeated_name_wins(self):
+        page = diff_page(align_rows(self.df_a, self.df_b), section="matched", sort="name")
+        p1 = page["results"][0]
+        self.assertEqual(p1["name"], "P-1")
+        self.assertEqual(p1["flowrate"], {"a": 100.0, "b": 101.0, "delta": 1.0, "percent_change": 1.0})
+
+    def test_pages_by_largest_change(self):
+        aligned = align_rows(self.df_a, self.df_b)
+        first = diff_page(aligned, limit=1)
+        second = diff_page(aligned, offset=1, limit=1)
+        self.assertEqual(first["total"], 2)
+        self.assertEqual([r["name"] for r in first["results"] + second["results"]], ["P-2", "P-1"])
+        self.assertEqual(diff_page(aligned, offset=2, limit=1)["results"], [])
+        self.assertEqual(diff_page(aligned, section="matched", limit=5)["results"][-1]["previous_type"], "Pump")
+
+    def test_added_removed_and_movers(self):
+        result = row_diff(self.df_a, self.df_b, section="added", k=1)
+        self.assertEqual(result["results"], [
+            {"name": "P-9", "type": "Pump", "flowrate": 50.0, "pressure": 5.0, "temperature": 110.0}
+        ])
+        self.assertEqual([r["name"] for r in result["top_movers"]["flowrate"]], ["P-2"])
+        # No matched row moved: nothing to report
+        self.assertEqual(result["top_movers"]["pressure"], [])
+        self.assertEqual(row_diff(self.df_a, self.df_b, section="removed")["results"][0]["name"], "P-3")
+
+    def test_top_k_matches_full_sort(self):
+        rng = np.random.default_rng(0)
+        names = [f"Eq-{i}" for i in range(5000)]
+        df_a = plant(names, rng.normal(100, 10, 5000))
+        df_b = plant(names[::-1], rng.normal(100, 10, 5000))
+        aligned = align_rows(df_a, df_b)
+        page = diff_page(aligned, sort="flowrate", offset=20, limit=30)
+
+        expected = np.argsort(-np.abs(aligned["matched"]["delta"][:, 0]), kind="stable")[20:50]
+        self.assertEqual([r["name"] for r in page["results"]], aligned["matched"]["name"][expected].tolist())
+
+    def test_rejects_unknown_section(self):
+        with self.assertRaises(ValueError):
+            diff_page(align_rows(self.df_a, self.df_b), section="everything")
+
+
+class DiffEndpointTests(MediaTestCase):
+    def setUp(self):
+        self.ids = []
+        for df in (plant(["P-1", "P-2", "P-3"], [100.0, 100.0, 100.0]), plant(["P-2", "P-1", "P-4"], [100.0, 130.0, 1.0])):
+            dataset = UploadedDataset.objects.create(file=ContentFile(df.to_csv(index=False).encode(), name="p.csv"),
+                                                     summary={})
+            dataset.summary = analyze_csv(dataset.file.path)
+            dataset.save()
+            self.ids.append(dataset.id)
+
+    def test_paginated_diff_matches_async_view(self):
+        params = {"dataset_a": self.ids[0], "dataset_b": self.ids[1], "section": "matched", "limit": 1, "offset": 1}
+        response = APIClient().get(reverse("compare-diff"), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["counts"]["added"], 1)
+        self.assertEqual(response.data["total"], 2)
+        self.assertEqual([r["name"] for r in response.data["results"]], ["P-2"])
+        self.assertEqual(response.data["top_movers"]["flowrate"][0]["name"], "P-1")
+
+        async_response = async_to_sync(async_views.compare_diff)(AsyncRequestFactory().get("/", params))
+        self.assertEqual(json.loads(async_response.content), json.loads(response.content))
+
+        cached = APIClient().get(reverse("compare-diff"), params, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_falls_back_to_summary_table_without_file(self):
+        dataset = UploadedDataset.objects.get(id=self.ids[1])
+        os.remove(dataset.file.path)
+        response = APIClient().get(reverse("compare-diff"), {"dataset_a": self.ids[0], "dataset_b": self.ids[1]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["counts"]["matched"], 2)
+
+        response = APIClient().get(reverse("compare"), {"dataset_a": self.ids[0], "dataset_b": self.ids[1]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["comparison_stats"]["flowrate"]["percent_change"], -23.0)
+
+    def test_invalid_params(self):
+        for params in ({"dataset_a": self.ids[0]},
+                       {"dataset_a": self.ids[0], "dataset_b": self.ids[1], "sort": "colour"},
+                       {"dataset_a": self.ids[0], "dataset_b": self.ids[1], "limit": "many"}):
+            self.assertEqual(APIClient().get(reverse("compare-diff"), params).status_code, 400)
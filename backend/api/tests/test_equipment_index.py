@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+import pandas as pd
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import EquipmentReading, UploadedDataset
+from api.tests.base import MediaTestCase, csv_file
+
+
+class EquipmentHistoryTests(MediaTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.ids = []
+        for run, pressure in enumerate([5.0, 5.5, 6.5]):
+            df = pd.DataFrame({
+                "Equipment Name": ["Pump-1", "Valve-1"],
+                "Type": ["Pump", "Valve"],
+                "Flowrate": [120, 60],
+                "Pressure": [pressure, 4.0],
+                "Temperature": [110, 105],
+            })
+            file = csv_file(df, f"run{run}.csv")
+            dataset_id = self.client.post(reverse("upload-csv"), {"file": file}, format="multipart").data["dataset_id"]
+            # Spread uploads in time so ordering is deterministic
+            recorded_at = timezone.now() - timedelta(days=10 - run)
+            UploadedDataset.objects.filter(id=dataset_id).update(uploaded_at=recorded_at)
+            EquipmentReading.objects.filter(dataset_id=dataset_id).update(recorded_at=recorded_at)
+            self.ids.append(dataset_id)
+
+    def test_upload_indexes_every_row(self):
+        self.assertEqual(EquipmentReading.objects.filter(dataset_id=self.ids[0]).count(), 2)
+
+    def test_history_is_chronological_with_drift(self):
+        response = self.client.get(reverse("equipment-history", args=["Pump-1"]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p["pressure"] for p in response.data["points"]], [5.0, 5.5, 6.5])
+        self.assertEqual(response.data["drift"]["pressure"]["change"], 1.5)
+
+    def test_limit_keeps_most_recent_runs(self):
+        response = self.client.get(reverse("equipment-history", args=["Pump-1"]), {"limit": 2})
+        self.assertEqual([p["dataset_id"] for p in response.data["points"]], self.ids[1:])
+
+    def test_append_extends_index(self):
+        rows = [{"Equipment Name": "Pump-1", "Type": "Pump", "Flowrate": 121, "Pressure": 7.0, "Temperature": 111}]
+        self.client.post(reverse("append-rows", args=[self.ids[-1]]), {"rows": rows}, format="json")
+
+        reading = EquipmentReading.objects.get(dataset_id=self.ids[-1], row_index=2)
+        self.assertEqual(reading.pressure, 7.0)
+
+    def test_appended_run_is_counted_once_by_its_latest_reading(self):
+        rows = [{"Equipment Name": "Pump-1", "Type": "Pump", "Flowrate": 121, "Pressure": 7.0, "Temperature": 111}]
+        self.client.post(reverse("append-rows", args=[self.ids[0]]), {"rows": rows}, format="json")
+
+        response = self.client.get(reverse("equipment-history", args=["Pump-1"]), {"limit": 2})
+        self.assertEqual(response.data["runs"], 2)
+        self.assertEqual([p["dataset_id"] for p in response.data["points"]], [self.ids[0], self.ids[2], self.ids[0]])
+
+    def test_unknown_equipment(self):
+        response = self.client.get(reverse("equipment-history", args=["Nope"]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,108 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.events import EventBus, Subscription, bus, publish, stream_events
+from api.tests.base import CSV, MediaTestCase
+
+FAST_STREAM = {"ENABLED": True, "KEEPALIVE_SECONDS": 0.05, "MAX_STREAM_SECONDS": 0.3}
+
+
+def parse_stream(chunks):
+    """(event, data) pairs from SSE text chunks, skipping comments and retry hints"""
+    events = []
+    for chunk in chunks:
+        chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class EventBusTests(TestCase):
+    def test_delivery_respects_ownership(self):
+        events = EventBus()
+        anonymous, alice = Subscription(None, 10), Subscription(1, 10)
+        events.subscribe(anonymous)
+        events.subscribe(alice)
+        events.publish("dataset.ready", {"dataset_id": 1})
+        events.publish("dataset.ready", {"dataset_id": 2}, owner_id=1)
+
+        self.assertEqual(anonymous.get(0)["data"], {"dataset_id": 1})
+        self.assertIsNone(anonymous.get(0))
+        self.assertEqual([alice.get(0)["data"]["dataset_id"], alice.get(0)["data"]["dataset_id"]], [1, 2])
+
+    def test_reconnect_replays_missed_events(self):
+        events = EventBus(replay_size=2)
+        first = events.publish("a", {})
+        events.publish("b", {})
+        events.publish("c", {})
+        subscription = events.subscribe(Subscription(None, 10), last_event_id=first)
+        self.assertEqual([subscription.get(0)["event"], subscription.get(0)["event"]], ["b", "c"])
+
+    def test_slow_consumer_ends_stream(self):
+        events = EventBus()
+        subscription = events.subscribe(Subscription(None, 1))
+        events.publish("a", {})
+        events.publish("b", {})
+        self.assertTrue(subscription.overflowed)
+
+    @override_settings(EVENT_STREAM=FAST_STREAM)
+    def test_stream_yields_published_events(self):
+        stream = stream_events(None)
+        self.assertTrue(next(stream).startswith("retry:"))
+        publish("report.available", {"dataset_id": 7})
+        self.assertEqual(parse_stream([next(stream)]), [("report.available", {"dataset_id": 7})])
+        self.assertEqual(list(stream)[-1], ": keepalive\n\n")
+
+
+@override_settings(EVENT_STREAM=FAST_STREAM)
+class EventStreamEndpointTests(MediaTestCase):
+    def test_upload_pushes_progress_and_ready(self):
+        user = User.objects.create_user("alice", password="pw")
+        subscription = bus.subscribe(Subscription(user.id, 50))
+        try:
+            client = APIClient()
+            client.force_authenticate(user)
+            response = client.post(reverse("upload-csv"), {"file": SimpleUploadedFile("plant.csv", CSV)})
+        finally:
+            bus.unsubscribe(subscription)
+        self.assertEqual(response.status_code, 200)
+
+        received = []
+        while (record := subscription.get(0)) is not None:
+            received.append(record)
+        self.assertEqual([r["data"]["stage"] for r in received if r["event"] == "dataset.progress"],
+                         ["received", "analysed", "insights"])
+        ready = next(r for r in received if r["event"] == "dataset.ready")
+        self.assertEqual(ready["data"]["dataset_id"], response.data["dataset_id"])
+        self.assertEqual(ready["data"]["total_equipment"], 2)
+        self.assertNotIn("summary", ready["data"])
+        self.assertEqual(received[-1]["event"], "report.available")
+
+    def test_stream_replays_only_visible_events(self):
+        user = User.objects.create_user("bob", password="pw")
+        before = publish("dataset.ready", {"dataset_id": 1}) - 1
+        publish("dataset.ready", {"dataset_id": 2}, owner_id=user.id + 1)
+        publish("dataset.ready", {"dataset_id": 3}, owner_id=user.id)
+
+        response = self.client.get(
+            reverse("events"), {"token": str(AccessToken.for_user(user))}, HTTP_LAST_EVENT_ID=str(before)
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        ids = [data["dataset_id"] for _, data in parse_stream(response.streaming_content)]
+        self.assertEqual(ids, [1, 3])
+
+    @override_settings(EVENT_STREAM={"ENABLED": False})
+    def test_stream_is_off_unless_enabled(self):
+        self.assertFalse(self.client.get(reverse("api-root")).json()["events"])
+        self.assertEqual(self.client.get(reverse("events")).status_code, 404)
+
+    def test_invalid_token_is_rejected(self):
+        response = self.client.get(reverse("events"), {"token": "not-a-token"})
+        self.assertEqual(response.status_code, 401)
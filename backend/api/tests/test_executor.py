@@ -0,0 +1,103 @@
+import threading
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api import executor
+from api.executor import BoundedExecutor, ExecutorBusy, get_executor, reset_executor
+from api.models import UploadedDataset
+from api.utils import analyze_csv
+
+
+class BoundedExecutorTests(TestCase):
+    def test_thread_backend_runs_tasks(self):
+        pool = BoundedExecutor("thread", max_workers=2, max_queue=2)
+        try:
+            self.assertEqual([f.result() for f in [pool.submit(pow, 2, i) for i in range(4)]], [1, 2, 4, 8])
+        finally:
+            pool.shutdown()
+
+    def test_process_backend_runs_tasks(self):
+        pool = BoundedExecutor("process", max_workers=1, max_queue=1)
+        try:
+            self.assertEqual(pool.run(pow, 3, 4), 81)
+        finally:
+            pool.shutdown()
+
+    def test_inline_backend_propagates_errors(self):
+        pool = BoundedExecutor("inline")
+        with self.assertRaises(ZeroDivisionError):
+            pool.run(divmod, 1, 0)
+
+    def test_full_queue_applies_backpressure(self):
+        pool = BoundedExecutor("thread", max_workers=1, max_queue=1, submit_timeout=0.05)
+        release = threading.Event()
+        try:
+            running = pool.submit(release.wait)
+            queued = pool.submit(release.wait)
+            with self.assertRaises(ExecutorBusy):
+                pool.submit(release.wait)
+            release.set()
+            running.result(), queued.result()
+            self.assertEqual(pool.run(pow, 2, 3), 8)
+        finally:
+            release.set()
+            pool.shutdown()
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            BoundedExecutor("gpu")
+
+    @override_settings(TASK_EXECUTOR={"BACKEND": "inline"})
+    def test_settings_are_read_on_first_use(self):
+        reset_executor()
+        try:
+            self.assertEqual(get_executor().backend, "inline")
+        finally:
+            reset_executor()
+
+
+class ExecutorBusyResponseTests(TestCase):
+    def test_busy_executor_returns_503(self):
+        dataset = UploadedDataset.objects.create(file=ContentFile(b"", name="p.csv"), summary={})
+        pool = BoundedExecutor("thread", max_workers=1, max_queue=0, submit_timeout=0.01)
+        release = threading.Event()
+        pool.submit(release.wait)
+        try:
+            with mock.patch.object(executor, "_executor", pool):
+                response = APIClient().get(reverse("download-report", args=[dataset.id]))
+        finally:
+            release.set()
+            pool.shutdown()
+            dataset.file.delete(save=False)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+
+
+class ProcessBackendViewTests(TestCase):
+    """Views hand tasks plain data, so they also work when tasks run in worker processes"""
+
+    CSV = b"Equipment Name,Type,Flowrate,Pressure,Temperature\nP-1,Pump,100,5,110\nV-1,Valve,60,4,105\n"
+
+    def test_comparisons_and_report(self):
+        datasets = [UploadedDataset.objects.create(file=ContentFile(self.CSV, name="p.csv"), summary={})
+                    for _ in range(2)]
+        for dataset in datasets:
+            dataset.summary = analyze_csv(dataset.file.path)
+            dataset.save()
+        params = {"dataset_a": datasets[0].id, "dataset_b": datasets[1].id}
+        pool = BoundedExecutor("process", max_workers=1, max_queue=4)
+        try:
+            with mock.patch.object(executor, "_executor", pool):
+                client = APIClient()
+                responses = [client.get(reverse(name), params) for name in ("compare", "compare-view", "compare-diff")]
+                report = client.get(reverse("download-report", args=[datasets[0].id]))
+        finally:
+            pool.shutdown()
+            for dataset in datasets:
+                dataset.file.delete(save=False)
+        self.assertEqual([response.status_code for response in responses + [report]], [200] * 4)
+        self.assertEqual(responses[2].data["counts"]["matched"], 2)
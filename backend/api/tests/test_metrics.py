@@ -0,0 +1,95 @@
+import json
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.metrics import Counter, Histogram, Registry, stage
+from api.tests.base import CSV, MediaTestCase
+
+
+def sample(text, name, **labels):
+    """Value of one sample line in Prometheus text output"""
+    wanted = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    prefix = f"{name}{{{wanted}}} " if labels else f"{name} "
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line[len(prefix):])
+    return None
+
+
+class RegistryTests(TestCase):
+    def test_histogram_renders_cumulative_buckets(self):
+        registry = Registry()
+        histogram = registry.register(Histogram("latency_seconds", "Latency.", ("view",), buckets=(0.1, 1)))
+        for value in (0.05, 0.5, 0.7, 3):
+            histogram.observe(value, view="a")
+        text = registry.render()
+
+        self.assertIn("# TYPE latency_seconds histogram", text)
+        self.assertEqual(sample(text, "latency_seconds_bucket", view="a", le="0.1"), 1)
+        self.assertEqual(sample(text, "latency_seconds_bucket", view="a", le="1.0"), 3)
+        self.assertEqual(sample(text, "latency_seconds_bucket", view="a", le="+Inf"), 4)
+        self.assertEqual(sample(text, "latency_seconds_count", view="a"), 4)
+        self.assertAlmostEqual(sample(text, "latency_seconds_sum", view="a"), 4.25)
+
+    def test_label_values_are_escaped(self):
+        registry = Registry()
+        registry.register(Counter("hits_total", "Hits.", ("path",))).inc(path='a"b\\c')
+        self.assertIn('hits_total{path="a\\"b\\\\c"} 1', registry.render())
+
+
+@override_settings(METRICS={"TOKEN": "s3cret"})
+class RequestMetricsTests(MediaTestCase):
+    def scrape(self):
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        return response.content.decode()
+
+    def test_requests_are_counted_per_view(self):
+        before = sample(self.scrape(), "http_requests_total", view="history", method="GET", status=200) or 0
+        self.client.get(reverse("history"))
+        self.client.get(reverse("summary", args=[999]))
+        text = self.scrape()
+
+        self.assertEqual(sample(text, "http_requests_total", view="history", method="GET", status=200), before + 1)
+        self.assertIsNotNone(sample(text, "http_requests_total", view="summary", method="GET", status=404))
+        self.assertIsNotNone(sample(text, "http_request_duration_seconds_count", view="history", method="GET"))
+        self.assertIsNotNone(sample(text, "db_queries_per_request_count", view="history"))
+        self.assertIsNotNone(sample(text, "http_response_size_bytes_count", view="history"))
+
+    def test_upload_records_stages(self):
+        APIClient().post(reverse("upload-csv"), {"file": SimpleUploadedFile("plant.csv", CSV)})
+        text = self.scrape()
+        for name in ("parse", "analyze", "ai", "serialize"):
+            self.assertIsNotNone(sample(text, "app_stage_duration_seconds_count", stage=name), name)
+
+    @override_settings(METRICS={"SLOW_REQUEST_MS": 0})
+    def test_slow_requests_are_logged_with_breakdown(self):
+        with self.assertLogs("api.metrics", level="WARNING") as logs:
+            APIClient().post(reverse("upload-csv"), {"file": SimpleUploadedFile("plant.csv", CSV)})
+
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["event"], "slow_request")
+        self.assertEqual(record["view"], "upload-csv")
+        self.assertGreater(record["db_queries"], 0)
+        self.assertTrue({"parse", "analyze", "ai", "serialize"} <= set(record["stages_ms"]))
+
+    def test_token_protects_endpoint(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+        self.assertEqual(self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer sécret").status_code, 401)
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS={})
+    def test_endpoint_without_token_is_debug_only(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 404)
+        with self.settings(DEBUG=True):
+            self.assertEqual(self.client.get(reverse("metrics")).status_code, 200)
+
+    def test_stage_outside_request_only_feeds_histogram(self):
+        with stage("render"):
+            pass
+        self.assertIsNotNone(sample(self.scrape(), "app_stage_duration_seconds_count", stage="render"))
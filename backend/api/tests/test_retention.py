@@ -0,0 +1,102 @@
+import io
+from datetime import timedelta
+
+from django.contrib.auth.models import Group, User
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import RetentionPolicy, UploadedDataset
+from api.services.retention_service import enforce_all, enforce_retention
+from api.tests.base import MediaTestCase
+
+
+@override_settings(
+    DATASET_RETENTION={'MAX_DATASETS': 3, 'MAX_AGE_DAYS': 30, 'MAX_BYTES': 0},
+)
+class RetentionTests(MediaTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='operator', password='pw')
+
+    def make_dataset(self, user=None, days_old=0, size=100):
+        dataset = UploadedDataset.objects.create(
+            file=ContentFile(b'x' * size, name='data.csv'),
+            original_filename='data.csv',
+            user=user,
+            file_size=size,
+            summary={},
+        )
+        UploadedDataset.objects.filter(id=dataset.id).update(
+            uploaded_at=timezone.now() - timedelta(days=days_old)
+        )
+        return dataset
+
+    def test_count_limit_keeps_newest(self):
+        datasets = [self.make_dataset(self.user, days_old=5 - i) for i in range(5)]
+        expired = enforce_retention(self.user)
+
+        self.assertEqual(sorted(expired), sorted(d.id for d in datasets[:2]))
+        self.assertEqual(UploadedDataset.objects.filter(user=self.user).count(), 3)
+
+    def test_age_limit(self):
+        old = self.make_dataset(self.user, days_old=45)
+        recent = self.make_dataset(self.user, days_old=1)
+        enforce_retention(self.user)
+
+        self.assertFalse(UploadedDataset.objects.filter(id=old.id).exists())
+        self.assertTrue(UploadedDataset.objects.filter(id=recent.id).exists())
+
+    def test_user_policy_bytes_and_unlimited_count(self):
+        RetentionPolicy.objects.create(user=self.user, max_datasets=0, max_bytes=250)
+        datasets = [self.make_dataset(self.user, days_old=5 - i, size=100) for i in range(5)]
+        enforce_retention(self.user)
+
+        remaining = set(UploadedDataset.objects.filter(user=self.user).values_list('id', flat=True))
+        self.assertEqual(remaining, {datasets[-1].id, datasets[-2].id})
+
+    def test_bytes_limit_keeps_newest_dataset(self):
+        RetentionPolicy.objects.create(user=self.user, max_bytes=250)
+        self.make_dataset(self.user, days_old=2, size=100)
+        newest = self.make_dataset(self.user, days_old=1, size=400)
+        enforce_retention(self.user)
+
+        remaining = set(UploadedDataset.objects.filter(user=self.user).values_list('id', flat=True))
+        self.assertEqual(remaining, {newest.id})
+
+    def test_group_policy_applies_to_members(self):
+        group = Group.objects.create(name='plant-a')
+        self.user.groups.add(group)
+        RetentionPolicy.objects.create(group=group, max_datasets=10)
+        for i in range(6):
+            self.make_dataset(self.user, days_old=i)
+
+        result = enforce_all()
+        self.assertEqual(result['deleted'], 0)
+        self.assertEqual(UploadedDataset.objects.filter(user=self.user).count(), 6)
+
+    def test_enforce_all_covers_anonymous_pool_and_deletes_files(self):
+        datasets = [self.make_dataset(None, days_old=5 - i) for i in range(4)]
+        storage = datasets[0].file.storage
+        oldest_file = datasets[0].file.name
+
+        result = enforce_all()
+        self.assertEqual(result['expired'], [datasets[0].id])
+        self.assertFalse(storage.exists(oldest_file))
+
+    def test_dry_run_command_deletes_nothing(self):
+        for i in range(5):
+            self.make_dataset(self.user, days_old=i)
+        call_command('enforce_retention', '--dry-run', stdout=io.StringIO())
+        self.assertEqual(UploadedDataset.objects.count(), 5)
+
+    def test_history_limit_parameter(self):
+        for i in range(8):
+            self.make_dataset(None, days_old=i)
+        client = APIClient()
+
+        self.assertEqual(len(client.get(reverse('history')).data), 5)
+        self.assertEqual(len(client.get(reverse('history'), {'limit': 7}).data), 7)
+        self.assertEqual(client.get(reverse('history'), {'limit': 'abc'}).status_code, 400)
@@ -0,0 +1,109 @@
+
+import io
+from unittest import mock
+
+import pandas as pd
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.models import UploadedDataset
+from api.reports import generate_pdf_report
+from analytics.risk import evaluate_comparison_risk, evaluate_rows, evaluate_table
+from api.tests.base import MediaTestCase
+from api.utils import analyze_dataframe, append_to_summary
+
+
+def plant():
+    return pd.DataFrame({
+        "Equipment Name": ["Pump-1", "Pump-2", "Pump-3", "Valve-1", "Valve-2", "Valve-3"],
+        "Type": ["Pump", "Pump", "Pump", "Valve", "Valve", "Valve"],
+        "Flowrate": [100, 100, 100, 50, 50, 50],
+        "Pressure": [5.0, 5.0, 15.0, 4.0, 4.0, 1.0],
+        "Temperature": [100, 100, 100, 100, 100, 100],
+    })
+
+
+class RiskEngineTests(TestCase):
+    def test_row_levels_and_reasons(self):
+        risk = evaluate_rows(plant())
+        by_name = {item["equipment_name"]: item for item in risk["flagged"]}
+
+        self.assertEqual(by_name["Pump-3"]["level"], "critical")
+        self.assertEqual(by_name["Pump-3"]["reason"], "Extreme Pressure")
+        self.assertEqual(by_name["Pump-3"]["reasons"], ["Extreme Pressure"])
+
+        hot = evaluate_rows(plant().assign(Temperature=[100, 100, 300, 100, 100, 100]))["flagged"][0]
+        self.assertEqual(hot["reasons"], ["Extreme Pressure", "Thermal Overload"])
+        self.assertIn("extreme_pressure_type", by_name["Pump-3"]["rules"])
+        self.assertEqual(by_name["Valve-3"]["reason"], "Process optimization required (Low pressure)")
+        self.assertEqual(risk["flagged"][0]["equipment_name"], "Pump-3")
+        self.assertEqual(risk["counts"], {"critical": 1, "warning": 3})
+        self.assertAlmostEqual(risk["stability_score"], 33.3)
+
+    def test_custom_rules(self):
+        rules = [{"name": "hot", "metric": "temperature", "baseline": "absolute", "op": ">=", "threshold": 100,
+                  "level": "warning"}]
+        self.assertEqual(len(evaluate_rows(plant(), rules)["flagged"]), 6)
+
+    def test_comparison_rules(self):
+        self.assertEqual(evaluate_comparison_risk("flowrate", {"abs_percent_change": 25}), "warning")
+        self.assertEqual(evaluate_comparison_risk("pressure", {"mean_b": 55}), "critical")
+        self.assertEqual(evaluate_comparison_risk("temperature", {"mean_b": 120}), "normal")
+
+    def test_append_scores_new_rows_against_stored_means(self):
+        # Same rows again: every mean stays put, so only the new rows are evaluated
+        with mock.patch("analytics.summary.evaluate_table") as rescan:
+            merged = append_to_summary(analyze_dataframe(plant()), plant())
+        rescan.assert_not_called()
+
+        full = evaluate_table(merged["table"])
+        self.assertEqual(merged["risk"], full)
+        self.assertEqual([item["row"] for item in merged["risk"]["flagged"][:2]], [2, 8])
+        self.assertEqual(merged["risk"]["counts"], {"critical": 2, "warning": 6})
+
+    def test_append_rescans_when_means_move(self):
+        surge = pd.DataFrame({
+            "Equipment Name": ["Pump-4"], "Type": ["Pump"], "Flowrate": [100], "Pressure": [40.0], "Temperature": [100],
+        })
+        merged = append_to_summary(analyze_dataframe(plant()), surge)
+
+        # The surge lifts the pump mean, so Pump-3 is no longer extreme against it
+        self.assertEqual(merged["risk"], evaluate_table(merged["table"]))
+        by_name = {item["equipment_name"]: item for item in merged["risk"]["flagged"]}
+        self.assertNotEqual(by_name.get("Pump-3", {}).get("level"), "critical")
+
+
+class RiskEndpointTests(MediaTestCase):
+    def setUp(self):
+        self.dataset = UploadedDataset.objects.create(
+            file=ContentFile(b"", name="plant.csv"), summary=analyze_dataframe(plant())
+        )
+
+    def test_risk_endpoint_filters_by_level(self):
+        response = APIClient().get(reverse("risk", args=[self.dataset.id]), {"level": "critical"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["equipment_name"] for item in response.data["flagged"]], ["Pump-3"])
+
+    def test_legacy_dataset_is_evaluated_without_writing(self):
+        summary = dict(self.dataset.summary)
+        del summary["risk"]
+        UploadedDataset.objects.filter(id=self.dataset.id).update(summary=summary)
+
+        response = APIClient().get(reverse("risk", args=[self.dataset.id]))
+        self.assertEqual(response.data["counts"], self.dataset.summary["risk"]["counts"])
+        self.assertNotIn("risk", UploadedDataset.objects.get(id=self.dataset.id).summary)
+
+        out = io.StringIO()
+        call_command("backfill_summaries", "--dry-run", stdout=out)
+        self.assertIn("1 dataset(s) would be backfilled", out.getvalue())
+        self.assertNotIn("risk", UploadedDataset.objects.get(id=self.dataset.id).summary)
+
+        call_command("backfill_summaries", stdout=io.StringIO())
+        self.assertEqual(UploadedDataset.objects.get(id=self.dataset.id).summary["risk"], self.dataset.summary["risk"])
+
+    def test_report_uses_persisted_risk(self):
+        self.assertGreater(len(generate_pdf_report(self.dataset.summary, "plant.csv").getvalue()), 0)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from analytics.sketches import (
+    hll_count, hll_encode, hll_merge, hll_registers, merge_tdigests, tdigest_from_values, tdigest_quantiles,
+)
+from api.tests.base import MediaTestCase, csv_file
+
+
+class SketchTests(TestCase):
+    def test_tdigest_merge_tracks_exact_quantiles(self):
+        values = np.random.default_rng(3).normal(100, 10, 50000)
+        merged = merge_tdigests([tdigest_from_values(chunk) for chunk in np.array_split(values, 5)])
+        quantiles = [0.01, 0.25, 0.5, 0.75, 0.99]
+
+        estimates = tdigest_quantiles(merged, quantiles)
+        for estimate, exact in zip(estimates, np.quantile(values, quantiles)):
+            self.assertAlmostEqual(estimate, exact, delta=0.5)
+        self.assertEqual(merged["count"], 50000)
+
+    def test_hll_union_is_approximately_distinct(self):
+        names = np.array([f"Pump-{i}" for i in range(20000)])
+        union = hll_merge([hll_encode(hll_registers(names[:12000])), hll_encode(hll_registers(names[8000:]))])
+
+        self.assertAlmostEqual(hll_count(union), 20000, delta=20000 * 0.05)
+        self.assertAlmostEqual(hll_count(hll_encode(hll_registers(names[:10]))), 10, delta=1)
+
+
+class DistributionEndpointTests(MediaTestCase):
+    def upload(self, df):
+        return self.client.post(reverse("upload-csv"), {"file": csv_file(df)}, format="multipart").data["dataset_id"]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.frames = [
+            pd.DataFrame({
+                "Equipment Name": [f"Pump-{i}" for i in range(100)],
+                "Type": ["Pump"] * 50 + ["Valve"] * 50,
+                "Flowrate": np.arange(100, dtype=float) + offset,
+                "Pressure": np.linspace(4, 8, 100),
+                "Temperature": np.full(100, 110.0),
+            })
+            for offset in (0, 100)
+        ]
+        self.ids = [self.upload(df) for df in self.frames]
+
+    def test_merged_quantiles_and_distinct_names(self):
+        response = self.client.get(reverse("distribution"), {
+            "datasets": ",".join(map(str, self.ids)), "metric": "flowrate", "q": "0.5",
+        })
+        self.assertEqual(response.status_code, 200)
+        flowrate = response.data["metrics"]["flowrate"]
+        self.assertEqual(flowrate["count"], 200)
+        self.assertAlmostEqual(flowrate["quantiles"]["p50"], 99.5, delta=1)
+        self.assertEqual(sum(b["count"] for b in flowrate["histogram"]), 200)
+        # Both datasets reuse the same 100 names
+        self.assertAlmostEqual(response.data["distinct_equipment"], 100, delta=3)
+
+    def test_filter_by_type(self):
+        response = self.client.get(reverse("distribution"), {"datasets": self.ids[0], "type": "Valve"})
+        self.assertEqual(response.data["metrics"]["flowrate"]["count"], 50)
+
+    def test_unknown_dataset(self):
+        response = self.client.get(reverse("distribution"), {"datasets": "999999"})
+        self.assertEqual(response.status_code, 404)
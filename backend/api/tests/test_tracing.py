@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.executor import reset_executor
+from api.tests.base import CSV, MediaTestCase
+from api.tracing import get_exporter, parse_traceparent, reset_exporters, span
+
+MEMORY_TRACING = {"EXPORTER": "memory", "DEBUG_HEADER": True}
+
+
+def span_names(trace):
+    return [item.name for item in trace.spans]
+
+
+class SpanTests(TestCase):
+    def tearDown(self):
+        reset_exporters()
+
+    @override_settings(TRACING={"EXPORTER": "memory"})
+    def test_spans_nest_and_export_with_root(self):
+        with span("outer") as outer:
+            with span("inner", rows=3) as inner:
+                pass
+            self.assertEqual(len(get_exporter().traces), 0)
+
+        trace = get_exporter().traces[-1]
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertEqual(span_names(trace), ["inner", "outer"])
+        self.assertEqual(inner.attributes, {"rows": 3})
+
+    @override_settings(TRACING={"EXPORTER": "memory"})
+    def test_errors_are_recorded(self):
+        with self.assertRaises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+        self.assertEqual(get_exporter().traces[-1].spans[0].error, "ValueError: boom")
+
+    def test_disabled_tracing_is_a_no_op(self):
+        with span("ignored") as current:
+            self.assertIsNone(current)
+
+    def test_file_exporter_writes_otlp_json(self):
+        path = os.path.join(tempfile.mkdtemp(), "traces.jsonl")
+        with override_settings(TRACING={"EXPORTER": "file", "FILE_PATH": path}):
+            with span("root"):
+                with span("child", insight_type="general"):
+                    pass
+        with open(path) as f:
+            exported = json.loads(f.readline())
+        shutil.rmtree(os.path.dirname(path))
+
+        spans = exported["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        child, root = spans
+        self.assertEqual(child["parentSpanId"], root["spanId"])
+        self.assertEqual(child["traceId"], root["traceId"])
+        self.assertEqual(child["attributes"], [{"key": "insight_type", "value": {"stringValue": "general"}}])
+        self.assertNotIn("parentSpanId", root)
+
+    def test_parse_traceparent(self):
+        trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+        self.assertEqual(parse_traceparent(f"00-{trace_id}-{parent_id}-01"), (trace_id, parent_id))
+        self.assertEqual(parse_traceparent("garbage"), (None, None))
+        self.assertEqual(parse_traceparent(f"00-{'0' * 32}-{parent_id}-01"), (None, None))
+
+
+# Spans recorded in executor worker processes are lost, so these run on threads
+@override_settings(TRACING=MEMORY_TRACING, TASK_EXECUTOR={"BACKEND": "thread"})
+class RequestTracingTests(MediaTestCase):
+    def setUp(self):
+        reset_executor()
+
+    def tearDown(self):
+        reset_exporters()
+        reset_executor()
+
+    def upload(self):
+        response = APIClient().post(reverse("upload-csv"), {"file": SimpleUploadedFile("plant.csv", CSV)})
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_upload_pipeline_spans(self):
+        response = self.upload()
+        trace = get_exporter().find(response["X-Trace-Id"])
+        names = span_names(trace)
+
+        for name in ("parse", "upload.save_file", "analyze", "analyze.read_csv", "analyze.summary",
+                     "ai", "upload.save_summary", "upload.index_rows", "serialize", "POST api/upload/"):
+            self.assertIn(name, names)
+        insights = [item for item in trace.spans if item.name == "ai.insight"]
+        self.assertEqual(sorted(item.attributes["insight_type"] for item in insights), ["analytics", "general", "trends"])
+
+        # Work run on the executor thread joins the request trace
+        spans = {item.name: item for item in trace.spans}
+        self.assertEqual(spans["analyze.summary"].parent_id, spans["analyze"].span_id)
+
+    def test_compare_and_report_spans(self):
+        first = self.upload().data["dataset_id"]
+        second = self.upload().data["dataset_id"]
+
+        response = self.client.get(reverse("compare"), {"dataset_a": first, "dataset_b": second})
+        self.assertIn("compare.read_csv", span_names(get_exporter().find(response["X-Trace-Id"])))
+
+        response = self.client.get(reverse("download-report", args=[first]))
+        names = span_names(get_exporter().find(response["X-Trace-Id"]))
+        self.assertIn("render", names)
+        self.assertIn("report.build_pdf", names)
+        self.assertEqual(names.count("report.chart"), 3)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("history"))
+        entries = [entry.split(";")[0] for entry in response["Server-Timing"].split(", ")]
+        self.assertEqual(entries[0], "total")
+        self.assertIn("serialize", entries)
+
+    def test_incoming_traceparent_is_continued(self):
+        trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+        response = self.client.get(reverse("history"), HTTP_TRACEPARENT=f"00-{trace_id}-00f067aa0ba902b7-01")
+        self.assertEqual(response["X-Trace-Id"], trace_id)
+
+    def test_query_string_is_not_recorded(self):
+        response = self.client.get(reverse("history"), {"token": "secret-jwt"})
+        root = get_exporter().find(response["X-Trace-Id"]).spans[-1]
+        self.assertEqual(root.attributes["http.target"], reverse("history"))
+
+    @override_settings(TRACING={"EXPORTER": "memory", "DEBUG_HEADER": False})
+    def test_debug_header_is_opt_in(self):
+        response = self.client.get(reverse("history"))
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(len(get_exporter().traces), 1)
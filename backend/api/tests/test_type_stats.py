@@ -0,0 +1,69 @@
+
+import numpy as np
+import pandas as pd
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.models import UploadedDataset
+from api.tests.base import MediaTestCase
+from api.utils import analyze_dataframe, append_to_summary
+
+
+def plant(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Equipment Name": [f"Eq-{i}" for i in range(n)],
+        "Type": rng.choice(["Pump", "Valve"], n),
+        "Flowrate": rng.normal(100, 10, n),
+        "Pressure": rng.normal(6, 1, n),
+        "Temperature": rng.normal(110, 5, n),
+    })
+
+
+class TypeStatsTests(TestCase):
+    def test_upload_stats_match_pandas(self):
+        df = plant(300, 0)
+        stats = analyze_dataframe(df)["type_stats"]
+        pumps = df[df["Type"] == "Pump"]["Pressure"]
+
+        self.assertEqual(stats["Pump"]["count"], len(pumps))
+        self.assertAlmostEqual(stats["Pump"]["metrics"]["pressure"]["std"], pumps.std(), places=3)
+        self.assertAlmostEqual(stats["Pump"]["metrics"]["pressure"]["p50"], pumps.median(), places=3)
+
+    def test_count_is_rows_per_type_with_missing_metrics(self):
+        df = plant(100, 3)
+        df.loc[df.index[df["Type"] == "Pump"][:5], ["Flowrate", "Pressure", "Temperature"]] = np.nan
+        summary = analyze_dataframe(df)
+        pumps = int((df["Type"] == "Pump").sum())
+
+        self.assertEqual(summary["type_stats"]["Pump"]["count"], pumps)
+        merged = append_to_summary(summary, plant(10, 4).assign(Type="Valve"))["type_stats"]
+        self.assertEqual(merged["Pump"]["count"], pumps)
+
+    def test_append_merges_without_rescanning(self):
+        first, second = plant(300, 0), plant(200, 1)
+        merged = append_to_summary(analyze_dataframe(first), second)["type_stats"]
+        valves = pd.concat([first, second])
+        valves = valves[valves["Type"] == "Valve"]["Temperature"]
+
+        self.assertEqual(merged["Valve"]["count"], len(valves))
+        self.assertAlmostEqual(merged["Valve"]["metrics"]["temperature"]["mean"], valves.mean(), places=3)
+        self.assertAlmostEqual(merged["Valve"]["metrics"]["temperature"]["std"], valves.std(), places=3)
+        self.assertAlmostEqual(merged["Valve"]["metrics"]["temperature"]["p50"], valves.median(), delta=0.5)
+
+
+class TypeStatsEndpointTests(MediaTestCase):
+    def test_endpoint_and_legacy_fallback(self):
+        summary = analyze_dataframe(plant(50, 2))
+        del summary["type_stats"]
+        dataset = UploadedDataset.objects.create(file=ContentFile(b"", name="p.csv"), summary=summary)
+
+        response = APIClient().get(reverse("summary-types", args=[dataset.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data["type_stats"]), {"Pump", "Valve"})
+        self.assertNotIn("type_stats", UploadedDataset.objects.get(id=dataset.id).summary)
+
+    def test_missing_dataset(self):
+        self.assertEqual(APIClient().get(reverse("summary-types", args=[999999])).status_code, 404)
@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APIClient
@@ -61,3 +61,12 @@ class UploadTests(TestCase):
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("empty", str(response.data).lower())
+
+    @override_settings(CSV_MAX_ROWS=2)
+    def test_upload_row_limit_is_configurable(self):
+        csv = b"Equipment Name,Type,Flowrate,Pressure,Temperature\nA,Pump,1,2,3\nB,Pump,1,2,3\nC,Pump,1,2,3\n"
+        file = SimpleUploadedFile("large.csv", csv, content_type="text/csv")
+        response = self.client.post(self.url, {'file': file}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Maximum allowed is 2", str(response.data))
@@ -0,0 +1,305 @@
+"""
+Lightweight request tracing with OpenTelemetry-compatible output.
+
+    with span("upload.analyze", rows=len(df)):
+        ...
+
+Spans nest through a context variable, so work awaited in asyncio tasks,
+asyncio.to_thread and the thread executor joins the caller's trace. Every
+request gets a root span from TracingMiddleware. An incoming W3C
+`traceparent` header is honoured, so the backend's spans join the caller's
+trace.
+
+Finished traces go to the configured exporter:
+
+    none    tracing off unless DEBUG_HEADER is on (span() is then a no-op)
+    memory  last MEMORY_SIZE traces kept in-process (tests, debugging)
+    file    one OTLP/JSON ExportTraceServiceRequest per line in FILE_PATH, which the
+            OpenTelemetry collector's otlpjsonfile receiver (or any OTLP/JSON tool) can ingest
+
+With DEBUG_HEADER enabled, responses carry `X-Trace-Id` and a standard
+`Server-Timing` header listing every span, which browser devtools display
+in the network panel.
+"""
+import collections
+import contextlib
+import contextvars
+import json
+import os
+import re
+import secrets
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+DEFAULTS = {
+    "EXPORTER": "none",
+    "FILE_PATH": "traces.jsonl",
+    "MEMORY_SIZE": 100,
+    "DEBUG_HEADER": False,
+    "SERVICE_NAME": "chemical-equipment-api",
+}
+EXPORTERS = ("none", "memory", "file")
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, "TRACING", {}))
+    return config
+
+
+def tracing_enabled(config=None):
+    config = config or get_config()
+    return config["EXPORTER"] != "none" or config["DEBUG_HEADER"]
+
+
+class Trace:
+    """Spans of one trace; children may finish on other threads"""
+
+    def __init__(self, trace_id=None):
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+
+class Span:
+    def __init__(self, name, trace, parent_id=None, attributes=None, kind="internal"):
+        self.name = name
+        self.kind = kind
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    @property
+    def duration_ms(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def end(self):
+        self.end_ns = time.time_ns()
+        self.trace.add(self)
+
+
+_current = contextvars.ContextVar("current_span", default=None)
+
+
+def current_span():
+    return _current.get()
+
+
+@contextlib.contextmanager
+def span(name, **attributes):
+    """
+    Time a block as a child of the current span. Outside a trace a new root is
+    started (and exported when it ends) if tracing is enabled; otherwise this
+    yields None without recording anything.
+    """
+    parent = _current.get()
+    if parent is None and not tracing_enabled():
+        yield None
+        return
+
+    trace = parent.trace if parent else Trace()
+    current = Span(name, trace, parent.span_id if parent else None, attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        _current.reset(token)
+        current.end()
+        if parent is None:
+            export(trace)
+
+
+# --- exporters ------------------------------------------------------------
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(trace, service_name=DEFAULTS["SERVICE_NAME"]):
+    """Trace as an OTLP/JSON ExportTraceServiceRequest"""
+    spans = []
+    for item in trace.spans:
+        record = {
+            "traceId": trace.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            "kind": 2 if item.kind == "server" else 1,  # SPAN_KIND_SERVER / SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(item.start_ns),
+            "endTimeUnixNano": str(item.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in item.attributes.items()],
+            "status": {"code": 2, "message": item.error} if item.error else {"code": 1},
+        }
+        if item.parent_id:
+            record["parentSpanId"] = item.parent_id
+        spans.append(record)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+        }]
+    }
+
+
+class MemoryExporter:
+    def __init__(self, size):
+        self.traces = collections.deque(maxlen=size)
+
+    def export(self, trace, config):
+        self.traces.append(trace)
+
+    def find(self, trace_id):
+        return next((trace for trace in self.traces if trace.trace_id == trace_id), None)
+
+
+class FileExporter:
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def export(self, trace, config):
+        line = json.dumps(to_otlp(trace, config["SERVICE_NAME"]))
+        path = config["FILE_PATH"]
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+_exporters = {}
+_exporters_lock = threading.Lock()
+
+
+def get_exporter(config=None):
+    config = config or get_config()
+    name = config["EXPORTER"]
+    if name not in EXPORTERS:
+        raise ValueError(f"Unknown tracing exporter '{name}', expected one of {EXPORTERS}")
+    if name == "none":
+        return None
+    with _exporters_lock:
+        if name not in _exporters:
+            _exporters[name] = MemoryExporter(config["MEMORY_SIZE"]) if name == "memory" else FileExporter()
+        return _exporters[name]
+
+
+def reset_exporters():
+    """Drop exporter state (tests)"""
+    with _exporters_lock:
+        _exporters.clear()
+
+
+def export(trace):
+    config = get_config()
+    exporter = get_exporter(config)
+    if exporter is not None:
+        exporter.export(trace, config)
+
+
+# --- request integration --------------------------------------------------
+
+def parse_traceparent(value):
+    """(trace_id, parent_span_id) from a W3C traceparent header, or (None, None)"""
+    match = TRACEPARENT.match((value or "").strip().lower())
+    if not match or match.group(1) == "0" * 32:
+        return None, None
+    return match.group(1), match.group(2)
+
+
+def server_timing(trace):
+    """Server-Timing header value listing the trace's spans in start order"""
+    entries = []
+    for item in sorted(trace.spans, key=lambda s: s.start_ns):
+        name = "total" if item.kind == "server" else re.sub(r"[^A-Za-z0-9_.-]", "_", item.name)
+        entries.append(f"{name};dur={item.duration_ms:.1f}")
+    return ", ".join(entries)
+
+
+class TracingMiddleware:
+    """Opens a root span per request and adds the debug headers when enabled"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _start(self, request):
+        trace_id, parent_id = parse_traceparent(request.headers.get("traceparent"))
+        root = Span(f"{request.method} {request.path}", Trace(trace_id), parent_id, {
+            "http.method": request.method,
+            # Path only: query strings can carry credentials (EventSource sends ?token=)
+            "http.target": request.path,
+        }, kind="server")
+        return root, _current.set(root)
+
+    def _finish(self, request, response, root, token, config):
+        _current.reset(token)
+        match = getattr(request, "resolver_match", None)
+        if match:
+            root.name = f"{request.method} {match.route}"
+            root.set_attribute("http.route", match.route)
+        root.set_attribute("http.status_code", response.status_code)
+        root.end()
+        export(root.trace)
+        if config["DEBUG_HEADER"]:
+            response["X-Trace-Id"] = root.trace.trace_id
+            response["Server-Timing"] = server_timing(root.trace)
+        return response
+
+    def _fail(self, root, token, exc):
+        _current.reset(token)
+        root.error = f"{type(exc).__name__}: {exc}"
+        root.end()
+        export(root.trace)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        config = get_config()
+        if not tracing_enabled(config):
+            return self.get_response(request)
+        root, token = self._start(request)
+        try:
+            response = self.get_response(request)
+        except BaseException as exc:
+            self._fail(root, token, exc)
+            raise
+        return self._finish(request, response, root, token, config)
+
+    async def __acall__(self, request):
+        config = get_config()
+        if not tracing_enabled(config):
+            return await self.get_response(request)
+        root, token = self._start(request)
+        try:
+            response = await self.get_response(request)
+        except BaseException as exc:
+            self._fail(root, token, exc)
+            raise
+        return self._finish(request, response, root, token, config)
@@ -1,12 +1,26 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Under ASGI (uvicorn) the read-heavy endpoints are served by coroutine views
+read_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
     path('', views.api_root, name='api-root'),
     path('register/', views.register, name='register'),
     path('upload/', views.upload_csv, name='upload-csv'),
-    path('summary/<int:dataset_id>/', views.summary, name='summary'),
-    path('compare/', views.compare_datasets_view, name='compare'),
+    path('summary/<int:dataset_id>/', read_views.summary, name='summary'),
+    path('summary/<int:dataset_id>/types/', views.summary_by_type, name='summary-types'),
+    path('datasets/<int:dataset_id>/append/', views.append_rows, name='append-rows'),
+    path('compare/', read_views.compare_datasets_view, name='compare'),
+    path('compare/view/', read_views.compare_view_data, name='compare-view'),
+    path('compare/diff/', read_views.compare_diff, name='compare-diff'),
     path('report/<int:dataset_id>/', views.download_report, name='download-report'),
-    path('history/', views.history, name='history'),
+    path('history/', read_views.history, name='history'),
+    path('events/', read_views.events, name='events'),
+    path('risk/<int:dataset_id>/', views.risk_assessment, name='risk'),
+    path('anomalies/<int:dataset_id>/', views.anomalies, name='anomalies'),
+    path('correlation/<int:dataset_id>/', views.correlation, name='correlation'),
+    path('distribution/', views.distribution, name='distribution'),
+    path('equipment/<str:name>/history/', views.equipment_history_view, name='equipment-history'),
 ]
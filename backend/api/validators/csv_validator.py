@@ -1,9 +1,66 @@
+import numpy as np
 import pandas as pd
+from django.conf import settings
 from django.core.exceptions import ValidationError
 
 REQUIRED_COLUMNS = {"Equipment Name", "Type", "Flowrate", "Pressure", "Temperature"}
 MAX_FILE_SIZE_MB = 10
 MAX_ROWS = 20000
+NUMERIC_COLUMNS = ["Flowrate", "Pressure", "Temperature"]
+
+
+def max_rows():
+    return getattr(settings, "CSV_MAX_ROWS", None) or MAX_ROWS
+
+
+def max_file_size_mb():
+    return getattr(settings, "CSV_MAX_FILE_SIZE_MB", None) or MAX_FILE_SIZE_MB
+
+
+def validate_dataframe(df):
+    """
+    Validates parsed rows for:
+    - Emptiness / Row count
+    - Required Columns
+    - Data Types
+    """
+    if df.empty:
+        raise ValidationError("CSV file is empty.")
+
+    # Check row count
+    if len(df) > max_rows():
+         raise ValidationError(f"File contains {len(df)} rows. Maximum allowed is {max_rows()}.")
+
+    # Check columns
+    if not REQUIRED_COLUMNS.issubset(set(df.columns)):
+        missing = REQUIRED_COLUMNS - set(df.columns)
+        raise ValidationError(f"Missing required columns: {', '.join(missing)}")
+
+    # Check numeric types
+    for col in NUMERIC_COLUMNS:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            # Attempt to convert to see if it's coercion-safe
+            try:
+                pd.to_numeric(df[col])
+            except Exception:
+                raise ValidationError(f"Column '{col}' must contain numeric data.")
+
+
+def validate_row_total(existing, added):
+    """Appends may not take a dataset past the row limit of a single upload"""
+    if existing + added > max_rows():
+        raise ValidationError(
+            f"Dataset would contain {existing + added} rows after appending. Maximum allowed is {max_rows()}."
+        )
+
+
+def validate_metric_values(df):
+    """Appended rows must carry a number in every metric column, since summaries are stored as JSON"""
+    for col in NUMERIC_COLUMNS:
+        values = pd.to_numeric(df[col], errors="coerce").astype(float)
+        if not np.isfinite(values).all():
+            raise ValidationError(f"Column '{col}' must contain a finite number in every appended row.")
+
 
 def validate_csv_file(file):
     """
@@ -14,8 +71,8 @@ def validate_csv_file(file):
     - Data Types
     """
     # 1. File size validation
-    if file.size > MAX_FILE_SIZE_MB * 1024 * 1024:
-        raise ValidationError(f"File too large. Max size is {MAX_FILE_SIZE_MB}MB.")
+    if file.size > max_file_size_mb() * 1024 * 1024:
+        raise ValidationError(f"File too large. Max size is {max_file_size_mb()}MB.")
 
     # 2. Extension validation
     if not file.name.endswith('.csv'):
@@ -27,28 +84,7 @@ def validate_csv_file(file):
         # Note: chunks could be used for large files to avoid memory issues,
         # but for validation we need to check columns.
         df = pd.read_csv(file)
-        
-        if df.empty:
-            raise ValidationError("CSV file is empty.")
-
-        # Check row count
-        if len(df) > MAX_ROWS:
-             raise ValidationError(f"File contains {len(df)} rows. Maximum allowed is {MAX_ROWS}.")
-
-        # Check columns
-        if not REQUIRED_COLUMNS.issubset(set(df.columns)):
-            missing = REQUIRED_COLUMNS - set(df.columns)
-            raise ValidationError(f"Missing required columns: {', '.join(missing)}")
-
-        # Check numeric types
-        numeric_cols = ["Flowrate", "Pressure", "Temperature"]
-        for col in numeric_cols:
-            if not pd.api.types.is_numeric_dtype(df[col]):
-                # Attempt to convert to see if it's coercion-safe
-                try:
-                    pd.to_numeric(df[col])
-                except Exception:
-                    raise ValidationError(f"Column '{col}' must contain numeric data.")
+        validate_dataframe(df)
 
     except pd.errors.EmptyDataError:
         raise ValidationError("CSV file is empty or invalid.")
@@ -1,12 +1,28 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from django.conf import settings
 from django.db.models import Q
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.models import User
+from .events import get_config as get_event_config
 from .models import UploadedDataset
 from .serializers import UploadedDatasetSerializer
-from .utils import analyze_csv
+
+
+def visible_datasets(request):
+    """
+    Datasets the requester may read: own + anonymous ones when logged in
+    (backward compatibility/legacy data), only anonymous ones otherwise
+    """
+    if request.user.is_authenticated:
+        return UploadedDataset.objects.filter(Q(user=request.user) | Q(user__isnull=True))
+    return UploadedDataset.objects.filter(user__isnull=True)
+
+
+def parse_id_list(value):
+    """Parse a comma-separated list of dataset ids ("1,2,3")"""
+    return [int(part) for part in value.split(",") if part.strip()]
 
 
 @api_view(['POST'])
@@ -37,14 +53,19 @@ def api_root(request):
     Returns initialization status
     """
     return Response({
-        'status': 'Backend initialized'
+        'status': 'Backend initialized',
+        # Capabilities: whether clients may open the /api/events/ stream
+        'events': get_event_config()['ENABLED'],
     })
 
 
+import pandas as pd
 from django.core.exceptions import ValidationError
-from .validators.csv_validator import validate_csv_file
+from .validators.csv_validator import validate_csv_file, validate_dataframe
 
-from .services.dataset_service import handle_upload
+from .executor import ExecutorBusy, run_task
+from .metrics import record_cache, stage
+from .services.dataset_service import handle_append, handle_upload
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
@@ -57,7 +78,8 @@ def upload_csv(request):
         return Response({"error": "CSV file required"}, status=400)
 
     try:
-        validate_csv_file(file)
+        with stage("parse"):
+            validate_csv_file(file)
     except ValidationError as e:
         return Response({"error": str(e)}, status=400)
 
@@ -65,6 +87,8 @@ def upload_csv(request):
 
     try:
         dataset = handle_upload(file, user)
+    except ExecutorBusy:
+        raise
     except Exception as e:
         return Response({"error": str(e)}, status=400)
 
@@ -74,9 +98,101 @@ def upload_csv(request):
     })
 
 
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def append_rows(request, dataset_id):
+    """
+    Append rows to an existing dataset.
+    Accepts a CSV file (`file`) or JSON body {"rows": [{...}, ...]}
+    """
+    try:
+        dataset = UploadedDataset.objects.only("id", "user_id").get(id=dataset_id)
+    except UploadedDataset.DoesNotExist:
+        return Response({"error": "Dataset not found"}, status=404)
+
+    if dataset.user_id and dataset.user_id != request.user.id:
+        return Response({"error": "You do not have permission to modify this dataset"}, status=403)
+
+    file = request.FILES.get("file")
+    try:
+        with stage("parse"):
+            if file:
+                validate_csv_file(file)
+                df = pd.read_csv(file)
+            else:
+                rows = request.data.get("rows")
+                if not isinstance(rows, list) or not rows:
+                    return Response({"error": "CSV file or non-empty 'rows' list required"}, status=400)
+                df = pd.DataFrame(rows)
+                validate_dataframe(df)
+        dataset = handle_append(dataset.id, df)
+    except ValidationError as e:
+        return Response({"error": str(e)}, status=400)
+
+    return Response({
+        "dataset_id": dataset.id,
+        "appended": len(df),
+        "total_equipment": dataset.summary["total_equipment"],
+        "averages": dataset.summary["averages"],
+    })
+
+
 from django.http import FileResponse
+from django.views.decorators.http import condition
+from .comparison import (compare_datasets, compare_view, compare_view_params, dataset_source, diff_datasets,
+                         diff_params)
 from .reports import generate_pdf_report
 
+
+def format_dataset_etag(dataset_id, uploaded_at, file_size):
+    """
+    Weak validator for a dataset's summary and report. Appends always grow the
+    stored CSV, so file_size changes whenever the rows do; fields backfilled
+    for older datasets (type stats, risk, correlation, anomalies) are derived
+    from the same rows and keep the ETag.
+    """
+    return f'W/"{dataset_id}-{int(uploaded_at.timestamp())}-{file_size}"'
+
+
+def dataset_etag(request, dataset_id):
+    revision = UploadedDataset.objects.filter(id=dataset_id).values_list("uploaded_at", "file_size").first()
+    return format_dataset_etag(dataset_id, *revision) if revision else None
+
+
+def format_comparison_etag(revisions):
+    """Weak validator of a comparison: the validators of both datasets, in order"""
+    return 'W/"' + "+".join(f"{i}-{int(uploaded_at.timestamp())}-{size}" for i, uploaded_at, size in revisions) + '"'
+
+
+def comparison_revisions(query):
+    """(id, uploaded_at, file_size) of dataset_a and dataset_b, or None if either is missing or invalid"""
+    ids = (query.get("dataset_a"), query.get("dataset_b"))
+    try:
+        ids = tuple(int(value) for value in ids)
+    except (TypeError, ValueError):
+        return None
+    rows = {row[0]: row for row in UploadedDataset.objects.filter(id__in=ids).values_list("id", "uploaded_at", "file_size")}
+    return [rows[i] for i in ids] if all(i in rows for i in ids) else None
+
+
+def comparison_sources(id_a, id_b):
+    """
+    Task inputs (see comparison.dataset_source) for a row-level comparison of
+    two datasets. The rows are read from the CSV files, so the summary (which
+    holds the whole table) is only loaded for a dataset whose file is gone.
+
+    Raises:
+        UploadedDataset.DoesNotExist, ValueError: As for a plain get()
+    """
+    return [dataset_source(UploadedDataset.objects.defer("summary").get(id=pk)) for pk in (id_a, id_b)]
+
+
+def comparison_etag(request):
+    revisions = comparison_revisions(request.GET)
+    return format_comparison_etag(revisions) if revisions else None
+
+
+@condition(etag_func=dataset_etag)
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def summary(request, dataset_id):
@@ -91,6 +207,31 @@ def summary(request, dataset_id):
     return Response(dataset.summary)
 
 
+from analytics.summary import derived_field
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def summary_by_type(request, dataset_id):
+    """
+    Per-equipment-type count/mean/std/min/max/quartiles for a dataset,
+    without shipping the row table
+    """
+    rows = list(UploadedDataset.objects.filter(id=dataset_id).values_list("summary__type_stats", flat=True))
+    if not rows:
+        return Response({"error": "Dataset not found"}, status=404)
+
+    type_stats = rows[0]
+    record_cache("summary.type_stats", type_stats is not None)
+    if type_stats is None:
+        # Datasets analysed before type stats were stored: computed per request
+        # until `manage.py backfill_summaries` has run (GETs do not write)
+        type_stats = derived_field(UploadedDataset.objects.get(id=dataset_id).summary, "type_stats")
+
+    return Response({"dataset_id": dataset_id, "type_stats": type_stats})
+
+
+@condition(etag_func=dataset_etag)
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def download_report(request, dataset_id):
@@ -102,14 +243,13 @@ def download_report(request, dataset_id):
     except UploadedDataset.DoesNotExist:
         return Response({"error": "Dataset not found"}, status=404)
 
-    pdf_buffer = generate_pdf_report(dataset)
+    with stage("render"):
+        pdf_buffer = run_task(generate_pdf_report, dataset.summary, dataset.original_filename or f"#{dataset.id}")
     
     response = FileResponse(pdf_buffer, as_attachment=True, filename=f"report_{dataset.id}.pdf")
     return response
 
 
-from .comparison import compare_datasets
-
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def compare_datasets_view(request):
@@ -130,7 +270,73 @@ def compare_datasets_view(request):
     except ValueError:
         return Response({"error": "Invalid ID format"}, status=400)
 
-    result = compare_datasets(dataset_a, dataset_b)
+    with stage("analyze"):
+        result = run_task(compare_datasets, dataset_source(dataset_a, summary=True),
+                          dataset_source(dataset_b, summary=True))
+    return Response(result)
+
+
+@condition(etag_func=comparison_etag)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def compare_view_data(request):
+    """
+    Compact comparison for the compare screens: histograms of both datasets over
+    shared bins, per-type bars and an Equipment Name joined diff of the rows that
+    changed most. Optional ?bins= (default 20) and ?limit= (diff rows, default 200).
+    """
+    id_a = request.GET.get('dataset_a')
+    id_b = request.GET.get('dataset_b')
+
+    if not id_a or not id_b:
+        return Response({"error": "Both dataset_a and dataset_b parameters are required"}, status=400)
+    try:
+        bins, limit = compare_view_params(request.GET)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+
+    try:
+        source_a, source_b = comparison_sources(id_a, id_b)
+    except UploadedDataset.DoesNotExist:
+        return Response({"error": "One or both datasets not found"}, status=404)
+    except ValueError:
+        return Response({"error": "Invalid ID format"}, status=400)
+
+    with stage("analyze"):
+        result = run_task(compare_view, source_a, source_b, bins, limit)
+    return Response(result)
+
+
+@condition(etag_func=comparison_etag)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def compare_diff(request):
+    """
+    Row-level diff of dataset B against A, joined on Equipment Name: counts of
+    matched, changed, added and removed equipment, the top-K movers per metric
+    and one page of a section.
+    Query: [?section=changed|matched|added|removed][&sort=change|name|<metric>]
+           [&offset=0][&limit=100][&k=10]
+    """
+    id_a = request.GET.get('dataset_a')
+    id_b = request.GET.get('dataset_b')
+
+    if not id_a or not id_b:
+        return Response({"error": "Both dataset_a and dataset_b parameters are required"}, status=400)
+    try:
+        params = diff_params(request.GET)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+
+    try:
+        source_a, source_b = comparison_sources(id_a, id_b)
+    except UploadedDataset.DoesNotExist:
+        return Response({"error": "One or both datasets not found"}, status=404)
+    except ValueError:
+        return Response({"error": "Invalid ID format"}, status=400)
+
+    with stage("analyze"):
+        result = run_task(diff_datasets, source_a, source_b, **params)
     return Response(result)
 
 
@@ -138,16 +344,20 @@ def compare_datasets_view(request):
 @permission_classes([AllowAny])
 def history(request):
     """
-    Get list of recent uploads (last 5)
+    Get list of recent uploads (newest first).
+    Optional ?limit=N (default HISTORY_DEFAULT_LIMIT, max HISTORY_MAX_LIMIT)
     """
-    if request.user.is_authenticated:
-        # Show own datasets AND anonymous ones (for backward compatibility/legacy data)
-        datasets = UploadedDataset.objects.filter(
-            Q(user=request.user) | Q(user__isnull=True)
-        ).order_by("-uploaded_at")[:5]
-    else:
-        # Anonymous users see only anonymous datasets
-        datasets = UploadedDataset.objects.filter(user__isnull=True).order_by("-uploaded_at")[:5]
+    try:
+        limit = int(request.GET.get('limit', settings.HISTORY_DEFAULT_LIMIT))
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=400)
+    limit = max(1, min(limit, settings.HISTORY_MAX_LIMIT))
+
+    datasets = (
+        visible_datasets(request)
+        .only("id", "file", "original_filename", "uploaded_at")
+        .order_by("-uploaded_at")[:limit]
+    )
     return Response([
         {
             "id": d.id,
@@ -158,3 +368,214 @@ def history(request):
         for d in datasets
     ])
 
+
+from analytics.aggregates import METRIC_COLUMNS
+from analytics.sketches import describe_metric, hll_count, merge_sketches
+
+DEFAULT_QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def distribution(request):
+    """
+    Quantiles, histograms and distinct equipment count across datasets,
+    answered by merging the stored per-dataset sketches (no row scans).
+    Query: ?datasets=1,2,3 [&metric=pressure] [&type=Pump] [&q=0.5,0.9]
+    """
+    try:
+        ids = parse_id_list(request.GET.get("datasets", ""))
+        quantiles = [float(q) for q in request.GET.get("q", "").split(",") if q.strip()] or DEFAULT_QUANTILES
+    except ValueError:
+        return Response({"error": "Invalid datasets or q parameter"}, status=400)
+    if not ids:
+        return Response({"error": "datasets parameter is required"}, status=400)
+    if any(q < 0 or q > 1 for q in quantiles):
+        return Response({"error": "Quantiles must be between 0 and 1"}, status=400)
+
+    metric = request.GET.get("metric")
+    if metric and metric not in METRIC_COLUMNS:
+        return Response({"error": f"Unknown metric '{metric}'"}, status=400)
+
+    rows = visible_datasets(request).filter(id__in=ids).values_list("id", "summary__sketches")
+    found = {dataset_id: sketches for dataset_id, sketches in rows}
+    missing = sorted(set(ids) - set(found))
+    if missing:
+        return Response({"error": f"Datasets not found: {missing}"}, status=404)
+    if any(not sketches for sketches in found.values()):
+        return Response({"error": "Some datasets were analysed before sketches were available"}, status=409)
+
+    merged = merge_sketches(found.values())
+    type_name = request.GET.get("type")
+    if type_name:
+        metric_sketches = merged["by_type"].get(type_name)
+        if metric_sketches is None:
+            return Response({"error": f"Unknown equipment type '{type_name}'"}, status=404)
+    else:
+        metric_sketches = merged["metrics"]
+
+    metrics = [metric] if metric else list(METRIC_COLUMNS)
+    return Response({
+        "datasets": sorted(found),
+        "type": type_name,
+        "distinct_equipment": hll_count(merged["equipment_names"]),
+        "metrics": {key: describe_metric(metric_sketches[key], quantiles) for key in metrics},
+    })
+
+
+from .services.equipment_index import drift, equipment_history
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def equipment_history_view(request, name):
+    """
+    Time series of one equipment item across recent datasets (oldest first).
+    Query: [?type=Pump] [&limit=50]
+    """
+    try:
+        limit = int(request.GET.get("limit", 50))
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=400)
+    limit = max(1, min(limit, settings.HISTORY_MAX_LIMIT))
+
+    points = equipment_history(visible_datasets(request), name, request.GET.get("type"), limit)
+    if not points:
+        return Response({"error": f"No readings found for equipment '{name}'"}, status=404)
+
+    return Response({
+        "equipment_name": name,
+        "runs": len({p["dataset_id"] for p in points}),
+        "points": points,
+        "drift": drift(points),
+    })
+
+
+from analytics.risk import LEVEL_SEVERITY
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def risk_assessment(request, dataset_id):
+    """
+    Flagged assets for a dataset, as evaluated by the risk engine at upload.
+    Query: [?level=critical] [&limit=N]
+    """
+    try:
+        dataset = UploadedDataset.objects.get(id=dataset_id)
+    except UploadedDataset.DoesNotExist:
+        return Response({"error": "Dataset not found"}, status=404)
+
+    risk = dataset.summary.get("risk")
+    record_cache("summary.risk", risk is not None)
+    if risk is None:
+        # Datasets analysed before the risk engine: evaluated per request until backfilled
+        risk = derived_field(dataset.summary, "risk")
+
+    flagged = risk["flagged"]
+    level = request.GET.get("level")
+    if level:
+        if level not in LEVEL_SEVERITY:
+            return Response({"error": f"Unknown level '{level}'"}, status=400)
+        flagged = [item for item in flagged if item["level"] == level]
+    try:
+        limit = int(request.GET["limit"]) if "limit" in request.GET else None
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=400)
+
+    return Response({
+        "dataset_id": dataset.id,
+        "counts": risk["counts"],
+        "stability_score": risk["stability_score"],
+        "flagged": flagged[:limit] if limit else flagged,
+    })
+
+
+from analytics.anomalies import top_anomalies
+
+MAX_ANOMALIES = 1000
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def anomalies(request, dataset_id):
+    """
+    Top-K anomalous rows of a dataset, highest score first.
+    Query: [?k=10]
+    """
+    try:
+        k = max(1, min(int(request.GET.get("k", 10)), MAX_ANOMALIES))
+    except ValueError:
+        return Response({"error": "k must be an integer"}, status=400)
+
+    try:
+        dataset = UploadedDataset.objects.get(id=dataset_id)
+    except UploadedDataset.DoesNotExist:
+        return Response({"error": "Dataset not found"}, status=404)
+
+    result = dataset.summary.get("anomalies")
+    if not result:
+        return Response({"error": "Dataset was analysed before anomaly detection was available; "
+                                  "run `manage.py backfill_summaries`"}, status=409)
+
+    return Response({
+        "dataset_id": dataset.id,
+        "count": result["count"],
+        "anomalies": top_anomalies(result, dataset.summary.get("table", []), k),
+    })
+
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def correlation(request, dataset_id):
+    """
+    Flowrate/Pressure/Temperature correlation matrix and linear fits,
+    overall and per equipment type. Query: [?type=Pump]
+    """
+    try:
+        dataset = UploadedDataset.objects.get(id=dataset_id)
+    except UploadedDataset.DoesNotExist:
+        return Response({"error": "Dataset not found"}, status=404)
+
+    result = dataset.summary.get("correlation")
+    record_cache("summary.correlation", result is not None)
+    if result is None:
+        # Datasets analysed before the correlation stage: computed per request until backfilled
+        result = derived_field(dataset.summary, "correlation")
+
+    type_name = request.GET.get("type")
+    if type_name:
+        if type_name not in result["by_type"]:
+            return Response({"error": f"Unknown type '{type_name}'"}, status=404)
+        return Response({"dataset_id": dataset.id, "type": type_name, **result["by_type"][type_name]})
+
+    return Response({
+        "dataset_id": dataset.id,
+        "overall": result["overall"],
+        "by_type": result["by_type"],
+    })
+
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import APIException
+from .events import (event_stream_response, parse_last_event_id, resolve_stream_user, stream_disabled_response,
+                     stream_events)
+
+
+@require_GET
+def events(request):
+    """
+    Server-sent event stream of upload/analysis progress, completed summaries
+    and available reports. Plain Django view: DRF content negotiation would
+    reject the text/event-stream Accept header. Auth: Bearer header or ?token=
+    Not served (404) unless EVENT_STREAM["ENABLED"]: a stream pins a sync worker.
+    """
+    if not get_event_config()["ENABLED"]:
+        return stream_disabled_response()
+    try:
+        user = resolve_stream_user(request)
+    except APIException as exc:
+        return JsonResponse({"detail": str(exc.detail)}, status=exc.status_code)
+    return event_stream_response(stream_events(user.id, parse_last_event_id(request)))
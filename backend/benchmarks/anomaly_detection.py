@@ -0,0 +1,47 @@
+"""
+Benchmark the anomaly detection stage at increasing row counts.
+
+Usage (from backend/):
+    python benchmarks/anomaly_detection.py [--rows 10000 100000 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "equipment_visualizer.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from analytics.anomalies import append_anomalies, detect_anomalies  # noqa: E402
+from benchmarks.datagen import synthetic_frame  # noqa: E402
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'detect (s)':>11} {'rows/s':>12} {'append 1% (s)':>14} {'scores (KB)':>12}")
+    for rows in args.rows:
+        df = synthetic_frame(rows)
+        result, detect_time = timed(detect_anomalies, df)
+        extra = synthetic_frame(max(1, rows // 100), seed=1)
+        _, append_time = timed(append_anomalies, result, extra, rows)
+        print(
+            f"{rows:>10} {detect_time:>11.3f} {rows / detect_time:>12,.0f} "
+            f"{append_time:>14.3f} {len(result['scores']) / 1024:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Synthetic equipment CSV generator for benchmarks.
+
+Each equipment type has its own operating profile (mean / spread of Flowrate,
+Pressure and Temperature) so per-type statistics, risk rules and anomaly
+detection see realistic data. A small share of rows is pushed far outside
+the profile to exercise the outlier paths.
+
+Usage (from backend/):
+    python benchmarks/datagen.py 100000 plant.csv [--mix Pump=0.5,Valve=0.3,Reactor=0.2] [--seed 0]
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# type -> (flowrate mean, sd), (pressure mean, sd), (temperature mean, sd)
+TYPE_PROFILES = {
+    "Pump": ((120, 20), (5.5, 0.8), (110, 8)),
+    "Compressor": ((95, 15), (8.0, 1.2), (140, 12)),
+    "Valve": ((60, 12), (4.2, 0.6), (105, 6)),
+    "HeatExchanger": ((150, 25), (6.2, 0.9), (130, 15)),
+    "Reactor": ((80, 10), (7.5, 1.0), (180, 20)),
+    "Condenser": ((130, 18), (5.0, 0.7), (95, 7)),
+}
+TYPES = list(TYPE_PROFILES)
+OUTLIER_SHARE = 0.005
+
+
+def parse_mix(text):
+    """'Pump=0.5,Valve=0.5' -> {"Pump": 0.5, "Valve": 0.5}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in TYPE_PROFILES:
+            raise argparse.ArgumentTypeError(f"Unknown type '{name}', expected one of {', '.join(TYPES)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def synthetic_frame(rows, seed=0, mix=None):
+    """DataFrame of `rows` equipment readings; `mix` maps type -> relative weight (default uniform)"""
+    rng = np.random.default_rng(seed)
+    mix = mix or {name: 1.0 for name in TYPES}
+    names = list(mix)
+    weights = np.asarray([mix[name] for name in names], dtype=float)
+    codes = rng.choice(len(names), rows, p=weights / weights.sum())
+
+    profiles = np.asarray([TYPE_PROFILES[name] for name in names])  # types x metrics x (mean, sd)
+    values = rng.normal(profiles[codes, :, 0], profiles[codes, :, 1])
+    outliers = rng.random(rows) < OUTLIER_SHARE
+    values[outliers] *= rng.uniform(1.6, 2.5, (int(outliers.sum()), 3))
+
+    return pd.DataFrame({
+        "Equipment Name": [f"EQ-{i:07d}" for i in range(rows)],
+        "Type": np.asarray(names)[codes],
+        "Flowrate": values[:, 0].round(2),
+        "Pressure": values[:, 1].round(3),
+        "Temperature": values[:, 2].round(2),
+    })
+
+
+def write_csv(path, rows, seed=0, mix=None):
+    synthetic_frame(rows, seed, mix).to_csv(path, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("rows", type=int)
+    parser.add_argument("output")
+    parser.add_argument("--mix", type=parse_mix, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_csv(args.output, args.rows, args.seed, args.mix)
+
+
+if __name__ == "__main__":
+    main()
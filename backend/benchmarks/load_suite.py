@@ -0,0 +1,277 @@
+"""
+API load-test suite: upload, summary, compare, report and history scenarios.
+
+For every data size a throwaway SQLite database and media directory are
+seeded with generated CSVs (see datagen.py). Each scenario then runs in a
+fresh Python process driving the API through Django's test client, so the
+reported peak RSS belongs to that endpoint alone. Everything runs offline:
+AI insight calls are stubbed and upload limits are lifted for the run.
+
+Reports p50/p95/p99 latency, throughput and peak RSS per endpoint as JSON;
+pass a previous result file as --baseline to print the relative change.
+
+Usage (from backend/):
+    python benchmarks/load_suite.py [--rows 1000 10000 100000] [--scenarios upload summary compare report history]
+                                    [--requests 10] [--warmup 1] [--concurrency 1] [--mix Pump=0.5,Valve=0.5]
+                                    [--output results.json] [--baseline previous.json]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.datagen import parse_mix, write_csv  # noqa: E402
+
+SCENARIOS = ["upload", "summary", "compare", "report", "history"]
+STUB_INSIGHT = "• Benchmark run: AI insights stubbed."
+
+
+# --- worker process -------------------------------------------------------
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if platform.system() == "Darwin" else 1024), 1)
+
+
+def _request(client, scenario, job):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    if scenario == "upload":
+        upload = SimpleUploadedFile("bench.csv", job["csv"], content_type="text/csv")
+        response = client.post("/api/upload/", {"file": upload})
+    elif scenario == "summary":
+        response = client.get(f"/api/summary/{job['ids'][0]}/")
+    elif scenario == "compare":
+        response = client.get("/api/compare/", {"dataset_a": job["ids"][0], "dataset_b": job["ids"][1]})
+    elif scenario == "report":
+        response = client.get(f"/api/report/{job['ids'][0]}/")
+    else:
+        response = client.get("/api/history/", {"limit": 50})
+
+    if response.streaming:
+        b"".join(response.streaming_content)
+    else:
+        response.content
+    if response.status_code != 200:
+        raise RuntimeError(f"{scenario} returned {response.status_code}")
+
+
+def run_worker(job):
+    """Run one scenario inside this process and return its raw measurements"""
+    import django
+    from unittest import mock
+
+    django.setup()
+    from django.test import Client
+
+    if job["scenario"] == "upload":
+        with open(job["csv_path"], "rb") as f:
+            job["csv"] = f.read()
+
+    # First calls pay for lazy imports (pandas IO, matplotlib); keep them out of the stats
+    warm_client = Client()
+    for _ in range(job["warmup"]):
+        _request(warm_client, job["scenario"], job)
+
+    rss_start = _peak_rss_mb()
+    latencies, errors = [], []
+    lock = threading.Lock()
+    remaining = iter(range(job["requests"]))
+
+    def client_loop():
+        client = Client()
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            start = time.perf_counter()
+            try:
+                _request(client, job["scenario"], job)
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            except Exception as exc:
+                with lock:
+                    errors.append(str(exc))
+
+    with mock.patch("api.services.ai_service.generate_chemical_insights", return_value=STUB_INSIGHT):
+        started = time.perf_counter()
+        threads = [threading.Thread(target=client_loop) for _ in range(job["concurrency"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+    return {
+        "latencies": latencies,
+        "errors": errors[:5],
+        "error_count": len(errors),
+        "wall_seconds": wall,
+        "rss_start_mb": rss_start,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def seed_worker(job):
+    """Upload the comparison datasets through the API and return their ids"""
+    import django
+    from unittest import mock
+
+    django.setup()
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.test import Client
+
+    ids = []
+    with mock.patch("api.services.ai_service.generate_chemical_insights", return_value=STUB_INSIGHT):
+        for path in job["csv_paths"]:
+            with open(path, "rb") as f:
+                response = Client().post("/api/upload/", {"file": SimpleUploadedFile("seed.csv", f.read())})
+            if response.status_code != 200:
+                raise RuntimeError(f"Seeding failed: {response.content[:200]!r}")
+            ids.append(response.json()["dataset_id"])
+    return {"ids": ids}
+
+
+# --- orchestration --------------------------------------------------------
+
+def spawn(env, mode, job):
+    """Run a worker in a fresh interpreter and return its JSON result"""
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), f"--{mode}", json.dumps(job)],
+        cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarise(raw, requests):
+    ms = np.asarray(raw["latencies"]) * 1000
+    result = {
+        "requests": requests,
+        "errors": raw["error_count"],
+        "throughput_rps": round(len(ms) / raw["wall_seconds"], 2) if raw["wall_seconds"] else None,
+        "peak_rss_mb": raw["peak_rss_mb"],
+        "rss_growth_mb": round(raw["peak_rss_mb"] - raw["rss_start_mb"], 1),
+    }
+    if ms.size:
+        result.update({
+            "p50_ms": round(float(np.percentile(ms, 50)), 1),
+            "p95_ms": round(float(np.percentile(ms, 95)), 1),
+            "p99_ms": round(float(np.percentile(ms, 99)), 1),
+        })
+    if raw["errors"]:
+        result["sample_errors"] = raw["errors"]
+    return result
+
+
+def run_size(rows, args):
+    workdir = tempfile.mkdtemp(prefix=f"load-suite-{rows}-")
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE="equipment_visualizer.settings",
+        PYTHONPATH=BACKEND_DIR,
+        SQLITE_PATH=os.path.join(workdir, "bench.sqlite3"),
+        MEDIA_ROOT=os.path.join(workdir, "media"),
+        CSV_MAX_ROWS=str(max(rows, 1)),
+        CSV_MAX_FILE_SIZE_MB=str(1024),
+    )
+    env.pop("GEMINI_API_KEY", None)
+
+    try:
+        subprocess.run([sys.executable, "manage.py", "migrate", "-v", "0"], cwd=BACKEND_DIR, env=env, check=True)
+        csv_paths = [
+            write_csv(os.path.join(workdir, f"plant_{seed}.csv"), rows, seed=seed, mix=args.mix) for seed in (0, 1)
+        ]
+        ids = spawn(env, "seed", {"csv_paths": csv_paths})["ids"]
+
+        results = {}
+        for scenario in args.scenarios:
+            job = {
+                "scenario": scenario, "requests": args.requests, "warmup": args.warmup,
+                "concurrency": args.concurrency, "ids": ids, "csv_path": csv_paths[0],
+            }
+            results[scenario] = summarise(spawn(env, "worker", job), args.requests)
+            print(f"  {rows:>9} rows  {scenario:<8} {json.dumps(results[scenario])}", file=sys.stderr)
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare_to_baseline(results, baseline):
+    """Relative change of p95 latency, throughput and peak RSS vs a previous run"""
+    print(f"\n{'rows':>9} {'scenario':<9} {'p95':>9} {'throughput':>11} {'peak RSS':>9}", file=sys.stderr)
+    for rows, scenarios in results["sizes"].items():
+        for scenario, current in scenarios.items():
+            previous = baseline.get("sizes", {}).get(rows, {}).get(scenario)
+            if not previous:
+                continue
+
+            def change(key):
+                if current.get(key) is None or not previous.get(key):
+                    return "n/a"
+                return f"{(current[key] - previous[key]) / previous[key] * 100:+.1f}%"
+
+            print(
+                f"{rows:>9} {scenario:<9} {change('p95_ms'):>9} {change('throughput_rps'):>11} "
+                f"{change('peak_rss_mb'):>9}",
+                file=sys.stderr,
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=10, help="requests per scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured requests before each scenario")
+    parser.add_argument("--concurrency", type=int, default=1, help="client threads per scenario")
+    parser.add_argument("--mix", type=parse_mix, default=None, help="equipment type mix, e.g. Pump=0.6,Valve=0.4")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--seed", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(json.loads(args.worker))))
+        return
+    if args.seed:
+        print(json.dumps(seed_worker(json.loads(args.seed))))
+        return
+
+    results = {
+        "config": {
+            "rows": args.rows, "scenarios": args.scenarios, "requests": args.requests,
+            "warmup": args.warmup, "concurrency": args.concurrency, "mix": args.mix,
+        },
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "sizes": {},
+    }
+    for rows in args.rows:
+        results["sizes"][str(rows)] = run_size(rows, args)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare_to_baseline(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Micro-benchmarks for the analytics hot paths with regression gates.
+
+Times analyze_csv, validate_csv_file, calculate_comparison_stats,
+compare_datasets, the row diff (diff_datasets) and ReportGenerator.generate
+on generated data of several sizes, and measures each call's peak traced
+allocation with tracemalloc
+(in a separate, untimed run). Results are compared against the committed
+baseline (benchmarks/baselines/micro.json). The script exits non-zero if any
+case is slower than its baseline by more than --time-threshold, or allocates
+more than --memory-threshold.
+
+Times differ from machine to machine, so each run also times a fixed calibration
+workload. Baseline times are scaled by the ratio before being compared, and
+the gate uses the best of --repeat calls, which is less noisy than the median.
+
+Usage (from backend/):
+    python benchmarks/micro.py [--rows 1000 10000 50000] [--cases analyze_csv report] [--repeat 7]
+    python benchmarks/micro.py --update-baseline      # after an intended change
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "equipment_visualizer.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.files.uploadedfile import SimpleUploadedFile  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from api.comparison import compare_datasets, dataset_source, diff_datasets  # noqa: E402
+from api.comparison_stats import calculate_comparison_stats  # noqa: E402
+from api.reports import generate_pdf_report  # noqa: E402
+from api.utils import analyze_csv  # noqa: E402
+from api.validators.csv_validator import validate_csv_file  # noqa: E402
+from benchmarks.datagen import write_csv  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "micro.json")
+CASES = ["analyze_csv", "validate_csv_file", "calculate_comparison_stats", "compare_datasets", "row_diff", "report"]
+# Differences below this are timer noise whatever the percentage
+TIME_NOISE_FLOOR_MS = 2.0
+
+
+def calibrate(rounds=7):
+    """Median seconds for a fixed pandas + pure-Python workload shaped like the hot paths"""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"Type": rng.choice(list("ABCDEF"), 100_000), "Value": rng.normal(size=100_000)})
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        df.groupby("Type")["Value"].describe()
+        df.sort_values("Value").to_dict(orient="records")
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def bench_source(path, pk):
+    """Task input for a dataset, built from a stand-in for UploadedDataset"""
+    return dataset_source(SimpleNamespace(
+        id=pk, original_filename=os.path.basename(path), file=SimpleNamespace(path=path), summary=analyze_csv(path)
+    ), summary=True)
+
+
+def build_cases(workdir, rows):
+    path_a = write_csv(os.path.join(workdir, f"a_{rows}.csv"), rows, seed=0)
+    path_b = write_csv(os.path.join(workdir, f"b_{rows}.csv"), rows, seed=1)
+    with open(path_a, "rb") as f:
+        upload = SimpleUploadedFile("plant.csv", f.read(), content_type="text/csv")
+    dataset_a, dataset_b = bench_source(path_a, 1), bench_source(path_b, 2)
+
+    return {
+        "analyze_csv": lambda: analyze_csv(path_a),
+        "validate_csv_file": lambda: validate_csv_file(upload),
+        "calculate_comparison_stats": lambda: calculate_comparison_stats(dataset_a, dataset_b),
+        "compare_datasets": lambda: compare_datasets(dataset_a, dataset_b),
+        "row_diff": lambda: diff_datasets(dataset_a, dataset_b, section="changed", sort="change",
+                                          offset=0, limit=100, k=10),
+        "report": lambda: generate_pdf_report(dataset_a["summary"], dataset_a["filename"]),
+    }
+
+
+def measure(fn, repeat):
+    fn()  # warm-up: lazy imports, font caches
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(times), 2),
+        "min_ms": round(min(times), 2),
+        "peak_alloc_kb": round(peak / 1024, 1),
+    }
+
+
+def find_regressions(results, baseline, time_threshold, memory_threshold):
+    """Human-readable regressions of results against baseline"""
+    scale = results["calibration_s"] / baseline["calibration_s"]
+    regressions = []
+    for key, current in results["cases"].items():
+        previous = baseline["cases"].get(key)
+        if not previous:
+            continue
+        # Best-of-N is far less sensitive to scheduler noise than the median
+        expected_ms = previous["min_ms"] * scale
+        if (current["min_ms"] > expected_ms * (1 + time_threshold)
+                and current["min_ms"] - expected_ms > TIME_NOISE_FLOOR_MS):
+            regressions.append(
+                f"{key}: {current['min_ms']:.1f} ms vs {expected_ms:.1f} ms expected "
+                f"(+{(current['min_ms'] / expected_ms - 1) * 100:.0f}%)"
+            )
+        if current["peak_alloc_kb"] > previous["peak_alloc_kb"] * (1 + memory_threshold):
+            regressions.append(
+                f"{key}: peak allocation {current['peak_alloc_kb']:.0f} KB vs {previous['peak_alloc_kb']:.0f} KB "
+                f"(+{(current['peak_alloc_kb'] / previous['peak_alloc_kb'] - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--repeat", type=int, default=7, help="timed calls per case")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--time-threshold", type=float, default=0.30, help="allowed slowdown, 0.30 = 30%%")
+    parser.add_argument("--memory-threshold", type=float, default=0.10, help="allowed allocation growth")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--output", help="also write results as JSON to this path")
+    args = parser.parse_args()
+
+    calibration = [calibrate()]
+    results = {"calibration_s": None, "cases": {}}
+    print(f"{'case':<40} {'median (ms)':>12} {'min (ms)':>10} {'peak alloc (KB)':>16}")
+    with tempfile.TemporaryDirectory(prefix="micro-bench-") as workdir, \
+            override_settings(CSV_MAX_ROWS=max(args.rows), CSV_MAX_FILE_SIZE_MB=1024):
+        for rows in args.rows:
+            cases = build_cases(workdir, rows)
+            for name in args.cases:
+                key = f"{name}[{rows}]"
+                results["cases"][key] = measure(cases[name], args.repeat)
+                r = results["cases"][key]
+                print(f"{key:<40} {r['median_ms']:>12.2f} {r['min_ms']:>10.2f} {r['peak_alloc_kb']:>16.1f}")
+    calibration.append(calibrate())
+    results["calibration_s"] = round(statistics.mean(calibration), 5)
+
+    text = json.dumps(results, indent=2) + "\n"
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            f.write(text)
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = find_regressions(results, baseline, args.time_threshold, args.memory_threshold)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions against {os.path.relpath(args.baseline, BACKEND_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Load benchmark: sync gunicorn (WSGI) vs uvicorn with async views (ASGI).
+
+Seeds a throwaway SQLite database and media directory with synthetic
+datasets, starts each server mode in turn and drives it with a mixed workload
+(summary / history / compare) from concurrent clients. Reports latency
+percentiles, throughput and error counts per mode and endpoint.
+
+Usage (from backend/):
+    python benchmarks/server_modes.py [--workers 2] [--concurrency 32] [--duration 20]
+                                      [--rows 5000] [--datasets 8] [--output results.json]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# endpoint -> share of requests
+MIX = {"summary": 0.5, "history": 0.3, "compare": 0.2}
+
+
+def seed(env, datasets, rows):
+    """Migrate the throwaway database and upload synthetic datasets into it"""
+    subprocess.run([sys.executable, "manage.py", "migrate", "-v", "0"], cwd=BACKEND_DIR, env=env, check=True)
+    script = f"""
+import django
+django.setup()
+from django.core.files.base import ContentFile
+from api.models import UploadedDataset
+from api.utils import analyze_csv
+from benchmarks.datagen import synthetic_frame
+for i in range({datasets}):
+    csv = synthetic_frame({rows}, seed=i).to_csv(index=False).encode()
+    dataset = UploadedDataset.objects.create(file=ContentFile(csv, name=f"bench_{{i}}.csv"), summary={{}})
+    dataset.summary = analyze_csv(dataset.file.path)
+    dataset.save()
+print(",".join(str(pk) for pk in UploadedDataset.objects.values_list("id", flat=True)))
+"""
+    out = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True
+    )
+    return [int(pk) for pk in out.stdout.strip().split(",")]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_command(mode, port, workers):
+    if mode == "wsgi":
+        return ["gunicorn", "equipment_visualizer.wsgi:application", "--bind", f"127.0.0.1:{port}",
+                "--workers", str(workers), "--log-level", "warning"]
+    return ["uvicorn", "equipment_visualizer.asgi:application", "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log"]
+
+
+def wait_until_ready(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"{base_url}/api/history/", timeout=5).read()
+            return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start within {timeout}s")
+
+
+def endpoint_url(base_url, endpoint, ids, rng):
+    if endpoint == "summary":
+        return f"{base_url}/api/summary/{rng.choice(ids)}/"
+    if endpoint == "history":
+        return f"{base_url}/api/history/?limit=20"
+    a, b = rng.sample(ids, 2)
+    return f"{base_url}/api/compare/?dataset_a={a}&dataset_b={b}"
+
+
+def drive(base_url, ids, concurrency, duration):
+    """Closed-loop clients issuing the MIX for `duration` seconds"""
+    samples = {endpoint: [] for endpoint in MIX}
+    errors = {endpoint: 0 for endpoint in MIX}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(index):
+        rng = random.Random(index)
+        endpoints, weights = list(MIX), list(MIX.values())
+        while time.monotonic() < stop_at:
+            endpoint = rng.choices(endpoints, weights)[0]
+            start = time.perf_counter()
+            try:
+                urllib.request.urlopen(endpoint_url(base_url, endpoint, ids, rng), timeout=60).read()
+                ok = True
+            except (urllib.error.URLError, OSError):
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    samples[endpoint].append(elapsed)
+                else:
+                    errors[endpoint] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, errors
+
+
+def report(samples, errors, duration):
+    def stats(values):
+        if not values:
+            return {"requests": 0}
+        ms = np.asarray(values) * 1000
+        return {
+            "requests": len(values),
+            "p50_ms": round(float(np.percentile(ms, 50)), 1),
+            "p95_ms": round(float(np.percentile(ms, 95)), 1),
+            "p99_ms": round(float(np.percentile(ms, 99)), 1),
+        }
+
+    everything = [value for values in samples.values() for value in values]
+    return {
+        "throughput_rps": round(len(everything) / duration, 1),
+        "errors": sum(errors.values()),
+        "overall": stats(everything),
+        "endpoints": {endpoint: {**stats(values), "errors": errors[endpoint]} for endpoint, values in samples.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--rows", type=int, default=5000, help="rows per seeded dataset")
+    parser.add_argument("--datasets", type=int, default=8)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="server-modes-")
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE="equipment_visualizer.settings",
+        SQLITE_PATH=os.path.join(workdir, "bench.sqlite3"),
+        MEDIA_ROOT=os.path.join(workdir, "media"),
+        PYTHONPATH=BACKEND_DIR,
+    )
+    env.pop("GEMINI_API_KEY", None)
+
+    results = {"config": vars(args), "modes": {}}
+    try:
+        ids = seed(env, args.datasets, args.rows)
+        for mode in ("wsgi", "asgi"):
+            port = free_port()
+            mode_env = dict(env, ASYNC_VIEWS="True" if mode == "asgi" else "False")
+            server = subprocess.Popen(server_command(mode, port, args.workers), cwd=BACKEND_DIR, env=mode_env)
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                wait_until_ready(base_url)
+                samples, errors = drive(base_url, ids, args.concurrency, args.duration)
+                results["modes"][mode] = report(samples, errors, args.duration)
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.RequestMetricsMiddleware',  # first, so timings cover the whole stack
+    'api.tracing.TracingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware', # Add whitenoise
     'corsheaders.middleware.CorsMiddleware',
@@ -75,7 +77,7 @@ WSGI_APPLICATION = 'equipment_visualizer.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
     }
 }
 
@@ -108,7 +110,71 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 # Media files (Uploads)
 MEDIA_URL = 'media/'
-MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', BASE_DIR / 'media')
+
+
+def _optional_int(name, default=None):
+    value = os.environ.get(name, '')
+    return int(value) if value.strip() else default
+
+
+# Dataset retention defaults (0 = unlimited). Enforced in batch by
+# `python manage.py enforce_retention`; per-user/group overrides live in RetentionPolicy.
+DATASET_RETENTION = {
+    'MAX_DATASETS': _optional_int('RETENTION_MAX_DATASETS', 500),
+    'MAX_AGE_DAYS': _optional_int('RETENTION_MAX_AGE_DAYS', 180),
+    'MAX_BYTES': _optional_int('RETENTION_MAX_BYTES', 0),
+}
+
+# Serve summary/history/compare with async views. Enable when running the ASGI
+# app under uvicorn; keep False for the sync gunicorn deployment.
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'False') == 'True'
+
+# Server-sent events (/api/events/, see api/events.py). Each open stream holds a
+# connection for minutes, which would pin a gunicorn sync worker, so the stream
+# is only served under ASGI unless EVENT_STREAM_ENABLED says otherwise. Clients
+# check the "events" capability of /api/ before connecting.
+EVENT_STREAM = {
+    'ENABLED': os.environ.get('EVENT_STREAM_ENABLED', str(ASYNC_VIEWS)) == 'True',
+}
+
+# Worker pool for CSV analysis, comparisons and PDF rendering (see api/executor.py).
+# BACKEND is thread | process | inline; MAX_WORKERS defaults to the CPU count.
+TASK_EXECUTOR = {
+    'BACKEND': os.environ.get('TASK_EXECUTOR_BACKEND', 'thread'),
+    'MAX_WORKERS': _optional_int('TASK_EXECUTOR_WORKERS'),
+    'MAX_QUEUE': _optional_int('TASK_EXECUTOR_QUEUE', 32),
+    'SUBMIT_TIMEOUT': float(os.environ.get('TASK_EXECUTOR_SUBMIT_TIMEOUT', '5')),
+}
+
+# Upload limits (defaults in api/validators/csv_validator.py: 20,000 rows, 10 MB)
+CSV_MAX_ROWS = _optional_int('CSV_MAX_ROWS')
+CSV_MAX_FILE_SIZE_MB = _optional_int('CSV_MAX_FILE_SIZE_MB')
+
+# Appends only re-score existing rows when a mean a risk rule compares against
+# moves by more than this fraction (see analytics/risk.py).
+RISK_RESCAN_TOLERANCE = float(os.environ.get('RISK_RESCAN_TOLERANCE', '0.01'))
+
+# Request metrics on /metrics (see api/metrics.py). Set METRICS_TOKEN to require
+# "Authorization: Bearer <token>" from the scraper; without one /metrics is only
+# served when DEBUG is on.
+METRICS = {
+    'ENABLED': os.environ.get('METRICS_ENABLED', 'True') == 'True',
+    'SLOW_REQUEST_MS': _optional_int('SLOW_REQUEST_MS', 1000),
+    'TOKEN': os.environ.get('METRICS_TOKEN') or None,
+}
+
+# Request tracing (see api/tracing.py). EXPORTER is none | memory | file; with
+# DEBUG_HEADER responses carry X-Trace-Id and Server-Timing span timings.
+TRACING = {
+    'EXPORTER': os.environ.get('TRACING_EXPORTER', 'none'),
+    'FILE_PATH': os.environ.get('TRACING_FILE', str(BASE_DIR / 'traces.jsonl')),
+    'DEBUG_HEADER': os.environ.get('TRACING_DEBUG_HEADER', str(DEBUG)) == 'True',
+}
+
+# /api/history/ page size (override with ?limit=, capped at HISTORY_MAX_LIMIT)
+HISTORY_DEFAULT_LIMIT = 5
+HISTORY_MAX_LIMIT = 500
 
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = os.environ.get('CORS_ALLOW_ALL_ORIGINS', 'True') == 'True'
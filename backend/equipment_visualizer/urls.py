@@ -5,6 +5,7 @@ URL configuration for equipment_visualizer project.
 from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
+from api.metrics import metrics_view
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -15,6 +16,7 @@ def health_check(request):
 
 urlpatterns = [
     path('', health_check, name='health_check'),
+    path('metrics', metrics_view, name='metrics'),
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
@@ -1,4 +1,5 @@
 """API package for backend communication"""
 from .client import APIClient
+from .local import LocalAnalyzer
 
-__all__ = ['APIClient']
+__all__ = ['APIClient', 'LocalAnalyzer']
@@ -0,0 +1,106 @@
+"""
+Persistent response cache for the desktop client.
+
+Responses are stored in one SQLite file in the user cache directory together
+with their ETag. Entries are evicted least-recently-used once the file holds
+more than max_bytes of bodies. APIClient revalidates entries with
+If-None-Match, so an unchanged summary or report costs a 304 instead of a
+download, and serves them as-is when the backend cannot be reached.
+"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Optional, Tuple
+
+APP_DIR_NAME = "ChemicalEquipmentVisualizer"
+
+
+def default_cache_dir() -> str:
+    """Per-user cache directory of the platform (%LOCALAPPDATA%, ~/Library/Caches, $XDG_CACHE_HOME)"""
+    if sys.platform == "win32":
+        root = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        root = os.path.expanduser("~/Library/Caches")
+    else:
+        root = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(root, APP_DIR_NAME)
+
+
+class ResponseCache:
+    """Size-bounded LRU of response bodies keyed by URL, safe to share between worker threads"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Args:
+            directory: Directory holding responses.sqlite (created if missing)
+            max_bytes: Total body size kept before least recently used entries are evicted
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "responses.sqlite")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # WAL lets the login and main window clients share the file
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, etag TEXT, body BLOB NOT NULL,"
+            " size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def get(self, key: str) -> Optional[Tuple[Optional[str], bytes]]:
+        """(etag, body) of a cached response, marking it recently used; None if not cached"""
+        with self._lock:
+            row = self._db.execute("SELECT etag, body FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+        return row
+
+    def put(self, key: str, etag: Optional[str], body: bytes):
+        """Store a response, then evict least recently used entries beyond max_bytes"""
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, etag, body, size, accessed) VALUES (?, ?, ?, ?, ?)",
+                    (key, etag, body, len(body), time.time()),
+                )
+                self._evict()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            stale.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        self._db.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def size(self) -> int:
+        """Total cached body size in bytes"""
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
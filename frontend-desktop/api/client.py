@@ -2,24 +2,175 @@
 API Client for Chemical Equipment Visualizer Desktop App
 Handles all communication with the Django backend
 """
+import base64
+import hashlib
+import json
 import os
+import socket
+import sqlite3
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, Dict, List, Any
 
+from .cache import ResponseCache, default_cache_dir
+
+# Only these are retried after the request was sent; connection failures are retried for any method
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+RETRY_STATUSES = (429, 502, 503, 504)
+# After a failed connection, cached responses are served without retrying the network for this long
+OFFLINE_RECHECK_SECONDS = 30
+
 
 class APIClient:
     """Client for interacting with the backend API"""
     
-    def __init__(self, base_url: str = "http://localhost:8000/api"):
+    def __init__(self, base_url: str = "http://localhost:8000/api", retries: int = 3,
+                 backoff_factor: float = 0.5, pool_size: int = 10,
+                 cache_dir: Optional[str] = None, cache_max_mb: int = 0):
         """
         Initialize API client
         
         Args:
             base_url: Base URL for the API (default: http://localhost:8000/api)
+            retries: Retries for failed connections and idempotent calls (0 disables)
+            backoff_factor: Retry delays grow as backoff_factor * 2^n seconds
+            pool_size: Kept-alive connections per host (covers concurrent worker threads)
+            cache_dir: Directory of the on-disk response cache (default: the user cache directory)
+            cache_max_mb: Size bound of the response cache; 0 disables it
         """
         self.base_url = base_url
         self.timeout = 30  # 30 seconds timeout
         self.token = self._load_token()
+        self.session = self._create_session(retries, backoff_factor, pool_size)
+        self.cache = self._open_cache(cache_dir, cache_max_mb)
+        self._offline_until = 0.0
+        self.events_available = False  # Whether the backend serves /events/ (set by check_connection)
+
+    @staticmethod
+    def _create_session(retries: int, backoff_factor: float, pool_size: int) -> requests.Session:
+        """
+        Shared session: connections (and TLS sessions) are kept alive and reused
+        across calls instead of a fresh handshake per request
+        """
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'})
+        return session
+
+    @staticmethod
+    def _open_cache(cache_dir: Optional[str], cache_max_mb: int) -> Optional[ResponseCache]:
+        if cache_max_mb <= 0:
+            return None
+        try:
+            return ResponseCache(cache_dir or default_cache_dir(), cache_max_mb * 1024 * 1024)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Response cache disabled: {e}")
+            return None
+
+    def warm_up(self):
+        """Open a pooled connection in the background so the first real call skips the handshake"""
+        threading.Thread(target=self.check_connection, daemon=True).start()
+
+    def close(self):
+        """Close pooled connections and the response cache"""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def is_offline(self) -> bool:
+        """True shortly after the backend could not be reached"""
+        return time.monotonic() < self._offline_until
+
+    def _set_offline(self, offline: bool):
+        self._offline_until = time.monotonic() + OFFLINE_RECHECK_SECONDS if offline else 0.0
+
+    def _cache_key(self, url: str) -> str:
+        """History and dataset visibility differ per user, so keys carry the token's user id"""
+        if not self.token:
+            return f"anonymous|{url}"
+        try:
+            payload = self.token.split('.')[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+            owner = f"user:{claims['user_id']}"
+        except (IndexError, KeyError, ValueError):
+            owner = f"token:{hashlib.sha256(self.token.encode()).hexdigest()[:16]}"
+        return f"{owner}|{url}"
+
+    def _cached_get(self, url: str) -> bytes:
+        """
+        GET a response body through the response cache. Cached entries are revalidated
+        with If-None-Match (a 304 reuses the stored body) and served as-is while the
+        backend is unreachable; entries without an ETag are only an offline fallback.
+        """
+        if self.cache is None:
+            response = self.session.get(url, headers=self._get_headers(), timeout=self.timeout)
+            response.raise_for_status()
+            return response.content
+
+        key = self._cache_key(url)
+        entry = self.cache.get(key)
+        if entry is not None and self.is_offline():
+            return entry[1]
+
+        headers = self._get_headers()
+        if entry is not None and entry[0]:
+            headers['If-None-Match'] = entry[0]
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            self._set_offline(True)
+            if entry is None:
+                raise
+            return entry[1]
+        self._set_offline(False)
+
+        if entry is not None and (response.status_code == 304 or response.status_code >= 500):
+            return entry[1]
+        response.raise_for_status()
+        self.cache.put(key, response.headers.get('ETag'), response.content)
+        return response.content
+
+    def _cached_body(self, url: str) -> Optional[bytes]:
+        entry = self.cache.get(self._cache_key(url)) if self.cache is not None else None
+        return entry[1] if entry is not None else None
+
+    def cached_summary(self, dataset_id: int) -> Optional[Dict[str, Any]]:
+        """Summary from the response cache without any network call, or None"""
+        body = self._cached_body(f"{self.base_url}/summary/{dataset_id}/")
+        return json.loads(body) if body is not None else None
+
+    def prefetch_summary(self, dataset_id: int) -> bool:
+        """
+        Fetch a summary into the response cache without parsing it, unless it is
+        already cached (selecting it revalidates it then)
+
+        Returns:
+            bool: True if the summary was downloaded
+        """
+        if self.cache is None:
+            return False
+        url = f"{self.base_url}/summary/{dataset_id}/"
+        if self._cached_body(url) is not None:
+            return False
+        self._cached_get(url)
+        return True
+
+    def has_cached_history(self) -> bool:
+        """Whether the history list can be shown offline"""
+        return self._cached_body(f"{self.base_url}/history/") is not None
 
     def _load_token(self) -> Optional[str]:
         """Load token from local file"""
@@ -51,7 +202,7 @@ class APIClient:
         """Login to get JWT token"""
         url = f"{self.base_url}/token/"
         try:
-            response = requests.post(url, data={'username': username, 'password': password}, timeout=self.timeout)
+            response = self.session.post(url, data={'username': username, 'password': password}, timeout=self.timeout)
             response.raise_for_status()
             data = response.json()
             self.save_token(data['access'])
@@ -65,7 +216,7 @@ class APIClient:
         """Register a new user"""
         url = f"{self.base_url}/register/"
         try:
-            response = requests.post(url, data={'username': username, 'email': email, 'password': password}, timeout=self.timeout)
+            response = self.session.post(url, data={'username': username, 'email': email, 'password': password}, timeout=self.timeout)
             response.raise_for_status()
             return True
         except Exception as e:
@@ -101,7 +252,7 @@ class APIClient:
             with open(file_path, 'rb') as f:
                 filename = os.path.basename(file_path)
                 files = {'file': (filename, f)}
-                response = requests.post(url, files=files, headers=self._get_headers(), timeout=self.timeout)
+                response = self.session.post(url, files=files, headers=self._get_headers(), timeout=self.timeout)
                 response.raise_for_status()
                 return response.json()
         except requests.exceptions.RequestException as e:
@@ -131,9 +282,7 @@ class APIClient:
         url = f"{self.base_url}/summary/{dataset_id}/"
         
         try:
-            response = requests.get(url, headers=self._get_headers(), timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
+            return json.loads(self._cached_get(url))
         except requests.exceptions.RequestException as e:
             if hasattr(e, 'response') and e.response is not None:
                 if e.response.status_code == 401:
@@ -158,9 +307,7 @@ class APIClient:
         url = f"{self.base_url}/history/"
         
         try:
-            response = requests.get(url, headers=self._get_headers(), timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
+            return json.loads(self._cached_get(url))
         except requests.exceptions.RequestException as e:
             if hasattr(e, 'response') and e.response is not None:
                 if e.response.status_code == 401:
@@ -172,44 +319,126 @@ class APIClient:
                     raise Exception(f"Failed to fetch history: {str(e)}")
             raise Exception(f"Failed to fetch history: {str(e)}")
     
+    def open_event_stream(self, last_event_id: Optional[int] = None) -> requests.Response:
+        """
+        Open the server-sent event stream (/events/)
+        
+        Args:
+            last_event_id: Id of the last event seen, so missed events are replayed
+            
+        Returns:
+            requests.Response: Streaming response; read it with iter_events()
+        """
+        headers = self._get_headers()
+        headers['Accept'] = 'text/event-stream'
+        if last_event_id is not None:
+            headers['Last-Event-ID'] = str(last_event_id)
+        # The server sends a keepalive every 15 seconds, so a 60 second read timeout means the link is dead
+        response = self.session.get(f"{self.base_url}/events/", headers=headers, stream=True, timeout=(5, 60))
+        response.raise_for_status()
+        response.encoding = 'utf-8'
+        return response
+
+    @staticmethod
+    def close_event_stream(response: requests.Response):
+        """
+        Close an event stream from another thread. The reading thread holds the
+        response's buffer lock while it waits for data, so response.close() alone
+        would block until the next keepalive; shutting the socket down first makes
+        that read return at once.
+        """
+        try:
+            sock = socket.fromfd(response.raw.fileno(), socket.AF_INET, socket.SOCK_STREAM)
+        except (OSError, ValueError, AttributeError):
+            sock = None  # Already closed
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            finally:
+                sock.close()  # Only the duplicate descriptor
+        response.close()
+
+    @staticmethod
+    def iter_events(response: requests.Response):
+        """
+        Parse a server-sent event stream
+        
+        Yields:
+            tuple: (event name, decoded data, event id)
+        """
+        event, data, event_id = None, [], None
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                if event and data:
+                    yield event, json.loads("\n".join(data)), event_id
+                event, data = None, []
+            elif not line.startswith(':'):
+                field, _, value = line.partition(':')
+                value = value[1:] if value.startswith(' ') else value
+                if field == 'event':
+                    event = value
+                elif field == 'data':
+                    data.append(value)
+                elif field == 'id':
+                    event_id = int(value)
+
     def check_connection(self) -> bool:
         """
         Check if backend is accessible
         
+        Also records whether the backend serves the event stream (events_available).
+        
         Returns:
             bool: True if backend is accessible, False otherwise
         """
         try:
             url = f"{self.base_url}/"  # This is usually allowed, but if not, 401 means server is up
-            response = requests.get(url, timeout=5)
+            response = self.session.get(url, timeout=5)
             # 200 is good. 401 means it's there but protected (which counts as connected).
-            return response.status_code in [200, 401]
+            connected = response.status_code in [200, 401]
+            self.events_available = response.status_code == 200 and bool(response.json().get('events'))
         except:
-            return False
+            connected = False
+            self.events_available = False
+        self._set_offline(not connected)
+        return connected
 
     def download_report(self, dataset_id: int, save_path: str):
         """
-        Download PDF report for a dataset
+        Download PDF report for a dataset (reused from the response cache while unchanged)
         """
         url = f"{self.base_url}/report/{dataset_id}/"
         try:
-            response = requests.get(url, headers=self._get_headers(), stream=True, timeout=self.timeout)
-            response.raise_for_status()
+            body = self._cached_get(url)
             with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+                f.write(body)
         except Exception as e:
             if hasattr(e, 'response') and e.response:
                 raise Exception(f"Download failed: {e.response.text}")
             raise Exception(f"Download failed: {e}")
 
+    def compare_view(self, id_a: int, id_b: int) -> dict:
+        """
+        Compact comparison of two datasets (histograms, type bars, equipment diff)
+        through the response cache, so reopening a comparison costs a 304
+        """
+        url = f"{self.base_url}/compare/view/?dataset_a={id_a}&dataset_b={id_b}"
+        try:
+            return json.loads(self._cached_get(url))
+        except Exception as e:
+            if hasattr(e, 'response') and e.response is not None:
+                raise Exception(f"Comparison failed: {e.response.text}")
+            raise Exception(f"Comparison failed: {e}")
+
     def compare_datasets(self, id_a: int, id_b: int) -> dict:
         """
         Compare two datasets
         """
         url = f"{self.base_url}/compare/?dataset_a={id_a}&dataset_b={id_b}"
         try:
-            response = requests.get(url, headers=self._get_headers(), timeout=self.timeout)
+            response = self.session.get(url, headers=self._get_headers(), timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -0,0 +1,109 @@
+"""
+Local analysis for the desktop client.
+
+Summaries and comparison statistics are computed in-process with the
+backend's own analytics package (backend/analytics), so a CSV can be shown
+before it is uploaded, or without uploading it at all. The package and pandas
+are imported on first use, which happens on a worker thread, so they add
+nothing to startup.
+"""
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+# backend/ of this repository checkout
+DEFAULT_ANALYTICS_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+
+class LocalAnalyzer:
+    """Runs the shared analytics package on local CSV files"""
+
+    def __init__(self, analytics_path: Optional[str] = None):
+        """
+        Args:
+            analytics_path: Directory containing the analytics package (default: the repository's backend/)
+        """
+        self.analytics_path = analytics_path or DEFAULT_ANALYTICS_PATH
+        self._analytics = None
+        self._lock = threading.Lock()
+
+    def _package_init(self) -> str:
+        return os.path.join(self.analytics_path, 'analytics', '__init__.py')
+
+    @property
+    def available(self) -> bool:
+        """Whether local analysis can run, checked without importing anything"""
+        if self._analytics is not None:
+            return True
+        if importlib.util.find_spec('pandas') is None:
+            return False
+        return os.path.isfile(self._package_init()) or importlib.util.find_spec('analytics') is not None
+
+    def _load(self):
+        """The analytics package, imported once"""
+        with self._lock:
+            if self._analytics is None:
+                self._analytics = self._import()
+            return self._analytics
+
+    def _import(self):
+        if 'analytics' in sys.modules:
+            return sys.modules['analytics']
+        init = self._package_init()
+        if not os.path.isfile(init):
+            return importlib.import_module('analytics')  # Installed separately
+        # Load only this package from backend/, whose api package would clash with ours
+        spec = importlib.util.spec_from_file_location('analytics', init,
+                                                      submodule_search_locations=[os.path.dirname(init)])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['analytics'] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules['analytics']
+            raise
+        return module
+
+    def _read_csv(self, file_path: str):
+        import pandas as pd
+        df = pd.read_csv(file_path)
+        if df.empty:
+            raise ValueError("CSV file is empty.")
+        self._load().check_columns(df)
+        return df
+
+    def analyze_file(self, file_path: str) -> Dict[str, Any]:
+        """
+        Summarise a CSV file the way the backend does on upload
+
+        Returns:
+            dict: Summary shaped like GET /summary/<id>/
+
+        Raises:
+            Exception: If the file cannot be read or lacks required columns
+        """
+        try:
+            return self._load().analyze_dataframe(self._read_csv(file_path))
+        except Exception as e:
+            raise Exception(f"Local analysis failed: {str(e)}")
+
+    def compare_files(self, path_a: str, path_b: str) -> Dict[str, Any]:
+        """
+        Compare two CSV files (B relative to A)
+
+        Returns:
+            dict: Comparison shaped like GET /compare/view/ (dataset ids are None)
+
+        Raises:
+            Exception: If either file cannot be analysed
+        """
+        try:
+            result = self._load().comparison_view(self._read_csv(path_a), self._read_csv(path_b))
+        except Exception as e:
+            raise Exception(f"Local comparison failed: {str(e)}")
+        for key, path in (("dataset_a", path_a), ("dataset_b", path_b)):
+            result[key] = {"id": None, "filename": os.path.basename(path), **result[key]}
+        return result
@@ -0,0 +1,77 @@
+"""
+Per-call latency of APIClient: one-off requests (a new connection per call)
+vs the pooled keep-alive session.
+
+Usage (from frontend-desktop/):
+    python benchmarks/client_latency.py [--base-url URL] [--calls 30] [--dataset-id N] [--anonymous]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import APIClient  # noqa: E402
+from config import API_BASE_URL  # noqa: E402
+
+
+def timed_calls(call, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{label:<22} first {latencies[0]:>8.1f} ms   p50 {statistics.median(latencies):>8.1f} ms   "
+          f"p95 {p95:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=API_BASE_URL)
+    parser.add_argument("--calls", type=int, default=30)
+    parser.add_argument("--dataset-id", type=int, help="dataset for the summary calls (default: newest)")
+    parser.add_argument("--anonymous", action="store_true", help="ignore the saved token.txt")
+    args = parser.parse_args()
+
+    client = APIClient(base_url=args.base_url)
+    if args.anonymous:
+        client.token = None
+    headers = client._get_headers()
+    dataset_id = args.dataset_id
+    if dataset_id is None:
+        history = client.get_history()
+        dataset_id = history[0]["id"] if history else None
+    client.close()
+
+    endpoints = {"history": "/history/"}
+    if dataset_id is not None:
+        endpoints["summary"] = f"/summary/{dataset_id}/"
+
+    for name, path in endpoints.items():
+        url = f"{args.base_url}{path}"
+
+        def bare():
+            requests.get(url, headers=headers, timeout=30).raise_for_status()
+
+        pooled_client = APIClient(base_url=args.base_url)
+
+        def pooled():
+            pooled_client.session.get(url, headers=headers, timeout=30).raise_for_status()
+
+        report(f"{name} (new conn)", timed_calls(bare, args.calls))
+        report(f"{name} (pooled)", timed_calls(pooled, args.calls))
+        pooled_client.close()
+
+
+if __name__ == "__main__":
+    main()
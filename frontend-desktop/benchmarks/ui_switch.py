@@ -0,0 +1,84 @@
+"""
+Time a dataset switch in the dashboard widgets: ChartsContainer.update_charts
+and DataTable.set_data on generated summaries, including the repaint they
+trigger. Runs without a display via the offscreen Qt platform.
+
+Usage (from frontend-desktop/):
+    python benchmarks/ui_switch.py [--rows 1000 20000] [--switches 12]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+TYPES = ["Pump", "Valve", "Reactor", "Heat Exchanger", "Compressor"]
+
+
+def make_summary(rows, seed):
+    """Summary shaped like /api/summary/<id>/ (fields the widgets read)"""
+    rng = random.Random(seed)
+    types = TYPES[:2 + seed % 4]
+    table = [{
+        "Equipment Name": f"Eq-{i}",
+        "Type": rng.choice(types),
+        "Flowrate": rng.gauss(120, 15),
+        "Pressure": rng.gauss(6, 1),
+        "Temperature": rng.gauss(110, 10),
+    } for i in range(rows)]
+    distribution = {}
+    for row in table:
+        distribution[row["Type"]] = distribution.get(row["Type"], 0) + 1
+    return {
+        "total_equipment": rows,
+        "averages": {key.lower(): statistics.fmean(row[key] for row in table)
+                     for key in ("Flowrate", "Pressure", "Temperature")},
+        "type_distribution": distribution,
+        "table": table,
+    }
+
+
+def time_switches(app, update, summaries, switches):
+    update(summaries[0])
+    app.processEvents()
+    times = []
+    for i in range(switches):
+        start = time.perf_counter()
+        update(summaries[(i + 1) % len(summaries)])
+        app.processEvents()  # Deferred draw_idle() renders and repaints
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 20_000])
+    parser.add_argument("--switches", type=int, default=12)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    from ui.widgets import ChartsContainer, DataTable
+
+    print(f"{'widget':<18} {'rows':>8} {'p50 (ms)':>10} {'max (ms)':>10}")
+    for rows in args.rows:
+        summaries = [make_summary(rows, seed) for seed in range(6)]
+        charts, table = ChartsContainer(), DataTable()
+        charts.resize(1300, 800)
+        table.resize(900, 600)
+        charts.show()
+        table.show()
+        for label, update in (("charts", charts.update_charts), ("table", lambda s: table.set_data(s["table"]))):
+            times = time_switches(app, update, summaries, args.switches)
+            print(f"{label:<18} {rows:>8} {statistics.median(times):>10.1f} {max(times):>10.1f}")
+        charts.close()
+        table.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,3 +6,25 @@ import os
 # Base URL for the API
 # To change this, set the API_BASE_URL environment variable or modify this string
 API_BASE_URL = os.environ.get("API_BASE_URL", "https://fossee-chemicalapp-production.up.railway.app/api")
+
+# Retries for dropped connections and idempotent (GET) calls; delays grow as BACKOFF * 2^n seconds
+API_RETRIES = int(os.environ.get("API_RETRIES", "3"))
+API_RETRY_BACKOFF = float(os.environ.get("API_RETRY_BACKOFF", "0.5"))
+
+# On-disk cache of summaries, reports and history (revalidated with ETags, served offline)
+# CACHE_DIR defaults to the per-user cache directory; CACHE_MAX_MB=0 disables the cache
+CACHE_DIR = os.environ.get("CACHE_DIR") or None
+CACHE_MAX_MB = int(os.environ.get("CACHE_MAX_MB", "256"))
+
+# Fetch the summaries listed in the history into the cache in the background, one at a time,
+# pausing while foreground requests are in flight (PREFETCH_SUMMARIES=0 disables it)
+PREFETCH_SUMMARIES = os.environ.get("PREFETCH_SUMMARIES", "1") != "0"
+PREFETCH_BACKOFF_MS = int(os.environ.get("PREFETCH_BACKOFF_MS", "500"))
+
+# Analyse CSV files in-process with the backend's analytics package (backend/analytics):
+#   sync - show the local result at once and upload the file in the background (default)
+#   only - never upload or contact the backend, e.g. on air-gapped plant PCs
+#   off  - upload first and show the server's summary
+LOCAL_ANALYSIS = os.environ.get("LOCAL_ANALYSIS", "sync").lower()
+# Directory holding the analytics package; defaults to backend/ of this checkout
+ANALYTICS_PATH = os.environ.get("ANALYTICS_PATH") or None
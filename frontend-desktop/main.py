@@ -3,28 +3,34 @@ Chemical Equipment Visualizer - Desktop Application
 Main entry point for the PyQt5 desktop client
 """
 import sys
+import startup_timing
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
+startup_timing.mark("import PyQt5")
 from ui import MainWindow
 from ui.auth_window import LoginWindow, SignupWindow
+startup_timing.mark("import ui")
 from api import APIClient
+startup_timing.mark("import api")
 
 
-from config import API_BASE_URL
+from config import API_BASE_URL, API_RETRIES, API_RETRY_BACKOFF, CACHE_DIR, CACHE_MAX_MB, LOCAL_ANALYSIS
 
 
 class AppController:
     """Manages application flow"""
     def __init__(self):
-        self.api_client = APIClient(base_url=API_BASE_URL)
+        self.api_client = APIClient(base_url=API_BASE_URL, retries=API_RETRIES, backoff_factor=API_RETRY_BACKOFF,
+                                    cache_dir=CACHE_DIR, cache_max_mb=CACHE_MAX_MB)
         self.login_window = None
         self.signup_window = None
         self.main_window = None
 
     def start(self):
         """Start the application"""
-        # Check if we have a valid token
-        if self.api_client.token and self.api_client.check_connection():
+        # With a saved token, open the dashboard at once; it checks the backend in the background
+        # and falls back to cached datasets when offline. Air-gapped installs need no account.
+        if self.api_client.token or LOCAL_ANALYSIS == 'only':
              self.show_main()
         else:
              self.show_login()
@@ -36,10 +42,13 @@ class AppController:
         if self.signup_window:
             self.signup_window.close()
 
+        # Connect while the user types, so the login call reuses a warm connection
+        self.api_client.warm_up()
         self.login_window = LoginWindow(self.api_client)
         self.login_window.login_success.connect(self.show_main)
         self.login_window.open_signup.connect(self.show_signup)
         self.login_window.show()
+        startup_timing.finish("login window shown")
 
     def show_signup(self):
         """Show signup window"""
@@ -61,6 +70,7 @@ class AppController:
         # But for full logout we would need a signal from MainWindow
         self.main_window.logout_requested.connect(self.handle_logout)
         self.main_window.show()
+        startup_timing.mark("main window shown")
     
     def handle_logout(self):
         """Handle logout request"""
@@ -81,10 +91,12 @@ def main():
     
     # Set application style
     app.setStyle('Fusion')
+    startup_timing.mark("QApplication created")
     
     # Init Controller
     controller = AppController()
     controller.start()
+    QTimer.singleShot(0, lambda: startup_timing.mark("event loop running"))
     
     # Run application
     sys.exit(app.exec_())
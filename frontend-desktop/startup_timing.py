@@ -0,0 +1,38 @@
+"""
+Startup timing - python main.py --startup-timing
+
+Prints how long each import group and startup phase took, measured from the
+moment main.py imports this module (before PyQt5 and the UI are imported), and
+quits once the first dataset is on screen (or the login window is shown).
+Interpreter start-up before that point is not included; for it and a
+per-module import breakdown, combine this with python -X importtime.
+"""
+import sys
+import time
+
+ENABLED = '--startup-timing' in sys.argv
+
+_start = time.perf_counter()
+_last = _start
+_finished = False
+
+
+def mark(phase: str):
+    """Record that a phase has completed"""
+    global _last
+    if not ENABLED or _finished:
+        return
+    now = time.perf_counter()
+    print(f"{(now - _start) * 1000:9.1f} ms  (+{(now - _last) * 1000:7.1f})  {phase}", file=sys.stderr, flush=True)
+    _last = now
+
+
+def finish(phase: str):
+    """Record the last phase and quit the application in timing mode"""
+    global _finished
+    if not ENABLED or _finished:
+        return
+    mark(phase)
+    _finished = True
+    from PyQt5.QtCore import QCoreApplication
+    QCoreApplication.quit()
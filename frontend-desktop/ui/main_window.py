@@ -4,41 +4,61 @@ Main Window - Primary application window
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QMessageBox, QScrollArea, QFrame, QGridLayout,
                              QInputDialog, QLineEdit)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
-from .widgets import StatCard, UploadPanel, HistoryPanel, ChartsContainer, DataTable
-from config import API_BASE_URL
-from api import APIClient
+from .widgets import StatCard, UploadPanel, HistoryPanel, DataTable
+from .tasks import TaskExecutor
+from config import (API_BASE_URL, API_RETRIES, API_RETRY_BACKOFF, CACHE_DIR, CACHE_MAX_MB,
+                    PREFETCH_SUMMARIES, PREFETCH_BACKOFF_MS, LOCAL_ANALYSIS, ANALYTICS_PATH)
+from api import APIClient, LocalAnalyzer
+import startup_timing
 
 
-class APIWorker(QThread):
-    """Worker thread for API calls to prevent UI freezing"""
+class EventStreamWorker(QThread):
+    """Listens to the backend event stream and re-emits events on the UI thread"""
     
     # Signals
-    finished = pyqtSignal(object)  # Success signal with result
-    error = pyqtSignal(str)  # Error signal with message
+    event_received = pyqtSignal(str, object)  # event name, data
+    connected = pyqtSignal(bool)
     
-    def __init__(self, func, *args, **kwargs):
-        """
-        Initialize worker
-        
-        Args:
-            func: Function to execute
-            *args: Positional arguments for function
-            **kwargs: Keyword arguments for function
-        """
+    RECONNECT_DELAY_MS = 3000
+    
+    def __init__(self, api_client):
         super().__init__()
-        self.func = func
-        self.args = args
-        self.kwargs = kwargs
+        self.api_client = api_client
+        self.last_event_id = None
+        self._running = True
+        self._response = None
     
     def run(self):
-        """Execute the function"""
-        try:
-            result = self.func(*self.args, **self.kwargs)
-            self.finished.emit(result)
-        except Exception as e:
-            self.error.emit(str(e))
+        """Read events until stopped, reconnecting when the stream ends or drops"""
+        while self._running:
+            try:
+                self._response = self.api_client.open_event_stream(self.last_event_id)
+                self.connected.emit(True)
+                for event, data, event_id in self.api_client.iter_events(self._response):
+                    if event_id is not None:
+                        self.last_event_id = event_id
+                    self.event_received.emit(event, data)
+            except Exception:
+                pass
+            finally:
+                self._response = None
+            self.connected.emit(False)
+            
+            # Back off before reconnecting, but stay responsive to stop()
+            for _ in range(self.RECONNECT_DELAY_MS // 100):
+                if not self._running:
+                    return
+                self.msleep(100)
+    
+    def stop(self):
+        """Stop listening; closing the stream unblocks the read"""
+        self._running = False
+        response = self._response
+        if response is not None:
+            self.api_client.close_event_stream(response)
+
 
 class MainWindow(QMainWindow):
     """Main application window"""
@@ -49,19 +69,46 @@ class MainWindow(QMainWindow):
     def __init__(self):
         """Initialize main window"""
         super().__init__()
-        self.api_client = APIClient(base_url=API_BASE_URL)
+        self.api_client = APIClient(base_url=API_BASE_URL, retries=API_RETRIES, backoff_factor=API_RETRY_BACKOFF,
+                                    cache_dir=CACHE_DIR, cache_max_mb=CACHE_MAX_MB)
+        # Handshake in the background while the widgets are built
+        if LOCAL_ANALYSIS != 'only':
+            self.api_client.warm_up()
         self.current_summary = None
         self.current_dataset_id = None
-        self.active_workers = []  # Track active worker threads
+        # Bounded pool for API calls; keyed tasks supersede each other (latest selection wins)
+        self.tasks = TaskExecutor(parent=self)
+
+        # Background summary prefetch (see _start_prefetch)
+        self._prefetch_queue = []
+        self._prefetching = False
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(PREFETCH_BACKOFF_MS)
+        self._prefetch_timer.timeout.connect(self._prefetch_next)
+        
+        # In-process analysis of uploaded files (see _handle_upload)
+        self.local_analyzer = LocalAnalyzer(ANALYTICS_PATH) if LOCAL_ANALYSIS in ('sync', 'only') else None
+        if self.local_analyzer is not None and not self.local_analyzer.available:
+            self.local_analyzer = None
+        self.local_file = None  # CSV being analysed/synced that owns the view
+        self.local_shown = False  # Whether its local summary is on screen
+        
+        # Server push (see _start_event_stream)
+        self.event_worker = None
+        self.events_connected = False
+        self.pushed_datasets = set()  # Ids whose history entry arrived over the stream
         
         # Comparison State
         self.is_compare_mode = False
         self.compare_id_a = None
         self.compare_id_b = None
         self.compare_data = None
+        self.compare_view = None  # Created by _compare_view() on first comparison
         
         self._setup_ui()
-        self._load_initial_data()
+        # Network calls start once the window is up
+        QTimer.singleShot(0, self._load_initial_data)
     
     def _setup_ui(self):
         """Setup the UI components"""
@@ -191,8 +238,18 @@ class MainWindow(QMainWindow):
 
         logout_btn.clicked.connect(self.logout_requested.emit)
 
+        # Background upload of a locally analysed file
+        self.sync_label = QLabel("")
+        self.sync_label.setStyleSheet("""
+            color: #6b7280;
+            font-size: 11px;
+            font-weight: 600;
+        """)
+        
         right_layout.addWidget(self.loading_label)
         right_layout.addSpacing(15)
+        right_layout.addWidget(self.sync_label)
+        right_layout.addSpacing(15)
 
         # Mode Toggles
         self.mode_btn = QPushButton("Compare Mode")
@@ -246,8 +303,10 @@ class MainWindow(QMainWindow):
         stats_layout.addWidget(self.stat_pressure, 0, 2)
         stats_layout.addWidget(self.stat_temperature, 0, 3)
         
-        # Charts
-        self.charts_container = ChartsContainer()
+        # Charts (created by _charts() on first use; matplotlib is the slowest import)
+        self.charts_container = None
+        self.charts_layout = QVBoxLayout()
+        self.charts_layout.setContentsMargins(0, 0, 0, 0)
         
         # Data table
         self.data_table = DataTable()
@@ -256,15 +315,17 @@ class MainWindow(QMainWindow):
         self.empty_state = self._create_empty_state()
         
         layout.addLayout(stats_layout)
-        layout.addWidget(self.charts_container)
+        layout.addLayout(self.charts_layout)
+        self.compare_layout = QVBoxLayout()
+        self.compare_layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(self.compare_layout)
         layout.addWidget(self.data_table)
         layout.addWidget(self.empty_state)
         
         # ADDED: Push everything to the top to remove gaps
         layout.addStretch()
         
-        # Initially hide charts and table
-        self.charts_container.hide()
+        # Initially hide table (charts do not exist yet)
         self.data_table.hide()
         
         container.setLayout(layout)
@@ -366,10 +427,39 @@ class MainWindow(QMainWindow):
             return True
         return False
     
+    def _charts(self):
+        """The charts container, created (and matplotlib imported) on first use"""
+        if self.charts_container is None:
+            from .widgets import ChartsContainer
+            self.charts_container = ChartsContainer()
+            self.charts_container.setHidden(self.data_table.isHidden())
+            self.charts_layout.addWidget(self.charts_container)
+            startup_timing.mark("charts created")
+        return self.charts_container
+    
+    def _compare_view(self):
+        """The compare view, created on first use"""
+        if self.compare_view is None:
+            from .widgets import CompareView
+            self.compare_view = CompareView()
+            self.compare_layout.addWidget(self.compare_view)
+        return self.compare_view
+    
     def _load_initial_data(self):
-        """Load initial data on startup"""
-        # Check backend connection
-        if not self.api_client.check_connection():
+        """Check the backend and load the history side by side, then build the charts while they run"""
+        if self._local_only():
+            startup_timing.finish("local analysis only")
+            return
+        self.tasks.submit(self.api_client.check_connection, priority=TaskExecutor.HIGH,
+                          on_result=self._on_connection_checked)
+        self._load_history()
+        # Runs on the UI thread, but overlaps the requests above instead of preceding them
+        QTimer.singleShot(0, self._charts)
+    
+    def _on_connection_checked(self, connected: bool):
+        """Start listening for events, or explain that the backend is down"""
+        startup_timing.mark("connection checked")
+        if not connected:
             QMessageBox.warning(
                 self,
                 "Backend Not Available",
@@ -378,68 +468,197 @@ class MainWindow(QMainWindow):
                 "1. Navigate to the backend directory\n"
                 "2. Run: python manage.py runserver\n\n"
                 "You can still use the app once the backend is started."
+                + ("\n\nPreviously viewed datasets are available offline." if self.api_client.has_cached_history() else "")
             )
             return
-        
-        # Load history
-        self._load_history()
+        if self.api_client.events_available:
+            # Sync deployments do not serve the stream; summaries are then fetched as before
+            self._start_event_stream()
+    
+    def _start_event_stream(self):
+        """Receive upload progress and finished datasets without re-polling the history"""
+        self.event_worker = EventStreamWorker(self.api_client)
+        self.event_worker.event_received.connect(self._on_server_event)
+        self.event_worker.connected.connect(self._on_event_stream_connected)
+        self.event_worker.start()
+    
+    def _on_event_stream_connected(self, connected: bool):
+        """Track whether pushed events can be relied on"""
+        self.events_connected = connected
+    
+    def _on_server_event(self, event: str, data: dict):
+        """Handle an event pushed by the backend"""
+        if event == 'dataset.progress':
+            self.loading_label.setText(f"⟳ Processing {data['filename']}: {data['stage']} ({data['progress']:.0%})")
+        elif event == 'dataset.ready':
+            self.pushed_datasets.add(data['dataset_id'])
+            self.history_panel.add_dataset({
+                'id': data['dataset_id'],
+                'filename': data['filename'],
+                'uploaded_at': data['uploaded_at'],
+            })
+        elif event == 'dataset.updated':
+            # Events only name the dataset: refetch the summary if it is on screen
+            dataset_id = data['dataset_id']
+            if dataset_id == self.current_dataset_id and not self.is_compare_mode:
+                self.tasks.submit(self.api_client.get_summary, dataset_id, key='dataset',
+                                  on_result=lambda summary: self._on_summary_revalidated(dataset_id, summary),
+                                  on_error=self._on_summary_error)
     
     def _load_history(self):
         """Load dataset history"""
         self._set_loading(True, "Loading history...")
         
-        worker = APIWorker(self.api_client.get_history)
-        worker.finished.connect(self._on_history_loaded)
-        worker.finished.connect(lambda: self._cleanup_worker(worker))
-        worker.error.connect(self._on_history_error)
-        worker.error.connect(lambda: self._cleanup_worker(worker))
-        worker.start()
-        
-        # Track active worker
-        self.active_workers.append(worker)
+        self.tasks.submit(self.api_client.get_history, key='history',
+                          on_result=self._on_history_loaded, on_error=self._on_history_error)
     
     def _on_history_loaded(self, history):
         """Handle history loaded"""
+        startup_timing.mark("history loaded")
         self._set_loading(False)
         self.history_panel.set_history(history)
+        if self.current_dataset_id:
+            self.history_panel.select_dataset(self.current_dataset_id)
+        if not history:
+            startup_timing.finish("nothing to show")
         
         # Auto-load latest dataset if available and no current data
         if history and not self.current_summary:
             latest_id = history[0]['id']
             self._handle_dataset_selected(latest_id)
+        self._start_prefetch(history)
+    
+    def _start_prefetch(self, history):
+        """Warm the cache with the summaries in the history so selecting one shows it at once"""
+        if not PREFETCH_SUMMARIES or self.api_client.cache is None:
+            return
+        self._prefetch_queue = [entry['id'] for entry in history if entry['id'] != self.current_dataset_id]
+        if not self._prefetching:
+            self._prefetch_next()
+    
+    def _prefetch_next(self):
+        """Prefetch one summary at low priority, waiting while the user's own requests are pending"""
+        if not self._prefetch_queue or self.api_client.is_offline():
+            self._stop_prefetch()
+            return
+        self._prefetching = True
+        if self.tasks.pending(TaskExecutor.NORMAL):
+            self._prefetch_timer.start()
+            return
+        dataset_id = self._prefetch_queue.pop(0)
+        self.tasks.submit(self.api_client.prefetch_summary, dataset_id, priority=TaskExecutor.LOW,
+                          on_result=lambda _: self._prefetch_next(), on_error=self._stop_prefetch)
+    
+    def _stop_prefetch(self, error=None):
+        """Give up on the remaining prefetches (e.g. backend unreachable); the next history load restarts them"""
+        self._prefetch_queue = []
+        self._prefetching = False
+        self._prefetch_timer.stop()
     
     def _on_history_error(self, error):
         """Handle history error"""
+        startup_timing.finish("history failed")
         self._set_loading(False)
+        if self.api_client.is_offline():
+            return  # The connection check explains it
         if "Authentication failed" in str(error):
             if self._handle_auth_error():
                 return
         self._show_message(f"Failed to load history: {error}", is_error=True)
     
+    def _local_only(self) -> bool:
+        """Air-gapped mode: files are analysed here and never uploaded"""
+        return LOCAL_ANALYSIS == 'only' and self.local_analyzer is not None
+    
     def _handle_upload(self, file_path: str):
         """Handle file upload"""
+        if self.local_analyzer is not None:
+            self._analyze_locally(file_path)
+            return
         self._set_loading(True, "Uploading file...")
         
-        worker = APIWorker(self.api_client.upload_csv, file_path)
-        worker.finished.connect(self._on_upload_success)
-        worker.finished.connect(lambda: self._cleanup_worker(worker))
-        worker.error.connect(self._on_upload_error)
-        worker.error.connect(lambda: self._cleanup_worker(worker))
-        worker.start()
-        
-        # Track active worker
-        self.active_workers.append(worker)
+        self.tasks.submit(self.api_client.upload_csv, file_path,
+                          on_result=self._on_upload_success, on_error=self._on_upload_error)
     
     def _on_upload_success(self, result):
         """Handle upload success"""
         self._set_loading(False)
         self._show_message("File uploaded and processed successfully!")
         
-        # Reload history and select new dataset
         dataset_id = result['dataset_id']
-        self._load_history()
+        if not (self.events_connected and dataset_id in self.pushed_datasets):
+            # Otherwise the history entry already arrived over the event stream
+            self._load_history()
         self._handle_dataset_selected(dataset_id)
     
+    def _analyze_locally(self, file_path: str):
+        """Show the file from an in-process analysis at once; the upload only syncs it to the server"""
+        self._set_loading(True, "Analysing file...")
+        self.local_file = file_path
+        self.local_shown = False
+        self.current_dataset_id = None
+        self.tasks.submit(self.local_analyzer.analyze_file, file_path, key='dataset', priority=TaskExecutor.HIGH,
+                          on_result=lambda summary: self._on_local_summary(file_path, summary),
+                          on_error=self._on_local_error)
+        if self._local_only():
+            return
+        self.sync_label.setText("⟳ Uploading in background...")
+        self.tasks.submit(self.api_client.upload_csv, file_path,
+                          on_result=lambda result: self._on_upload_synced(file_path, result),
+                          on_error=lambda error: self._on_sync_error(file_path, error))
+    
+    def _on_local_summary(self, file_path: str, summary):
+        """Local analysis finished"""
+        if self.local_file == file_path and not self.is_compare_mode:
+            self.local_shown = True
+            self._on_summary_loaded(summary)
+        else:
+            self._set_loading(False)
+    
+    def _on_local_error(self, error):
+        """Local analysis failed; while an upload is running, the server's verdict is shown instead"""
+        self._set_loading(False)
+        if self._local_only():
+            self._show_message(str(error), is_error=True)
+    
+    def _on_upload_synced(self, file_path: str, result):
+        """Background upload finished: link the view to the server dataset"""
+        self.sync_label.setText("")
+        dataset_id = result['dataset_id']
+        if not (self.events_connected and dataset_id in self.pushed_datasets):
+            self._load_history()
+        if self.local_file != file_path:
+            return  # Another dataset was selected meanwhile
+        self.local_file = None
+        self.current_dataset_id = dataset_id
+        self.history_panel.select_dataset(dataset_id)
+        self.tasks.submit(self.api_client.get_summary, dataset_id, key='dataset',
+                          on_result=lambda summary: self._on_synced_summary(dataset_id, summary),
+                          on_error=self._on_summary_error)
+    
+    def _on_synced_summary(self, dataset_id: int, summary):
+        """
+        Adopt the server's summary of a synced file. It matches the local one (same code)
+        plus server-only fields such as AI insights, so it is only redrawn if local analysis failed.
+        """
+        if dataset_id != self.current_dataset_id or self.is_compare_mode:
+            return
+        local = self.current_summary if self.local_shown else None
+        self.local_shown = False
+        if local is not None and all(summary.get(key) == value for key, value in local.items()):
+            self.current_summary = summary
+        else:
+            self._on_summary_loaded(summary)
+    
+    def _on_sync_error(self, file_path: str, error):
+        """Background upload failed; a locally analysed file stays on screen"""
+        self.sync_label.setText("")
+        if self.local_file == file_path and self.local_shown and "Authentication failed" not in str(error):
+            self.sync_label.setText("⚠ Not uploaded - shown from local analysis")
+            self.sync_label.setToolTip(str(error))
+            return
+        self._on_upload_error(error)
+    
     def _on_upload_error(self, error):
         """Handle upload error"""
         self._set_loading(False)
@@ -451,30 +670,40 @@ class MainWindow(QMainWindow):
     def _handle_dataset_selected(self, dataset_id: int):
         """Handle dataset selection"""
         self.current_dataset_id = dataset_id
-        self._set_loading(True, "Loading dataset...")
-        
-        worker = APIWorker(self.api_client.get_summary, dataset_id)
-        worker.finished.connect(self._on_summary_loaded)
-        worker.finished.connect(lambda: self._cleanup_worker(worker))
-        worker.error.connect(self._on_summary_error)
-        worker.error.connect(lambda: self._cleanup_worker(worker))
-        worker.start()
+        self.local_file = None
+        self.local_shown = False
+        cached = self.api_client.cached_summary(dataset_id)
+        if cached is not None:
+            # Show the cached copy at once; the fetch below only revalidates it (usually a 304)
+            self._on_summary_loaded(cached)
+            on_loaded = lambda summary: self._on_summary_revalidated(dataset_id, summary)
+        else:
+            self._set_loading(True, "Loading dataset...")
+            on_loaded = self._on_summary_loaded
         
-        # Track active worker
-        self.active_workers.append(worker)
+        # A newer selection cancels this fetch, so a slow response cannot overwrite it
+        self.tasks.submit(self.api_client.get_summary, dataset_id, key='dataset', priority=TaskExecutor.HIGH,
+                          on_result=on_loaded, on_error=self._on_summary_error)
     
     def _on_summary_loaded(self, summary):
         """Handle summary loaded"""
         self._set_loading(False)
         self.current_summary = summary
         self._update_ui_with_data(summary)
+        startup_timing.finish("first dataset drawn")
         
         # Select in history
         if self.current_dataset_id:
             self.history_panel.select_dataset(self.current_dataset_id)
     
+    def _on_summary_revalidated(self, dataset_id: int, summary):
+        """Redraw only if the dataset changed on the server since it was cached"""
+        if dataset_id == self.current_dataset_id and not self.is_compare_mode and summary != self.current_summary:
+            self._on_summary_loaded(summary)
+    
     def _on_summary_error(self, error):
         """Handle summary error"""
+        startup_timing.finish("first dataset failed")
         self._set_loading(False)
         if "Authentication failed" in str(error):
              if self._handle_auth_error():
@@ -485,7 +714,7 @@ class MainWindow(QMainWindow):
         """Update UI with summary data"""
         # Hide empty state, show data widgets
         self.empty_state.hide()
-        self.charts_container.show()
+        self._charts().show()
         self.data_table.show()
         
         # Update stat cards
@@ -495,7 +724,7 @@ class MainWindow(QMainWindow):
         self.stat_temperature.set_value(f"{data['averages']['temperature']:.2f} °C")
         
         # Update charts
-        self.charts_container.update_charts(data)
+        self._charts().update_charts(data)
         
         # Update table
         if 'table' in data:
@@ -516,13 +745,8 @@ class MainWindow(QMainWindow):
             return
 
         self._set_loading(True, "Generating PDF...")
-        worker = APIWorker(self.api_client.download_report, self.current_dataset_id, file_path)
-        worker.finished.connect(self._on_export_success)
-        worker.finished.connect(lambda: self._cleanup_worker(worker))
-        worker.error.connect(self._on_export_error)
-        worker.error.connect(lambda: self._cleanup_worker(worker))
-        worker.start()
-        self.active_workers.append(worker)
+        self.tasks.submit(self.api_client.download_report, self.current_dataset_id, file_path,
+                          on_result=self._on_export_success, on_error=self._on_export_error)
 
     def _on_export_success(self, result):
         self._set_loading(False)
@@ -538,7 +762,8 @@ class MainWindow(QMainWindow):
         if checked:
             self.mode_btn.setText("Exit Compare")
             # Clear main view
-            self.charts_container.hide()
+            if self.charts_container is not None:
+                self.charts_container.hide()
             self.data_table.hide()
             self.stat_total.set_value("Select Datasets")
             self.stat_flowrate.set_value("to Compare")
@@ -552,17 +777,26 @@ class MainWindow(QMainWindow):
             
         else:
             self.mode_btn.setText("Compare Mode")
+            self.tasks.cancel_key('compare')
+            if self.compare_view is not None:
+                self.compare_view.hide()
             # Restore single view if data exists
             if self.current_summary:
                 self._update_ui_with_data(self.current_summary)
+            else:
+                self.empty_state.show()
 
     def _prompt_comparison_selection(self):
         """Simple dialog to pick two IDs (MVP approach)"""
+        if self.local_analyzer is not None and (self._local_only() or self.api_client.is_offline()
+                                                or not self.history_panel.history_data):
+            self._prompt_local_comparison()
+            return
         if not self.history_panel.history_data:
             return
             
         history = self.history_panel.history_data
-        items = [f"{d['id']}: {d['original_filename']}" for d in history]
+        items = [f"{d['id']}: {d['filename']}" for d in history]
         
         ok = False
         item_a, ok = QInputDialog.getItem(self, "Select Dataset A", "Baseline Dataset:", items, 0, False)
@@ -580,15 +814,26 @@ class MainWindow(QMainWindow):
             
         self._start_comparison(id_a, id_b)
 
+    def _prompt_local_comparison(self):
+        """Pick two CSV files and compare them in-process"""
+        from PyQt5.QtWidgets import QFileDialog
+        path_a, _ = QFileDialog.getOpenFileName(self, "Select Dataset A (Baseline)", "", "CSV Files (*.csv)")
+        if not path_a:
+            return
+        path_b, _ = QFileDialog.getOpenFileName(self, "Select Dataset B (Comparison)", "", "CSV Files (*.csv)")
+        if not path_b:
+            return
+        
+        self._set_loading(True, "Comparing...")
+        self.tasks.submit(self.local_analyzer.compare_files, path_a, path_b, key='compare',
+                          priority=TaskExecutor.HIGH,
+                          on_result=self._on_comparison_loaded, on_error=self._on_summary_error)
+
     def _start_comparison(self, id_a, id_b):
         self._set_loading(True, "Comparing...")
-        worker = APIWorker(self.api_client.compare_datasets, id_a, id_b)
-        worker.finished.connect(self._on_comparison_loaded)
-        worker.finished.connect(lambda: self._cleanup_worker(worker))
-        worker.error.connect(self._on_summary_error) # Reuse error handler
-        worker.error.connect(lambda: self._cleanup_worker(worker))
-        worker.start()
-        self.active_workers.append(worker)
+        self.tasks.submit(self.api_client.compare_view, id_a, id_b, key='compare', priority=TaskExecutor.HIGH,
+                          on_result=self._on_comparison_loaded,
+                          on_error=self._on_summary_error)  # Reuse error handler
 
     def _on_comparison_loaded(self, data):
         self._set_loading(False)
@@ -596,56 +841,28 @@ class MainWindow(QMainWindow):
         
         # Update Text Stats to show Deltas
         d = data['delta']
-        stats = data['comparison_stats']
-
         self.stat_total.set_value(f"Δ {d['total_equipment']}")
         self.stat_flowrate.set_value(f"Δ {d['averages']['flowrate']}")
         self.stat_pressure.set_value(f"Δ {d['averages']['pressure']}")
         self.stat_temperature.set_value(f"Δ {d['averages']['temperature']}")
         
-        # Format advanced stats message
-        msg = (f"Comparison Complete!\n\n"
-               f"Dataset A: {data['dataset_a']['filename']}\n"
-               f"Dataset B: {data['dataset_b']['filename']}\n\n"
-               f"--- BASIC DELTAS ---\n"
-               f"Equipment Difference: {d['total_equipment']}\n"
-               f"Flowrate Difference: {d['averages']['flowrate']}\n"
-               f"Pressure Difference: {d['averages']['pressure']}\n\n"
-               f"--- STATISTICAL ANALYSIS ---\n"
-               f"FLOWRATE:\n"
-               f"  Change: {stats['flowrate']['percent_change']}%\n"
-               f"  Risk: {stats['flowrate']['risk_level'].upper()}\n"
-               f"  Stability: {stats['flowrate']['stability']}\n"
-               f"  Effect Size: {stats['flowrate']['effect_size']}\n\n"
-               f"PRESSURE:\n"
-               f"  Change: {stats['pressure']['percent_change']}%\n"
-               f"  Risk: {stats['pressure']['risk_level'].upper()}\n"
-               f"  Stability: {stats['pressure']['stability']}\n"
-               f"  Effect Size: {stats['pressure']['effect_size']}\n\n"
-               f"TEMPERATURE:\n"
-               f"  Change: {stats['temperature']['percent_change']}%\n"
-               f"  Risk: {stats['temperature']['risk_level'].upper()}\n"
-               f"  Stability: {stats['temperature']['stability']}\n"
-               f"  Effect Size: {stats['temperature']['effect_size']}")
-        
-        QMessageBox.information(self, "Detailed Comparison Result", msg)
+        # Histograms, type bars and the equipment diff replace the charts and table
+        self.empty_state.hide()
+        view = self._compare_view()
+        view.set_comparison(data)
+        view.show()
 
     
-    def _cleanup_worker(self, worker):
-        """Remove finished worker from active workers list"""
-        if worker in self.active_workers:
-            self.active_workers.remove(worker)
-    
     def closeEvent(self, event):
         """Handle window close event - cleanup worker threads"""
-        # Wait for all active workers to finish
-        for worker in self.active_workers:
-            if worker.isRunning():
-                worker.quit()  # Ask thread to quit
-                worker.wait(1000)  # Wait up to 1 second
-        
-        # Clear the list
-        self.active_workers.clear()
+        self._stop_prefetch()
+        if self.event_worker is not None:
+            self.event_worker.stop()
+            self.event_worker.wait(1000)
+        
+        # Drop queued calls and give running ones one second in total; late results are discarded
+        self.tasks.shutdown(1000)
+        self.api_client.close()
         
         # Accept the close event
         event.accept()
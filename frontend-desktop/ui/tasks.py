@@ -0,0 +1,156 @@
+"""
+Task executor for API calls - a bounded QThreadPool shared by the window
+
+    self.tasks.submit(self.api_client.get_summary, dataset_id, key='dataset',
+                      priority=TaskExecutor.HIGH, on_result=..., on_error=...)
+
+Tasks with the same key supersede each other: submitting a new one removes
+the older one from the queue, or discards its result if it is already
+running, so only the latest selection reaches the UI. Submitting the same
+call again while it is still in flight coalesces onto the pending task.
+Results and errors are delivered on the UI thread.
+"""
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _TaskSignals(QObject):
+    # task, succeeded, result or error message
+    done = pyqtSignal(object, bool, object)
+
+
+class Task(QRunnable):
+    """One submitted call; cancelled tasks never call back"""
+
+    def __init__(self, func, args, kwargs, key, priority):
+        super().__init__()
+        # The executor owns the task until it is delivered, so Qt must not delete it after run()
+        self.setAutoDelete(False)
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.priority = priority
+        self.cancelled = False
+        self.callbacks = []  # (on_result, on_error) pairs
+        self.signals = _TaskSignals()
+
+    def matches(self, func, args, kwargs):
+        return self.func == func and self.args == args and self.kwargs == kwargs
+
+    def run(self):
+        """Execute the function on a pool thread"""
+        if self.cancelled:
+            self._finish(False, None)
+            return
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            self._finish(False, str(e))
+        else:
+            self._finish(True, result)
+
+    def _finish(self, succeeded, value):
+        try:
+            self.signals.done.emit(self, succeeded, value)
+        except RuntimeError:
+            pass  # Signals already deleted: the application exited while this call ran
+
+
+class TaskExecutor(QObject):
+    """Runs callables on a bounded thread pool and hands results back to the UI thread"""
+
+    # Queued tasks start in priority order
+    LOW = 0  # Background work, e.g. prefetching
+    NORMAL = 1
+    HIGH = 2  # What the user is waiting for
+
+    def __init__(self, max_threads: int = 4, parent=None):
+        """
+        Args:
+            max_threads: Upper bound on concurrent calls (and threads)
+            parent: Owning QObject
+        """
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._tasks = set()  # Submitted, not yet delivered
+        self._latest = {}  # key -> newest task for that key
+        self._stopped = False
+
+    def submit(self, func, *args, key=None, priority=NORMAL, on_result=None, on_error=None, **kwargs):
+        """
+        Run func(*args, **kwargs) on the pool
+
+        Args:
+            key: Tasks sharing a key supersede each other (latest wins); None never supersedes
+            priority: LOW, NORMAL or HIGH
+            on_result: Called with the return value on the UI thread
+            on_error: Called with the error message on the UI thread
+
+        Returns:
+            Task: The task that will deliver the result (an existing one when coalesced)
+        """
+        if self._stopped:
+            return None
+        callbacks = (on_result, on_error)
+        previous = self._latest.get(key) if key is not None else None
+        if previous is not None and not previous.cancelled and previous.matches(func, args, kwargs):
+            previous.callbacks.append(callbacks)
+            if priority > previous.priority and self.pool.tryTake(previous):
+                # Still queued: requeue at the higher priority
+                previous.priority = priority
+                self.pool.start(previous, priority)
+            return previous
+        if previous is not None:
+            self.cancel(previous)
+
+        task = Task(func, args, kwargs, key, priority)
+        task.callbacks.append(callbacks)
+        task.signals.done.connect(self._deliver)
+        self._tasks.add(task)
+        if key is not None:
+            self._latest[key] = task
+        self.pool.start(task, priority)
+        return task
+
+    def cancel(self, task):
+        """Drop a task's result; a task that has not started yet is removed from the queue"""
+        task.cancelled = True
+        if self._latest.get(task.key) is task:
+            del self._latest[task.key]
+        if self.pool.tryTake(task):
+            self._tasks.discard(task)
+
+    def cancel_key(self, key):
+        task = self._latest.get(key)
+        if task is not None:
+            self.cancel(task)
+
+    def pending(self, min_priority: int = LOW) -> int:
+        """Submitted tasks of at least min_priority that have not been delivered or cancelled"""
+        return sum(1 for task in self._tasks if not task.cancelled and task.priority >= min_priority)
+
+    def _deliver(self, task, succeeded, value):
+        self._tasks.discard(task)
+        if task.cancelled or self._stopped:
+            return
+        if self._latest.get(task.key) is task:
+            del self._latest[task.key]
+        for on_result, on_error in task.callbacks:
+            callback = on_result if succeeded else on_error
+            if callback is not None:
+                callback(value)
+
+    def shutdown(self, wait_ms: int = 1000) -> bool:
+        """
+        Stop accepting work, drop queued tasks and wait up to wait_ms in total
+        for running ones (their results are discarded)
+
+        Returns:
+            bool: True if every running task finished in time
+        """
+        self._stopped = True
+        for task in list(self._tasks):
+            self.cancel(task)
+        self.pool.clear()
+        return self.pool.waitForDone(wait_ms)
@@ -2,7 +2,6 @@
 from .stat_card import StatCard
 from .upload_panel import UploadPanel
 from .history_panel import HistoryPanel
-from .chart_widget import ChartWidget, ChartsContainer
 from .data_table import DataTable
 
 __all__ = [
@@ -11,5 +10,17 @@ __all__ = [
     'HistoryPanel',
     'ChartWidget',
     'ChartsContainer',
+    'CompareView',
     'DataTable'
 ]
+
+
+def __getattr__(name):
+    # The charts pull in matplotlib, most of the app's import time, so they load on first use
+    if name in ('ChartWidget', 'ChartsContainer'):
+        from . import chart_widget
+        return getattr(chart_widget, name)
+    if name == 'CompareView':
+        from .compare_view import CompareView
+        return CompareView
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,28 +1,78 @@
 """
 Chart Widget - Displays matplotlib charts
+
+Each chart creates its axes and artists once. Later datasets update those
+artists in place (bar heights, wedge angles, scatter offsets, trend line and
+histogram data). The artists are animated: when the axis limits stay put,
+only they are redrawn and blitted over a cached background. Otherwise the
+canvas is redrawn with draw_idle(), so a burst of updates costs one render.
 """
-from PyQt5.QtWidgets import QFrame, QVBoxLayout, QLabel, QHBoxLayout
+import math
+
+import numpy as np
+from PyQt5.QtWidgets import QFrame, QVBoxLayout, QLabel, QGridLayout
 from PyQt5.QtGui import QFont
+from matplotlib import colormaps
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
+from matplotlib.patches import Wedge
+
+from .data_table import numeric_column
+
+METRIC_COLORS = ['#3b82f6', '#10b981', '#f59e0b']
+TYPE_PALETTE = colormaps['tab10'].colors
+HISTOGRAM_BINS = 20
+# Larger datasets are drawn as an evenly strided sample so a redraw stays within a frame
+MAX_SCATTER_POINTS = 2000
+
+
+def type_colors(type_names) -> dict:
+    """Colour per equipment type, consistent across charts"""
+    return {name: TYPE_PALETTE[i % len(TYPE_PALETTE)] for i, name in enumerate(sorted(type_names))}
+
+
+def _fit_limits(current, low, high, pad_low=True):
+    """
+    Axis limits covering [low, high], and whether they differ from current.
+    Current limits are kept while the data fills at least 75% of them, so
+    similar datasets reuse the cached background.
+    """
+    span = (high - low) or abs(high) or 1.0
+    if current is not None and current[0] <= low and current[1] >= high \
+            and (high - low) >= (current[1] - current[0]) * 0.75:
+        return current, False
+    wanted = (low - span * 0.08 if pad_low else low, high + span * 0.12)
+    return wanted, wanted != current
+
+
+def _linear_fit(x, y):
+    """(slope, intercept) of a least squares line, or None without enough spread"""
+    if len(x) < 2 or np.ptp(x) == 0:
+        return None
+    slope, intercept = np.polyfit(x, y, 1)
+    return slope, intercept
 
 
 class ChartWidget(QFrame):
     """Widget for displaying charts using matplotlib"""
-    
+
     def __init__(self, title: str, parent=None):
         """
         Initialize chart widget
-        
+
         Args:
             title: Title of the chart
             parent: Parent widget
         """
         super().__init__(parent)
         self.title = title
+        self.ax = None
+        self._kind = None
+        self._artists = {}
+        self._animated = []
+        self._background = None
         self._setup_ui()
-    
+
     def _setup_ui(self):
         """Setup the UI components"""
         # Panel styling
@@ -35,12 +85,12 @@ class ChartWidget(QFrame):
             }
         """)
         self.setMaximumHeight(400)  # Limit chart height
-        
+
         # Layout
         layout = QVBoxLayout()
         layout.setContentsMargins(12, 10, 12, 5)  # Reduced bottom margin to 0
         layout.setSpacing(6)  # Reduced spacing from 8 to 6
-        
+
         # Title
         title_label = QLabel(self.title)
         title_font = QFont()
@@ -48,132 +98,328 @@ class ChartWidget(QFrame):
         title_font.setBold(True)
         title_label.setFont(title_font)
         title_label.setStyleSheet("color: #111827;")
-        
+
         # Create matplotlib figure and canvas
         self.figure = Figure(figsize=(6.5, 3.5), dpi=90)  # Larger figure
         self.figure.patch.set_facecolor('#CDB885')
         self.canvas = FigureCanvas(self.figure)
-        
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
         layout.addWidget(title_label)
         layout.addWidget(self.canvas)
-        
+
         self.setLayout(layout)
-    
+
+    # --- fast path -----------------------------------------------------------
+
+    def _prepare(self, kind: str) -> bool:
+        """Set up the axes for a chart kind; True if they were just created and need their artists"""
+        if self._kind == kind:
+            return False
+        self.figure.clear()
+        self.ax = self.figure.add_subplot(111)
+        self._kind = kind
+        self._artists = {}
+        self._animated = []
+        self._background = None
+        return True
+
+    def _animate(self, *artists):
+        """Mark artists as data: drawn over the cached background rather than into it"""
+        for artist in artists:
+            artist.set_animated(True)
+            self._animated.append(artist)
+        return list(artists)
+
+    def _on_draw(self, event):
+        """After a full render: cache the static background, then paint the data artists"""
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self._animated:
+            if artist.get_visible():
+                self.figure.draw_artist(artist)
+
+    def _refresh(self, full: bool):
+        """Blit the data artists when axes are unchanged, otherwise schedule one full redraw"""
+        if full or self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.figure.bbox)
+
+    def _update_limits(self, created, x_range=None, y_range=None, pad_low=True):
+        """Apply data ranges to the axes; True if the limits (and so the background) changed"""
+        changed = False
+        if x_range is not None:
+            limits, x_changed = _fit_limits(None if created else self.ax.get_xlim(), *x_range)
+            if x_changed:
+                self.ax.set_xlim(*limits)
+            changed |= x_changed
+        if y_range is not None:
+            limits, y_changed = _fit_limits(None if created else self.ax.get_ylim(), *y_range, pad_low=pad_low)
+            if y_changed:
+                self.ax.set_ylim(*limits)
+            changed |= y_changed
+        return changed
+
+    # --- charts --------------------------------------------------------------
+
     def plot_bar_chart(self, data: dict):
         """
         Plot a bar chart for averages
-        
+
         Args:
             data: Dictionary with averages (flowrate, pressure, temperature)
         """
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        
-        # Data
-        categories = ['Flowrate\n(m³/h)', 'Pressure\n(bar)', 'Temperature\n(°C)']
-        values = [
-            data['averages']['flowrate'],
-            data['averages']['pressure'],
-            data['averages']['temperature']
-        ]
-        colors = ['#3b82f6', '#10b981', '#f59e0b']
-        
-        # Create bar chart
-        bars = ax.bar(categories, values, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
-        
-        # Add value labels on bars
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.1f}',
-                   ha='center', va='bottom', fontsize=10, fontweight='bold')
-        
-        # Styling
-        ax.set_ylabel('Value', fontsize=9, fontweight='bold')
-        ax.set_title('Average Parameters', fontsize=10, fontweight='bold', pad=8)
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.grid(axis='y', alpha=0.3, linestyle='--')
-        
-        self.figure.tight_layout()
-        self.canvas.draw()
-    
+        created = self._prepare('bar')
+        ax = self.ax
+        if created:
+            categories = ['Flowrate\n(m³/h)', 'Pressure\n(bar)', 'Temperature\n(°C)']
+            bars = ax.bar(categories, [0, 0, 0], color=METRIC_COLORS, alpha=0.8, edgecolor='white', linewidth=2)
+            # Value labels on bars
+            labels = [
+                ax.text(bar.get_x() + bar.get_width() / 2., 0, '', ha='center', va='bottom',
+                        fontsize=10, fontweight='bold')
+                for bar in bars
+            ]
+            self._artists = {'bars': self._animate(*bars), 'labels': self._animate(*labels)}
+
+            # Styling
+            ax.set_ylabel('Value', fontsize=9, fontweight='bold')
+            ax.set_title('Average Parameters', fontsize=10, fontweight='bold', pad=8)
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.grid(axis='y', alpha=0.3, linestyle='--')
+
+        values = [float(data['averages'][key] or 0) for key in ('flowrate', 'pressure', 'temperature')]
+        for bar, label, value in zip(self._artists['bars'], self._artists['labels'], values):
+            bar.set_height(value)
+            label.set_y(value)
+            label.set_text(f'{value:.1f}')
+
+        changed = self._update_limits(created, y_range=(min(0, *values), max(0, *values)), pad_low=False)
+        if created:
+            self.figure.tight_layout()
+        self._refresh(created or changed)
+
     def plot_pie_chart(self, type_distribution: dict):
         """
         Plot a pie chart for equipment type distribution
-        
+
         Args:
             type_distribution: Dictionary with equipment types and counts
         """
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        
-        # Data
+        created = self._prepare('pie')
+        ax = self.ax
+        if created:
+            # Fixed limits with equal aspect ratio: the pie is a circle and the background never changes
+            ax.set_xlim(-1.35, 1.35)
+            ax.set_ylim(-1.2, 1.2)
+            ax.set_aspect('equal')
+            ax.axis('off')
+            ax.set_title('Equipment Type Distribution', fontsize=10, fontweight='bold', pad=8)
+            self._artists = {'wedges': [], 'labels': [], 'percents': []}
+            self.figure.tight_layout()
+
         labels = list(type_distribution.keys())
-        sizes = list(type_distribution.values())
-        
-        # Colors
-        colors = plt.cm.Set3(range(len(labels)))
-        
-        # Create pie chart
-        wedges, texts, autotexts = ax.pie(
-            sizes,
-            labels=labels,
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=colors,
-            textprops={'fontsize': 9}
+        sizes = [float(value) for value in type_distribution.values()]
+        total = sum(sizes)
+        colors = type_colors(labels)
+        self._ensure_wedges(len(labels))
+
+        angle = 90.0  # Start at the top, counter-clockwise
+        artists = zip(self._artists['wedges'], self._artists['labels'], self._artists['percents'])
+        for index, (wedge, label, percent) in enumerate(artists):
+            visible = index < len(labels)
+            for artist in (wedge, label, percent):
+                artist.set_visible(visible)
+            if not visible:
+                continue
+            sweep = 360.0 * sizes[index] / total if total else 0.0
+            wedge.set_theta1(angle)
+            wedge.set_theta2(angle + sweep)
+            wedge.set_facecolor(colors[labels[index]])
+            middle = math.radians(angle + sweep / 2)
+            x, y = math.cos(middle), math.sin(middle)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x >= 0 else 'right')
+            label.set_text(labels[index])
+            percent.set_position((0.6 * x, 0.6 * y))
+            percent.set_text(f'{100.0 * sizes[index] / total:.1f}%' if total else '')
+            angle += sweep
+
+        self._refresh(created)
+
+    def _ensure_wedges(self, count: int):
+        """Grow the pool of wedge/label artists to count (surplus ones are hidden, not removed)"""
+        while len(self._artists['wedges']) < count:
+            wedge = Wedge((0, 0), 1, 90, 90, edgecolor='white', linewidth=1)
+            self.ax.add_patch(wedge)
+            label = self.ax.text(0, 0, '', va='center', fontsize=9)
+            # Percentages in bold white
+            percent = self.ax.text(0, 0, '', ha='center', va='center', color='white', fontweight='bold', fontsize=10)
+            self._artists['wedges'] += self._animate(wedge)
+            self._artists['labels'] += self._animate(label)
+            self._artists['percents'] += self._animate(percent)
+
+    def plot_scatter(self, x: np.ndarray, y: np.ndarray, types: np.ndarray, xlabel: str, ylabel: str):
+        """
+        Plot readings against each other, coloured by type, with a least squares
+        trend line overall (dashed) and per type
+
+        Args:
+            x, y: Readings per row (NaN where missing)
+            types: Equipment type per row
+            xlabel, ylabel: Axis labels
+        """
+        created = self._prepare('scatter')
+        ax = self.ax
+        if created:
+            points = ax.scatter([], [], s=14, alpha=0.75, linewidths=0)
+            overall, = ax.plot([], [], color='#111827', linestyle='--', linewidth=1.5)
+            self._artists = {'points': self._animate(points)[0], 'overall': self._animate(overall)[0], 'trends': {}}
+            ax.set_xlabel(xlabel, fontsize=9, fontweight='bold')
+            ax.set_ylabel(ylabel, fontsize=9, fontweight='bold')
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.grid(alpha=0.3, linestyle='--')
+
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y, types = x[valid], y[valid], types[valid]
+        names = np.unique(types)
+        colors = type_colors(names)
+
+        step = max(1, math.ceil(len(x) / MAX_SCATTER_POINTS))
+        shown = slice(None, None, step)
+        points = self._artists['points']
+        points.set_offsets(np.column_stack([x[shown], y[shown]]))
+        points.set_facecolors([colors[name] for name in types[shown]])
+
+        # Trend lines are fitted on every row, not just the drawn sample
+        trends = self._artists['trends']
+        x_ends = np.array([x.min(), x.max()]) if len(x) else np.array([])
+        self._set_trend(self._artists['overall'], _linear_fit(x, y), x_ends)
+        for name in set(trends) | set(names):
+            if name not in trends:
+                line, = ax.plot([], [], linewidth=1.2)
+                trends[name] = self._animate(line)[0]
+            in_type = types == name
+            trends[name].set_color(colors.get(name, 'none'))
+            self._set_trend(trends[name], _linear_fit(x[in_type], y[in_type]) if in_type.any() else None, x_ends)
+
+        changed = self._update_limits(
+            created,
+            x_range=(x.min(), x.max()) if len(x) else (0, 1),
+            y_range=(y.min(), y.max()) if len(y) else (0, 1),
         )
-        
-        # Make percentage text bold
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-            autotext.set_fontsize(10)
-        
-        # Equal aspect ratio ensures that pie is drawn as a circle
-        ax.axis('equal')
-        ax.set_title('Equipment Type Distribution', fontsize=10, fontweight='bold', pad=8)
-        
-        self.figure.tight_layout()
-        self.canvas.draw()
+        if created:
+            self.figure.tight_layout()
+        self._refresh(created or changed)
+
+    @staticmethod
+    def _set_trend(line, fit, x_ends):
+        line.set_visible(fit is not None)
+        if fit is not None:
+            slope, intercept = fit
+            line.set_data(x_ends, slope * x_ends + intercept)
+
+    def plot_histogram(self, values: np.ndarray, xlabel: str):
+        """
+        Plot the distribution of one reading with its mean marked
+
+        Args:
+            values: Readings per row (NaN where missing)
+            xlabel: Axis label
+        """
+        created = self._prepare('histogram')
+        ax = self.ax
+        if created:
+            bins = ax.bar(np.zeros(HISTOGRAM_BINS), np.zeros(HISTOGRAM_BINS), width=1, align='edge',
+                          color=METRIC_COLORS[0], alpha=0.8, edgecolor='white', linewidth=1)
+            mean_line = ax.axvline(0, color=METRIC_COLORS[2], linestyle='--', linewidth=1.5)
+            self._artists = {'bins': self._animate(*bins), 'mean': self._animate(mean_line)[0]}
+            ax.set_xlabel(xlabel, fontsize=9, fontweight='bold')
+            ax.set_ylabel('Count', fontsize=9, fontweight='bold')
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.grid(axis='y', alpha=0.3, linestyle='--')
+
+        values = values[~np.isnan(values)]
+        if len(values):
+            counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+        else:
+            counts, edges = np.zeros(HISTOGRAM_BINS), np.linspace(0, 1, HISTOGRAM_BINS + 1)
+        for rect, count, left, right in zip(self._artists['bins'], counts, edges[:-1], edges[1:]):
+            rect.set_x(left)
+            rect.set_width(right - left)
+            rect.set_height(count)
+        mean_line = self._artists['mean']
+        mean_line.set_visible(len(values) > 0)
+        if len(values):
+            mean_line.set_xdata([values.mean()] * 2)
+
+        changed = self._update_limits(
+            created, x_range=(edges[0], edges[-1]), y_range=(0, counts.max()), pad_low=False
+        )
+        if created:
+            self.figure.tight_layout()
+        self._refresh(created or changed)
 
 
 class ChartsContainer(QFrame):
     """Container for multiple charts"""
-    
+
     def __init__(self, parent=None):
         """
         Initialize charts container
-        
+
         Args:
             parent: Parent widget
         """
         super().__init__(parent)
+        self._shown = None
         self._setup_ui()
-    
+
     def _setup_ui(self):
         """Setup the UI components"""
         # Layout
-        layout = QHBoxLayout()
+        layout = QGridLayout()
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(10)  # Reduced from 16
-        
+
         # Create chart widgets
         self.averages_chart = ChartWidget("Parameter Averages")
         self.distribution_chart = ChartWidget("Type Distribution")
-        
-        layout.addWidget(self.averages_chart)
-        layout.addWidget(self.distribution_chart)
-        
+        self.scatter_chart = ChartWidget("Pressure vs Temperature (trend lines per type)")
+        self.histogram_chart = ChartWidget("Temperature Distribution")
+
+        layout.addWidget(self.averages_chart, 0, 0)
+        layout.addWidget(self.distribution_chart, 0, 1)
+        layout.addWidget(self.scatter_chart, 1, 0)
+        layout.addWidget(self.histogram_chart, 1, 1)
+
         self.setLayout(layout)
-    
+
     def update_charts(self, data: dict):
         """
-        Update both charts with new data
-        
+        Update all charts with new data
+
         Args:
             data: Summary data from API
         """
+        if data is self._shown:
+            # Same summary shown again (e.g. leaving compare mode): the artists are already current
+            return
+        self._shown = data
         self.averages_chart.plot_bar_chart(data)
         self.distribution_chart.plot_pie_chart(data['type_distribution'])
+
+        table = data.get('table') or []
+        types = np.array([str(row.get('Type', '')) for row in table], dtype=str)
+        pressure = numeric_column(table, 'Pressure')
+        temperature = numeric_column(table, 'Temperature')
+        self.scatter_chart.plot_scatter(pressure, temperature, types, 'Pressure (bar)', 'Temperature (°C)')
+        self.histogram_chart.plot_histogram(temperature, 'Temperature (°C)')
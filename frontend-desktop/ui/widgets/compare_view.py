@@ -0,0 +1,227 @@
+"""
+Compare View - Two datasets side by side
+
+Draws the pre-aggregated comparison from /api/compare/view/ (or the same
+structure computed locally): the statistics per reading, histograms of A and B
+over shared bins, per-type counts side by side and the equipment whose readings
+changed most, aligned by Equipment Name. No row table is needed, so a
+comparison of large datasets costs a few kilobytes and one render.
+"""
+import numpy as np
+from PyQt5.QtWidgets import QFrame, QVBoxLayout, QGridLayout, QLabel, QTableView, QAbstractItemView, QHeaderView
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor, QFont
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+# (key in the comparison, label, short label for the diff columns)
+METRICS = [
+    ('flowrate', 'Flowrate (m³/h)', 'Flow'),
+    ('pressure', 'Pressure (bar)', 'Press.'),
+    ('temperature', 'Temperature (°C)', 'Temp.'),
+]
+COLOR_A = '#3b82f6'
+COLOR_B = '#f59e0b'
+RISK_COLORS = {'normal': '#047857', 'warning': '#b45309', 'critical': '#b91c1c'}
+
+
+def _column(values) -> np.ndarray:
+    """Floats with None as NaN"""
+    return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+
+class DiffTableModel(QAbstractTableModel):
+    """Read-only columnar model of the equipment diff: name, type, then A, B and Δ per reading"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names = []
+        self._types = []
+        self._values = []  # Per column after the text ones: float array
+        self._headers = ['Equipment Name', 'Type'] + [
+            f"{short} {part}" for _, _, short in METRICS for part in ('A', 'B', 'Δ')
+        ]
+
+    def set_rows(self, rows: dict):
+        """Replace the data with the diff's columnar rows"""
+        self.beginResetModel()
+        self._names = rows.get('name', [])
+        self._types = rows.get('type', [])
+        self._values = [_column(rows[key][part]) for key, _, _ in METRICS for part in ('a', 'b', 'delta')] \
+            if self._names else []
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if column < 2:
+            if role == Qt.DisplayRole:
+                return (self._names if column == 0 else self._types)[row]
+            return None
+        value = self._values[column - 2][row]
+        is_delta = (column - 2) % 3 == 2
+        if role == Qt.DisplayRole:
+            if np.isnan(value):
+                return ''
+            return f"{value:+.1f}" if is_delta else f"{value:.1f}"
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignRight | Qt.AlignVCenter
+        if role == Qt.ForegroundRole and is_delta and not np.isnan(value) and value != 0:
+            return QColor('#b91c1c' if value > 0 else '#1d4ed8')
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._headers[section]
+        return str(section + 1)
+
+
+class CompareView(QFrame):
+    """Comparison of dataset B against baseline A"""
+
+    def __init__(self, parent=None):
+        """
+        Initialize compare view
+
+        Args:
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self._shown = None
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Setup the UI components"""
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setStyleSheet("""
+            CompareView {
+                background-color: #CDB885;
+                border-radius: 8px;
+                border: 1px solid #e5e7eb;
+            }
+        """)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(12, 10, 12, 10)
+        layout.setSpacing(8)
+
+        self.title_label = QLabel("Comparison")
+        title_font = QFont()
+        title_font.setPointSize(14)
+        title_font.setBold(True)
+        self.title_label.setFont(title_font)
+        self.title_label.setStyleSheet("color: #111827;")
+
+        # Statistics per reading: one column each
+        stats_layout = QGridLayout()
+        stats_layout.setSpacing(10)
+        self.stat_labels = {}
+        for column, (key, _, _) in enumerate(METRICS):
+            stat = QLabel("")
+            stat.setTextFormat(Qt.RichText)
+            stat.setStyleSheet("color: #111827; font-size: 12px; background-color: #EFE1B5;"
+                               " border-radius: 6px; padding: 6px;")
+            stats_layout.addWidget(stat, 0, column)
+            self.stat_labels[key] = stat
+
+        # Histograms of each reading, then type counts
+        self.figure = Figure(figsize=(11, 5.5), dpi=90)
+        self.figure.patch.set_facecolor('#CDB885')
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.setFixedHeight(480)
+
+        self.diff_label = QLabel("")
+        self.diff_label.setStyleSheet("color: #111827; font-size: 12px; font-weight: bold;")
+
+        self.diff_model = DiffTableModel(self)
+        self.diff_view = QTableView()
+        self.diff_view.setModel(self.diff_model)
+        self.diff_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.diff_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.diff_view.setAlternatingRowColors(True)
+        self.diff_view.verticalHeader().setDefaultSectionSize(24)
+        header = self.diff_view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Stretch)
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.diff_view.setMinimumHeight(300)
+        self.diff_view.setStyleSheet("QTableView { background-color: #ffffff; font-size: 12px; }")
+
+        layout.addWidget(self.title_label)
+        layout.addLayout(stats_layout)
+        layout.addWidget(self.canvas)
+        layout.addWidget(self.diff_label)
+        layout.addWidget(self.diff_view)
+        self.setLayout(layout)
+
+    def set_comparison(self, data: dict):
+        """
+        Show a comparison
+
+        Args:
+            data: Comparison shaped like /api/compare/view/
+        """
+        if data is self._shown:
+            return
+        self._shown = data
+        name_a, name_b = data['dataset_a'].get('filename'), data['dataset_b'].get('filename')
+        self.title_label.setText(f"A: {name_a}   vs   B: {name_b}")
+
+        stats = data['comparison_stats']
+        for key, label, _ in METRICS:
+            metric = stats.get(key, {})
+            risk = str(metric.get('risk_level', '')).lower()
+            self.stat_labels[key].setText(
+                f"<b>{label}</b><br>"
+                f"Change: {metric.get('percent_change')}%<br>"
+                f"Risk: <span style='color: {RISK_COLORS.get(risk, '#111827')}'><b>{risk.upper()}</b></span><br>"
+                f"Stability: {metric.get('stability')} &nbsp; Effect size: {metric.get('effect_size')}"
+            )
+
+        self._plot(data, name_a, name_b)
+
+        diff = data['diff']
+        shown = len(diff['rows'].get('name', []))
+        self.diff_label.setText(
+            f"Equipment by Name: {diff['matched']} matched, {diff['added']} only in B, "
+            f"{diff['removed']} only in A. Largest changes ({shown} shown):"
+        )
+        self.diff_model.set_rows(diff['rows'])
+
+    def _plot(self, data: dict, name_a: str, name_b: str):
+        """Redraw the figure; comparisons are infrequent, so it is rebuilt rather than updated in place"""
+        self.figure.clear()
+        axes = self.figure.subplots(2, 2)
+        for ax, (key, label, _) in zip(axes.flat, METRICS):
+            histogram = data['histograms'][key]
+            edges = np.asarray(histogram['edges'], dtype=float)
+            ax.stairs(histogram['a'], edges, fill=True, color=COLOR_A, alpha=0.45, label=name_a)
+            ax.stairs(histogram['b'], edges, fill=True, color=COLOR_B, alpha=0.45, label=name_b)
+            ax.set_xlabel(label, fontsize=9, fontweight='bold')
+            ax.set_ylabel('Count', fontsize=9, fontweight='bold')
+
+        types = data['types']
+        ax = axes.flat[3]
+        x = np.arange(len(types['types']))
+        ax.bar(x - 0.2, types['count']['a'], width=0.4, color=COLOR_A, label=name_a)
+        ax.bar(x + 0.2, types['count']['b'], width=0.4, color=COLOR_B, label=name_b)
+        ax.set_xticks(x, types['types'], fontsize=8, rotation=20)
+        ax.set_ylabel('Count', fontsize=9, fontweight='bold')
+        ax.legend(fontsize=8, frameon=False)
+
+        for ax in axes.flat:
+            ax.set_facecolor('#EFE1B5')
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.grid(axis='y', alpha=0.3, linestyle='--')
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
@@ -1,24 +1,156 @@
 """
 Data Table Widget - Displays equipment data in a table
+
+Rows are held column by column (a list of names and types, float arrays for
+the readings) behind a QAbstractTableModel, so a QTableView only formats the
+cells that are on screen. Sorting permutes a row index with numpy and
+filtering uses a precomputed match mask. Load time and memory therefore grow
+with the raw data, not with one Qt item per cell.
 """
-from PyQt5.QtWidgets import QFrame, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
-from PyQt5.QtCore import Qt
+import numpy as np
+from PyQt5.QtWidgets import (QFrame, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QTableView,
+                             QAbstractItemView, QHeaderView)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
 from PyQt5.QtGui import QFont
 
+# (row key, header label); the last three are numeric
+COLUMNS = [
+    ('Equipment Name', 'Equipment Name'),
+    ('Type', 'Type'),
+    ('Flowrate', 'Flowrate (m³/h)'),
+    ('Pressure', 'Pressure (bar)'),
+    ('Temperature', 'Temperature (°C)'),
+]
+TEXT_COLUMNS = 2
+
+
+def numeric_column(rows: list, key: str) -> np.ndarray:
+    """Column of floats; missing or non-numeric readings become NaN"""
+    values = [row.get(key) for row in rows]
+    try:
+        # Fast path: numbers and None (-> NaN) convert in one call
+        return np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        pass
+
+    def value(item):
+        try:
+            return float(item)
+        except (TypeError, ValueError):
+            return np.nan
+    return np.fromiter((value(item) for item in values), dtype=float, count=len(values))
+
+
+class EquipmentTableModel(QAbstractTableModel):
+    """Read-only columnar table model; cells are formatted only when the view asks for them"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._columns = [[] for _ in COLUMNS]
+        self._order = np.arange(0)  # Model row -> stored row
+        self._search_text = np.array([], dtype=str)
+
+    def set_rows(self, rows: list):
+        """Replace the data with a list of row dictionaries"""
+        self.beginResetModel()
+        self._columns = [
+            [str(row.get(key, '')) for row in rows] for key, _ in COLUMNS[:TEXT_COLUMNS]
+        ] + [numeric_column(rows, key) for key, _ in COLUMNS[TEXT_COLUMNS:]]
+        self._order = np.arange(len(rows))
+        # Lower-cased "name type" per stored row, matched against the filter text in one pass
+        self._search_text = np.char.lower(np.char.add(
+            np.char.add(np.array(self._columns[0], dtype=str), '\n'), np.array(self._columns[1], dtype=str)
+        )) if rows else np.array([], dtype=str)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.DisplayRole:
+            value = self._columns[column][self._order[index.row()]]
+            if column < TEXT_COLUMNS:
+                return value
+            return '' if np.isnan(value) else f"{value:.1f}"
+        if role == Qt.TextAlignmentRole and column >= TEXT_COLUMNS:
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return COLUMNS[section][1]
+        return str(section + 1)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Reorder rows with one vectorised argsort instead of pairwise comparisons"""
+        values = self._columns[column]
+        if column < TEXT_COLUMNS:
+            values = np.array(values, dtype=str)
+        order_index = np.argsort(values, kind='stable')
+        if order == Qt.DescendingOrder:
+            order_index = order_index[::-1]
+            if column >= TEXT_COLUMNS:
+                # Missing readings stay last, as in ascending order
+                missing = np.isnan(values[order_index])
+                order_index = np.concatenate([order_index[~missing], order_index[missing]])
+        self.layoutAboutToBeChanged.emit()
+        self._order = order_index
+        self.layoutChanged.emit()
+
+    def stored_row(self, row: int) -> int:
+        """Position of a (sorted) model row in the stored columns"""
+        return self._order[row]
+
+    def match_mask(self, text: str) -> np.ndarray:
+        """Per stored row: whether the name or type contains text (case-insensitive)"""
+        return np.char.find(self._search_text, text.lower()) >= 0
+
+
+class EquipmentFilterProxy(QSortFilterProxyModel):
+    """
+    Filters rows by name or type and hands sorting to the source model, whose
+    numpy sort is far cheaper than lessThan() calls into Python
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._mask = None
+
+    def set_filter_text(self, text: str):
+        text = text.strip()
+        self._mask = self.sourceModel().match_mask(text) if text else None
+        # A full rebuild is one layout change; invalidateFilter() emits a removal per gap
+        self.invalidate()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self._mask is None or bool(self._mask[self.sourceModel().stored_row(source_row)])
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if column >= 0:
+            self.sourceModel().sort(column, order)
+
 
 class DataTable(QFrame):
     """Widget for displaying equipment data in a table"""
-    
+
     def __init__(self, parent=None):
         """
         Initialize data table
-        
+
         Args:
             parent: Parent widget
         """
         super().__init__(parent)
         self._setup_ui()
-    
+
     def _setup_ui(self):
         """Setup the UI components"""
         # Panel styling
@@ -31,12 +163,12 @@ class DataTable(QFrame):
             }
         """)
         # Removed setMaximumHeight to allow expansion
-        
+
         # Layout
         layout = QVBoxLayout()
         layout.setContentsMargins(12, 20, 12, 10)  # Added 20px top padding
         layout.setSpacing(6)  # Reduced spacing from 8 to 6
-        
+
         # Title
         title = QLabel("Equipment Data")
         title_font = QFont()
@@ -44,7 +176,7 @@ class DataTable(QFrame):
         title_font.setBold(True)
         title.setFont(title_font)
         title.setStyleSheet("color: #111827;")
-        
+
         # Row count label
         self.row_count_label = QLabel("0 rows")
         self.row_count_label.setStyleSheet("""
@@ -52,31 +184,48 @@ class DataTable(QFrame):
             font-size: 12px;
             font-weight: bold;
         """)
-        
-        # Table widget
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels([
-            'Equipment Name',
-            'Type',
-            'Flowrate (m³/h)',
-            'Pressure (bar)',
-            'Temperature (°C)'
-        ])
-        
+
+        # Filter box
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter by name or type...")
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_input.setMaximumWidth(260)
+        self.filter_input.setStyleSheet("""
+            QLineEdit {
+                background-color: #ffffff;
+                border: 1px solid #e5e7eb;
+                border-radius: 6px;
+                padding: 4px 8px;
+                font-size: 12px;
+            }
+        """)
+        self.filter_input.textChanged.connect(self._apply_filter)
+
+        info_layout = QHBoxLayout()
+        info_layout.addWidget(self.row_count_label)
+        info_layout.addStretch()
+        info_layout.addWidget(self.filter_input)
+
+        # Model / proxy / view
+        self.model = EquipmentTableModel(self)
+        self.proxy = EquipmentFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+
         # Table styling
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #e5e7eb;
                 border-radius: 6px;
                 background-color: #ffffff;
                 gridline-color: #e5e7eb;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 4px;
                 border-bottom: 1px solid #f3f4f6;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #dbeafe;
                 color: #1e40af;
             }
@@ -90,77 +239,52 @@ class DataTable(QFrame):
                 font-size: 18px;
             }
         """)
-        
+
         # Table settings
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.setSortingEnabled(True)
-        
-        # Disable scrollbars - make table strictly non-scrollable
-        self.table.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.table.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        
-        # Resize columns to content
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+
+        # Native scrolling over uniform rows: only visible rows are laid out and formatted
+        self.table.setMinimumHeight(420)
+        self.table.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().hide()
+
+        # Resize columns to content, measured on a sample of rows rather than all of them
         header = self.table.horizontalHeader()
+        header.setResizeContentsPrecision(200)
         header.setSectionResizeMode(0, QHeaderView.Stretch)  # Equipment Name stretches
         for i in range(1, 5):
             header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
-        
+
         layout.addWidget(title)
-        layout.addWidget(self.row_count_label)
+        layout.addLayout(info_layout)
         layout.addWidget(self.table)
-        
+
         self.setLayout(layout)
-    
+
     def set_data(self, data: list):
         """
         Set table data
-        
+
         Args:
             data: List of dictionaries with equipment data
         """
-        self.table.setRowCount(0)  # Clear existing rows
-        
-        if not data:
-            self.row_count_label.setText("0 rows")
-            self.table.setFixedHeight(100)  # Minimum height for empty state
-            return
-        
-        self.table.setRowCount(len(data))
-        self.row_count_label.setText(f"{len(data)} row{'s' if len(data) != 1 else ''}")
-        
-        for row_idx, row_data in enumerate(data):
-            # Equipment Name
-            self.table.setItem(row_idx, 0, QTableWidgetItem(str(row_data.get('Equipment Name', ''))))
-            
-            # Type
-            self.table.setItem(row_idx, 1, QTableWidgetItem(str(row_data.get('Type', ''))))
-            
-            # Flowrate
-            flowrate = row_data.get('Flowrate', 0)
-            flowrate_item = QTableWidgetItem(f"{flowrate:.1f}")
-            flowrate_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.table.setItem(row_idx, 2, flowrate_item)
-            
-            # Pressure
-            pressure = row_data.get('Pressure', 0)
-            pressure_item = QTableWidgetItem(f"{pressure:.1f}")
-            pressure_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.table.setItem(row_idx, 3, pressure_item)
-            
-            # Temperature
-            temperature = row_data.get('Temperature', 0)
-            temp_item = QTableWidgetItem(f"{temperature:.1f}")
-            temp_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.table.setItem(row_idx, 4, temp_item)
-            
-        # Dynamic height calculation
-        # Header height + (rows * row height) + padding (2px borders)
-        header_height = self.table.horizontalHeader().height()
-        row_height = self.table.verticalHeader().defaultSectionSize()
-        total_height = header_height + (len(data) * row_height) + 4
-        
-        # Enforce minimum and resize
-        self.table.setMinimumHeight(total_height)
-        self.table.setMaximumHeight(total_height) # Force exact fit
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.model.set_rows(data or [])
+        self.proxy.set_filter_text(self.filter_input.text())
+        self._update_row_count()
+
+    def _apply_filter(self, text: str):
+        """Show only rows whose name or type contains text"""
+        self.proxy.set_filter_text(text)
+        self._update_row_count()
+
+    def _update_row_count(self):
+        total = self.model.rowCount()
+        shown = self.proxy.rowCount()
+        label = f"{total} row{'s' if total != 1 else ''}"
+        self.row_count_label.setText(label if shown == total else f"{shown} of {label}")
@@ -26,6 +26,7 @@ class HistoryPanel(QFrame):
             parent: Parent widget
         """
         super().__init__(parent)
+        self.history_data = []
         self._setup_ui()
     
     def _setup_ui(self):
@@ -140,6 +141,7 @@ class HistoryPanel(QFrame):
         Args:
             history: List of dataset dictionaries with id, filename, uploaded_at
         """
+        self.history_data = list(history or [])
         self.list_widget.clear()
         
         if not history:
@@ -184,6 +186,17 @@ class HistoryPanel(QFrame):
             
             self.list_widget.addItem(item)
     
+    def add_dataset(self, dataset: dict):
+        """
+        Insert a dataset at the top of the list (e.g. pushed by the event stream)
+        
+        Args:
+            dataset: Dataset dictionary with id, filename, uploaded_at
+        """
+        if any(d['id'] == dataset['id'] for d in self.history_data):
+            return
+        self.set_history([dataset] + self.history_data)
+    
     def select_dataset(self, dataset_id: int):
         """
         Select a dataset in the list
@@ -89,8 +89,11 @@ export default function AnalyticsView({ data }) {
         const den = Math.sqrt((n * sumX2 - sumX * sumX) * (n * sumY2 - sumY * sumY));
 
         if (den === 0) return { score: "0.00", label: "Neutral" };
-        const r = num / den;
+        return labelCorrelation(num / den);
+    };
 
+    const labelCorrelation = (r) => {
+        if (r === null || r === undefined) return { score: "0.00", label: "Neutral" };
         if (r > 0.7) return { score: r.toFixed(2), label: "Strong Positive" };
         if (r > 0.3) return { score: r.toFixed(2), label: "Moderate" };
         if (r > -0.3) return { score: r.toFixed(2), label: "Weak/Neutral" };
@@ -112,7 +115,10 @@ export default function AnalyticsView({ data }) {
     const pressures = data.table.map(row => parseVal(row.Pressure));
     const temps = data.table.map(row => parseVal(row.Temperature));
 
-    const correlation = calculateCorrelation(pressures, temps);
+    // Server-side correlation matrix (persisted at upload); older datasets are computed locally
+    const correlation = data.correlation
+        ? labelCorrelation(data.correlation.overall.matrix.pressure.temperature)
+        : calculateCorrelation(pressures, temps);
     const stability = calculateStability(data.table);
 
     return (
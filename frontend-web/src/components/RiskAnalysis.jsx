@@ -75,7 +75,20 @@ export default function RiskAnalysis({ data }) {
         return risks;
     };
 
-    const riskList = analyzeRisk();
+    // Server-side risk engine results (persisted at upload); older datasets fall back to local analysis
+    const fromEngine = (risk) => risk.flagged.map(item => ({
+        'Equipment Name': item.equipment_name,
+        Type: item.type,
+        Flowrate: item.flowrate,
+        Pressure: item.pressure,
+        Temperature: item.temperature,
+        status: item.level === 'critical' ? 'Critical' : 'Warning',
+        score: item.score,
+        // Pressure and thermal reasons together when both fired (`reasons` is absent in older summaries)
+        reason: (item.reasons || [item.reason]).join(' • '),
+    }));
+
+    const riskList = data.risk ? fromEngine(data.risk) : analyzeRisk();
 
     return (
         <div className="space-y-10 animate-in fade-in slide-in-from-bottom-4 duration-700">
@@ -125,6 +138,12 @@ export default function RiskAnalysis({ data }) {
                                         {risk.Pressure} bar
                                     </p>
                                 </div>
+                                <div className="hidden md:block">
+                                    <p className="text-[10px] font-black text-black/20 uppercase mb-1">Temperature</p>
+                                    <p className={`font-mono font-bold ${risk.status === 'Critical' ? 'text-red-500' : 'text-amber-500'}`}>
+                                        {risk.Temperature} °C
+                                    </p>
+                                </div>
                                 <div>
                                     <span className={`px-4 py-2 rounded-xl text-[10px] font-black uppercase tracking-widest ${risk.status === 'Critical' ? 'bg-red-500/10 text-red-600' : 'bg-amber-500/10 text-amber-600'}`}>
                                         {risk.status}
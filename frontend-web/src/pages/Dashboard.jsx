@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import axios from "axios";
 import { useNavigate } from "react-router-dom";
 import { LogOut, History, RotateCcw, Download, Info, Settings, FileText, AlertTriangle } from "lucide-react";
@@ -35,6 +35,57 @@ export default function Dashboard() {
         fetchHistory();
     }, [token]);
 
+    // Server push: progress and finished datasets arrive without re-polling the history
+    const pushedDatasets = useRef(new Set());
+    const selectedIdRef = useRef(null);
+    useEffect(() => { selectedIdRef.current = selectedDatasetId; }, [selectedDatasetId]);
+    const [streaming, setStreaming] = useState(false);
+    const [progress, setProgress] = useState(null);
+
+    useEffect(() => {
+        if (!token || typeof EventSource === 'undefined') return;
+        // Sync (gunicorn) deployments do not serve the stream: /api/ says whether it is on
+        let source = null;
+        let cancelled = false;
+        axios.get(`${API_BASE_URL}/`).then(res => {
+            if (!cancelled && res.data.events) source = openEventStream();
+        }).catch(() => {});
+        return () => {
+            cancelled = true;
+            if (source) source.close();
+        };
+    }, [token]);
+
+    const openEventStream = () => {
+        const source = new EventSource(`${API_BASE_URL}/events/?token=${encodeURIComponent(token)}`);
+
+        source.onopen = () => setStreaming(true);
+        source.onerror = () => setStreaming(false);  // EventSource reconnects on its own
+        source.addEventListener('dataset.progress', (e) => setProgress(JSON.parse(e.data)));
+        source.addEventListener('dataset.failed', () => setProgress(null));
+        source.addEventListener('dataset.ready', (e) => {
+            const event = JSON.parse(e.data);
+            pushedDatasets.current.add(event.dataset_id);
+            setProgress(null);
+            setHistory(prev => prev.some(item => item.id === event.dataset_id) ? prev : [
+                { id: event.dataset_id, filename: event.filename, uploaded_at: event.uploaded_at },
+                ...prev,
+            ]);
+        });
+        source.addEventListener('dataset.updated', (e) => {
+            const event = JSON.parse(e.data);
+            // Events stay small: the new summary is fetched (and ETag-validated) only if it is on screen
+            if (selectedIdRef.current === event.dataset_id) {
+                axios.get(`${API_BASE_URL}/summary/${event.dataset_id}/`, {
+                    headers: { Authorization: `Bearer ${token}` }
+                }).then(res => {
+                    if (selectedIdRef.current === event.dataset_id) setSummary(res.data);
+                }).catch(() => {});
+            }
+        });
+        return source;
+    };
+
     const handleLogout = () => {
         localStorage.removeItem('auth_token');
         navigate('/login');
@@ -90,7 +141,10 @@ export default function Dashboard() {
                 }
             });
             setSuccessMessage("Dataset processed successfully!");
-            await fetchHistory();
+            if (!(streaming && pushedDatasets.current.has(res.data.dataset_id))) {
+                // Otherwise the history entry already arrived over the event stream
+                await fetchHistory();
+            }
             await handleSelectDataset(res.data.dataset_id);
         } catch (err) {
             setError(err.response?.data?.error || "Upload failed");
@@ -169,6 +223,13 @@ export default function Dashboard() {
                                 </div>
                             )}
 
+                            {progress && loading && (
+                                <div className="mb-8 p-4 bg-black/5 border border-black/10 rounded-2xl text-black/60 flex items-center justify-between animate-in fade-in slide-in-from-top-4">
+                                    <span className="text-sm font-medium">Processing {progress.filename}: {progress.stage}</span>
+                                    <span className="text-xs font-black uppercase tracking-widest">{Math.round(progress.progress * 100)}%</span>
+                                </div>
+                            )}
+
                             {successMessage && (
                                 <div className="mb-8 p-4 bg-green-500/10 border border-green-500/20 rounded-2xl text-green-600 flex items-center justify-between animate-in fade-in slide-in-from-top-4">
                                     <span className="text-sm font-medium">{successMessage}</span>